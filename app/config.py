@@ -0,0 +1,103 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Application settings, read from environment variables prefixed with `SYMBOL_META_` (or from a `.env` file).
+
+    For example, `SYMBOL_META_DATABASE_URL=sqlite:////data/symbols.db` sets `database_url`.
+    """
+
+    model_config = SettingsConfigDict(
+        env_prefix="SYMBOL_META_", env_file=".env", extra="ignore"
+    )
+
+    # database engine
+    database_url: str = "sqlite:///database.db"
+    """URL of the database, the async engine uses the same database through the aiosqlite driver."""
+    database_echo: bool | Literal["debug"] = False
+    """Log every statement (`True`), or statements and result rows (`"debug"`). Keep disabled under load, and rely on
+    the slow query log instead."""
+    database_pool_size: int = 5
+    """Number of connections kept open in the pool."""
+    database_max_overflow: int = 10
+    """Number of connections opened on top of `database_pool_size` under load, closed when returned."""
+    database_pool_recycle: int = -1
+    """Replace connections older than this many seconds, -1 to never replace them."""
+    database_pool_timeout: float = 30.0
+    """Seconds to wait for a connection when the pool is exhausted, before failing."""
+
+    # SQLite PRAGMAs, applied to every new connection
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = (
+        "WAL"
+    )
+    """With WAL, readers are not blocked by a writer committing, and a writer is not blocked by readers."""
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    """NORMAL is safe from corruption in WAL mode, only the last commits may be lost on power failure."""
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    """Bytes of the database file read through memory mapping instead of read() calls, 0 to disable."""
+    sqlite_cache_size: int = -64 * 1024
+    """Page cache size per connection, in pages if positive, or in KiB if negative."""
+    sqlite_busy_timeout: int = 5_000
+    """Milliseconds to wait for a lock held by another connection, before failing with "database is locked"."""
+
+    # point-in-time universe snapshots
+    snapshot_dir: Path = Path("snapshots")
+    """Directory the snapshot files are written to and served from, created when the first snapshot is written."""
+    snapshot_max_snapshots: int = 100
+    """Snapshots kept, the least recently written being deleted when a new one is written."""
+
+    # change events pushed to subscribers
+    events_max_pending: int = 1_000
+    """Changes queued per subscriber, a subscriber falling further behind is disconnected and should catch up from
+    the changes endpoints."""
+    events_keepalive_seconds: float = 15.0
+    """Seconds without change after which a keepalive comment is sent to subscribers."""
+    events_poll_seconds: float = 1.0
+    """Seconds between reads of the change log for changes committed by other workers and scripts, changes committed
+    by this worker being pushed right away."""
+
+    # responses of GET /symbols/{ref_data_uuid} cached in memory, per worker
+    symbol_cache_max_entries: int = 10_000
+    """Responses cached, the least recently used one being evicted when full, 0 to disable the cache."""
+    symbol_cache_ttl_seconds: float = 300.0
+    """Seconds a response is served from the cache, on top of the invalidation of symbols written."""
+
+    # adjustment curves of corporate actions cached in memory, per worker
+    adjustment_curves_max_curves: int = 10_000
+    """Curves cached, the least recently used one being evicted when full, 0 to disable the cache."""
+
+    # statements of both engines, fingerprinted and accounted per worker, see app/internal/slow_queries.py
+    slow_query_threshold_seconds: float = 0.1
+    """Statements taking at least this many seconds to execute and fetch are logged, 0 to log all of them."""
+    slow_query_top_n: int = 20
+    """Statements returned by `GET /admin/slowQueries` when no limit is given."""
+
+    # endpoints of the admin router, see app/routers/admin.py
+    admin_token: str | None = None
+    """Secret a request to the `/admin` endpoints passes as `Authorization: Bearer <token>`, those endpoints not being
+    found when not set. Distinct from `profiling_token`, which is also passed in query strings."""
+
+    # requests profiled on demand, see app/internal/profiling.py
+    profiling_token: str | None = None
+    """Secret a request passes in the `X-Profile` header, or the `profile` query parameter, to be profiled, profiling
+    being disabled when not set."""
+    profile_dir: Path = Path("profiles")
+    """Directory the profiles are written to and served from, shared by the workers like `snapshot_dir`."""
+    profiling_max_profiles: int = 50
+    """Profiles kept, the oldest being deleted when a new one is written."""
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Settings of the application, read once from the environment.
+
+    Returns:
+        Settings: The application settings.
+    """
+    return Settings()
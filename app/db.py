@@ -1,16 +1,120 @@
-from sqlalchemy import create_engine
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel
 
-# TODO <MFido> [26/03/2025] this should be "productionized" and moved to a more robust solution
-# A SQLite database file named database.db is specified, and its URL is constructed. The connect_args dictionary is
-# used to set the check_same_thread option to False, which allows the database to be accessed from multiple threads.
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
-connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, echo=True, connect_args=connect_args)
+from app.config import Settings, get_settings
+
+
+def _is_in_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_options(url: URL, settings: Settings) -> dict[str, Any]:
+    """Keyword arguments of `create_engine` and `create_async_engine`, for the given database URL."""
+    options: dict[str, Any] = {"echo": settings.database_echo}
+
+    if url.get_backend_name() == "sqlite":
+        # allows connections to be used by the threadpool running sync endpoints
+        options["connect_args"] = {"check_same_thread": False}
+
+    # in-memory SQLite databases use a single connection per thread, not a pool
+    if not _is_in_memory_sqlite(url):
+        options |= {
+            "pool_size": settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_recycle": settings.database_pool_recycle,
+            "pool_timeout": settings.database_pool_timeout,
+        }
+
+    return options
+
+
+def set_sqlite_pragmas(engine: Engine, settings: Settings) -> None:
+    """
+    Apply the SQLite PRAGMAs of the settings to every new connection of the engine. No-op for other databases.
+
+    For async engines, pass `async_engine.sync_engine`.
+
+    Args:
+        engine (Engine): The engine to configure.
+        settings (Settings): The settings holding the PRAGMA values.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    # busy_timeout first, as switching the journal mode needs a lock on the database
+    pragmas = {
+        "busy_timeout": settings.sqlite_busy_timeout,
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+    }
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
 
 
-def create_db_and_tables():
+def create_engine_from_settings(settings: Settings) -> Engine:
+    """
+    Create the engine used by sync endpoints, and to create tables.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    url = make_url(settings.database_url)
+    engine = create_engine(url, **_engine_options(url, settings))
+    set_sqlite_pragmas(engine, settings)
+    return engine
+
+
+def create_async_engine_from_settings(settings: Settings) -> AsyncEngine:
+    """
+    Create the engine used by async endpoints, connected to the same database through the aiosqlite driver, so they
+    don't block the event loop while waiting for the database.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        AsyncEngine: The configured async engine.
+    """
+    url = make_url(settings.database_url)
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    async_engine = create_async_engine(url, **_engine_options(url, settings))
+    set_sqlite_pragmas(async_engine.sync_engine, settings)
+    return async_engine
+
+
+engine = create_engine_from_settings(get_settings())
+async_engine = create_async_engine_from_settings(get_settings())
+
+
+def create_db_and_tables(bind: Engine = engine):
     """This function uses SQLModel's metadata.create_all method to create the database tables based on the models
-    defined in the application."""
-    SQLModel.metadata.create_all(engine)
+    defined in the application, then brings indexes of already existing tables up to date."""
+    SQLModel.metadata.create_all(bind)
+    create_missing_indexes(bind)
+
+
+def create_missing_indexes(bind: Engine = engine):
+    """Schema migration creating indexes added to the models after their tables have been created.
+
+    `metadata.create_all` only creates indexes together with new tables, so databases created by an older version
+    of the application would keep scanning tables. Each index is created only if it does not exist yet, so this is
+    safe to run on every startup."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
@@ -1,6 +1,53 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db import engine
+from app.config import get_settings
+from app.db import async_engine, engine
+from app.internal.adjustment_curves import AdjustmentCurveCache
+from app.internal.change_broadcaster import ChangeBroadcaster
+from app.internal.metrics import ServiceMetrics
+from app.internal.profiling import ProfileStore, RequestProfiler
+from app.internal.response_cache import SymbolResponseCache
+from app.internal.slow_queries import SlowQueryLog
+from app.internal.symbol_resolver import SymbolResolver
+
+# one resolver per process, loaded at application startup
+symbol_resolver = SymbolResolver()
+
+# one broadcaster per process, each worker pushes the changes of the change log to its own subscribers
+change_broadcaster = ChangeBroadcaster()
+
+# one cache of adjustment curves per process, kept up to date from the change log
+adjustment_curves = AdjustmentCurveCache(
+    max_curves=get_settings().adjustment_curves_max_curves
+)
+
+# one cache of symbol responses per process, invalidated from the change log
+symbol_response_cache = SymbolResponseCache(
+    max_entries=get_settings().symbol_cache_max_entries,
+    ttl_seconds=get_settings().symbol_cache_ttl_seconds,
+)
+
+# one set of metrics per process, recorded by the metrics middleware and the events of both engines
+service_metrics = ServiceMetrics()
+service_metrics.instrument_engine(engine)
+service_metrics.instrument_engine(async_engine.sync_engine)
+
+# one slow query log per process, fed with the statements recorded by the metrics
+slow_query_log = SlowQueryLog(
+    threshold_seconds=get_settings().slow_query_threshold_seconds
+)
+service_metrics.add_statement_observer(slow_query_log.observe)
+
+# one profiler per process, profiles being written to a directory shared by the workers
+request_profiler = RequestProfiler(
+    token=get_settings().profiling_token,
+    store=ProfileStore(
+        get_settings().profile_dir,
+        max_profiles=get_settings().profiling_max_profiles,
+    ),
+)
 
 
 def get_session():
@@ -20,3 +67,101 @@ def get_session():
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    Dependency that provides an async SQLModel session, for endpoints declared with `async def`.
+
+    Objects are not expired on commit, as reloading them lazily is not possible with an async session.
+
+    To be used in function parameters like so:
+    ```
+    async def endpoint(*, session: AsyncSession = Depends(get_async_session), ...)
+    ```
+
+    Yields:
+        AsyncSession: An async SQLModel session connected to the database.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Dependency that provides the async engine, for tasks outliving the request that opens their own sessions.
+
+    Returns:
+        AsyncEngine: The async engine of the application database.
+    """
+    return async_engine
+
+
+def get_symbol_resolver() -> SymbolResolver:
+    """
+    Dependency that provides the in-memory symbol resolver of this process.
+
+    Returns:
+        SymbolResolver: The resolver, loaded with all symbols at application startup.
+    """
+    return symbol_resolver
+
+
+def get_change_broadcaster() -> ChangeBroadcaster:
+    """
+    Dependency that provides the change broadcaster of this process.
+
+    Returns:
+        ChangeBroadcaster: The broadcaster, to notify of changes once committed.
+    """
+    return change_broadcaster
+
+
+def get_adjustment_curves() -> AdjustmentCurveCache:
+    """
+    Dependency that provides the adjustment curves cache of this process.
+
+    Returns:
+        AdjustmentCurveCache: The cache, loading curves on first use.
+    """
+    return adjustment_curves
+
+
+def get_symbol_response_cache() -> SymbolResponseCache:
+    """
+    Dependency that provides the cache of `GET /symbols/{ref_data_uuid}` responses of this process.
+
+    Returns:
+        SymbolResponseCache: The cache.
+    """
+    return symbol_response_cache
+
+
+def get_service_metrics() -> ServiceMetrics:
+    """
+    Dependency that provides the metrics of this process.
+
+    Returns:
+        ServiceMetrics: The metrics, recorded since the process started.
+    """
+    return service_metrics
+
+
+def get_slow_query_log() -> SlowQueryLog:
+    """
+    Dependency that provides the slow query log of this process.
+
+    Returns:
+        SlowQueryLog: The log, accounting the statements of both engines.
+    """
+    return slow_query_log
+
+
+def get_request_profiler() -> RequestProfiler:
+    """
+    Dependency that provides the request profiler of this process.
+
+    Returns:
+        RequestProfiler: The profiler, and the store of the profiles taken by all workers.
+    """
+    return request_profiler
@@ -0,0 +1,327 @@
+"""
+Cumulative price adjustment curves of corporate actions, per reference data UUID.
+
+A corporate action effective at `e` adjusts prices observed before `e` with the affine map
+`price * multiplicative_adjustment + additive_adjustment`. Adjusting a price observed at `t0` to the basis of `t1`
+applies, in chronological order, the maps of all corporate actions with `t0 < e <= t1`.
+
+A curve stores the breakpoints (effective times) of a security, sorted, together with the prefix compositions
+`P_k(price) = cumulative_multiplicative[k] * price + cumulative_additive[k]` of its first `k` maps. The composition of
+the maps of actions `i + 1` to `j` is `P_j ∘ P_i⁻¹`, so any window is answered with two bisections, in O(log n).
+
+Price series are adjusted the same way, with the bisections of all their points vectorized by `numpy.searchsorted`.
+"""
+
+import datetime
+import threading
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+from pydantic_core import from_json
+from sqlmodel import Session
+
+from app.internal.change_log import build_changes_page_statement
+from app.internal.change_sequence import get_change_sequence
+from app.internal.corp_actions_helpers import (
+    build_corp_actions_of_ref_data_uuid_statement,
+)
+from app.internal.snapshots import datetime_to_epoch_us
+from app.schemas.changes import ChangeEntity
+from app.schemas.corp_actions import CorpActionDb
+
+
+class Adjustment(NamedTuple):
+    """Affine price adjustment, `price * multiplicative + additive`."""
+
+    multiplicative: float
+    additive: float
+
+
+class AdjustmentBreakpoint(NamedTuple):
+    """Adjustment of a single corporate action, applying to prices observed before its effective time."""
+
+    effective_time: datetime.datetime
+    multiplicative: float
+    additive: float
+
+    @classmethod
+    def from_corp_action(cls, corp_action: CorpActionDb) -> "AdjustmentBreakpoint":
+        return cls(
+            effective_time=corp_action.effective_time,
+            # missing adjustments leave prices unchanged
+            multiplicative=1.0
+            if corp_action.multiplicative_adjustment is None
+            else corp_action.multiplicative_adjustment,
+            additive=corp_action.additive_adjustment or 0.0,
+        )
+
+
+class AdjustmentCurveArrays(NamedTuple):
+    """Columns of an adjustment curve as NumPy arrays, for vectorized adjustments."""
+
+    # microseconds since 1970-01-01, as the timestamps of adjusted price series
+    effective_times: np.ndarray
+    cumulative_multiplicative: np.ndarray
+    cumulative_additive: np.ndarray
+
+
+class AdjustmentCurve:
+    """
+    Immutable cumulative adjustment curve of a single security.
+
+    Adding corporate actions builds a new curve, so readers never see a curve being updated.
+    """
+
+    __slots__ = (
+        "breakpoints",
+        "effective_times",
+        "cumulative_multiplicative",
+        "cumulative_additive",
+        "_arrays",
+    )
+
+    def __init__(self, breakpoints: Iterable[AdjustmentBreakpoint]):
+        # one breakpoint per effective time, as (ref_data_uuid, effective_time) is the primary key of corp actions
+        by_effective_time = {
+            breakpoint.effective_time: breakpoint for breakpoint in breakpoints
+        }
+        self.breakpoints: tuple[AdjustmentBreakpoint, ...] = tuple(
+            by_effective_time[effective_time]
+            for effective_time in sorted(by_effective_time)
+        )
+        self.effective_times: tuple[datetime.datetime, ...] = tuple(
+            breakpoint.effective_time for breakpoint in self.breakpoints
+        )
+
+        # prefix compositions, index 0 being the identity
+        cumulative_multiplicative, cumulative_additive = [1.0], [0.0]
+        for breakpoint in self.breakpoints:
+            if breakpoint.multiplicative == 0:
+                raise ValueError(
+                    f"Corporate action effective at {breakpoint.effective_time} has a zero multiplicative adjustment."
+                )
+            cumulative_multiplicative.append(
+                breakpoint.multiplicative * cumulative_multiplicative[-1]
+            )
+            cumulative_additive.append(
+                breakpoint.multiplicative * cumulative_additive[-1]
+                + breakpoint.additive
+            )
+        self.cumulative_multiplicative: tuple[float, ...] = tuple(
+            cumulative_multiplicative
+        )
+        self.cumulative_additive: tuple[float, ...] = tuple(cumulative_additive)
+        self._arrays: AdjustmentCurveArrays | None = None
+
+    def __len__(self) -> int:
+        return len(self.breakpoints)
+
+    @property
+    def arrays(self) -> AdjustmentCurveArrays:
+        """The curve as NumPy arrays, built on first use."""
+        if self._arrays is None:
+            self._arrays = AdjustmentCurveArrays(
+                effective_times=np.array(
+                    [datetime_to_epoch_us(time) for time in self.effective_times],
+                    dtype=np.int64,
+                ),
+                cumulative_multiplicative=np.array(
+                    self.cumulative_multiplicative, dtype=np.float64
+                ),
+                cumulative_additive=np.array(
+                    self.cumulative_additive, dtype=np.float64
+                ),
+            )
+        return self._arrays
+
+    def with_breakpoints(
+        self, breakpoints: Iterable[AdjustmentBreakpoint]
+    ) -> "AdjustmentCurve":
+        """New curve with more breakpoints, a breakpoint at an existing effective time replaces it."""
+        return AdjustmentCurve((*self.breakpoints, *breakpoints))
+
+    def composite(self, start: int, end: int) -> Adjustment:
+        """
+        Composition of the adjustments of breakpoints `start` (included) to `end` (excluded), in O(1).
+
+        Args:
+            start (int): Index of the first breakpoint applied.
+            end (int): Index after the last breakpoint applied, not lower than `start`.
+
+        Returns:
+            Adjustment: The composed adjustment, `P_end ∘ P_start⁻¹`.
+        """
+        ratio = (
+            self.cumulative_multiplicative[end] / self.cumulative_multiplicative[start]
+        )
+        return Adjustment(
+            multiplicative=ratio,
+            additive=self.cumulative_additive[end]
+            - ratio * self.cumulative_additive[start],
+        )
+
+    def factor(self, start: datetime.datetime, end: datetime.datetime) -> Adjustment:
+        """
+        Adjustment of a price observed at `start` to the basis of `end`, i.e. the composition of the adjustments of
+        corporate actions effective after `start` and up to `end` included, in O(log n).
+
+        Args:
+            start (datetime.datetime): Time the price was observed at.
+            end (datetime.datetime): Time of the basis to adjust to, not before `start`.
+
+        Returns:
+            Adjustment: The composed adjustment.
+        """
+        return self.composite(
+            bisect_right(self.effective_times, start),
+            bisect_right(self.effective_times, end),
+        )
+
+    def adjust_prices(
+        self, timestamps: np.ndarray, prices: np.ndarray, end: datetime.datetime
+    ) -> np.ndarray:
+        """
+        Adjust a price series to the basis of `end`, each price according to the time it was observed at.
+
+        The breakpoint index of every timestamp is found with a single `searchsorted`, then the compositions
+        `P_end ∘ P_i⁻¹` are gathered from the cumulative arrays, so the cost is O(m log n) for m prices, in NumPy.
+
+        Args:
+            timestamps (np.ndarray): Times the prices were observed at, in microseconds since 1970-01-01, none after
+                `end`, in any order.
+            prices (np.ndarray): The prices, as many as timestamps.
+            end (datetime.datetime): Time of the basis to adjust to.
+
+        Returns:
+            np.ndarray: The adjusted prices, as float64.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if not self.breakpoints:
+            return prices.copy()
+
+        effective_times, cumulative_multiplicative, cumulative_additive = self.arrays
+        start = np.searchsorted(effective_times, timestamps, side="right")
+        end_index = bisect_right(self.effective_times, end)
+
+        ratio = cumulative_multiplicative[end_index] / cumulative_multiplicative[start]
+        return prices * ratio + (
+            cumulative_additive[end_index] - ratio * cumulative_additive[start]
+        )
+
+
+class AdjustmentCurveCache:
+    """
+    Bounded cache of the adjustment curves of securities, loaded from the database on first use and kept up to date
+    incrementally, evicting the least recently used curve when full.
+
+    Before answering, the cache reads the global change sequence, and only when the change log grew since it last
+    caught up, by any worker, reads the corporate actions appended since and adds them to the curves already cached,
+    so a curve is only ever read from the corporate actions table once while cached. Adding a breakpoint already known
+    is a no-op, so a corporate action both loaded with its curve and read from the change log is only applied once.
+
+    Used from the threads of sync endpoints, so curves are updated under a lock, which is never held while reading the
+    change sequence or loading a curve.
+    """
+
+    def __init__(self, *, max_curves: int) -> None:
+        self.max_curves = max_curves
+        self._curves: OrderedDict[str, AdjustmentCurve] = OrderedDict()
+        # sequence of the change log up to which the cached curves are up to date
+        self._last_sequence: int | None = None
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+    def catch_up(self, session: Session) -> int:
+        """
+        Add corporate actions created since the last catch up to the cached curves.
+
+        Args:
+            session (Session): The database session.
+
+        Returns:
+            int: The change sequence read, the cached curves being up to date with it.
+        """
+        sequence = get_change_sequence(session)
+        if self._last_sequence is not None and sequence <= self._last_sequence:
+            return sequence
+
+        with self._write_lock:
+            if self._last_sequence is None or not self._curves:
+                # nothing cached yet, curves loaded from now on include all corporate actions committed before
+                self._last_sequence = max(sequence, self._last_sequence or 0)
+                return sequence
+            if sequence <= self._last_sequence:
+                # caught up by another thread in the meantime
+                return sequence
+
+            statement = build_changes_page_statement(
+                entity=ChangeEntity.CORP_ACTION, since=self._last_sequence, limit=None
+            )
+            new_breakpoints: dict[str, list[AdjustmentBreakpoint]] = defaultdict(list)
+            last_sequence = sequence
+            for change in session.exec(statement):
+                last_sequence = max(last_sequence, change.sequence)
+                if change.ref_data_uuid not in self._curves:
+                    continue
+                corp_action = CorpActionDb.model_validate(from_json(change.payload))
+                new_breakpoints[change.ref_data_uuid].append(
+                    AdjustmentBreakpoint.from_corp_action(corp_action)
+                )
+
+            for ref_data_uuid, breakpoints in new_breakpoints.items():
+                self._curves[ref_data_uuid] = self._curves[
+                    ref_data_uuid
+                ].with_breakpoints(breakpoints)
+            self._last_sequence = last_sequence
+
+        return sequence
+
+    def get(self, session: Session, ref_data_uuid: str) -> AdjustmentCurve:
+        """
+        Up to date adjustment curve of a security, empty if it has no corporate actions.
+
+        Args:
+            session (Session): The database session.
+            ref_data_uuid (str): The reference data UUID of the security.
+
+        Returns:
+            AdjustmentCurve: The adjustment curve.
+        """
+        sequence = self.catch_up(session)
+
+        with self._write_lock:
+            curve = self._curves.get(ref_data_uuid)
+            if curve is not None:
+                self._curves.move_to_end(ref_data_uuid)
+                return curve
+
+        statement = build_corp_actions_of_ref_data_uuid_statement(
+            ref_data_uuid=ref_data_uuid
+        )
+        curve = AdjustmentCurve(
+            AdjustmentBreakpoint.from_corp_action(corp_action)
+            for corp_action in session.exec(statement)
+        )
+        if self.max_curves <= 0:
+            return curve
+
+        with self._write_lock:
+            if self._last_sequence is None or sequence < self._last_sequence:
+                # corporate actions committed after the curve was read may have been caught up with already
+                return curve
+
+            # the curve may have been loaded concurrently, possibly with more recent corporate actions
+            current = self._curves.get(ref_data_uuid)
+            if current is not None:
+                curve = current.with_breakpoints(curve.breakpoints)
+            self._curves[ref_data_uuid] = curve
+            self._curves.move_to_end(ref_data_uuid)
+            while len(self._curves) > self.max_curves:
+                self._curves.popitem(last=False)
+
+        return curve
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Collection, Sequence
+from typing import Any, Final
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.internal.change_log import (
+    build_changes_page_statement,
+    build_last_change_sequence_statement,
+    change_log_row_to_public_dict,
+)
+from app.internal.responses import dump_json
+from app.schemas.changes import ChangeEntity
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE: Final[str] = "text/event-stream"
+
+# comment line sent when no event was sent for a while, so proxies and clients do not close idle connections
+SSE_KEEPALIVE: Final[bytes] = b": keepalive\n\n"
+
+# changes read from the log at once, more are read right away when a page is full
+CHANGE_LOG_POLL_PAGE_SIZE: Final[int] = 1_000
+
+
+class ChangeSubscription:
+    """
+    Changes pending delivery to one subscriber, bounded to `max_pending` changes.
+
+    All methods but `matches` are called from the event loop the subscription was created in, the broadcaster hands
+    changes over to it with `call_soon_threadsafe`.
+    """
+
+    def __init__(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        max_pending: int,
+        entities: Collection[ChangeEntity] = (),
+        symbologies: Collection[str] = (),
+        ref_data_uuids: Collection[str] = (),
+    ):
+        self.loop = loop
+        self.max_pending = max_pending
+        self.entities = frozenset(entities)
+        self.symbologies = frozenset(symbologies)
+        self.ref_data_uuids = frozenset(ref_data_uuids)
+
+        self.pending: deque[tuple[int, bytes]] = deque()
+        self.ready = asyncio.Event()
+        # set once a change had to be dropped, the subscriber should then catch up from the change log
+        self.overflowed = False
+        # sequence of the last change sent, or of the end of the log when subscribed, set by the broadcaster
+        self.last_sequence: int | None = None
+
+    def matches(self, change: dict[str, Any]) -> bool:
+        """
+        Whether a change passes the filters of the subscription, all filters given should match.
+
+        The symbology filter only matches symbol changes, as corporate actions have no symbology.
+        """
+        if self.entities and change["entity"] not in self.entities:
+            return False
+        if self.ref_data_uuids and change["ref_data_uuid"] not in self.ref_data_uuids:
+            return False
+        if self.symbologies and change["payload"].get("symbology") not in (
+            self.symbologies
+        ):
+            return False
+        return True
+
+    def deliver(self, changes: Sequence[tuple[int, bytes]]) -> None:
+        """Queue serialized changes, or flag the subscription as overflowed if it cannot keep up."""
+        if self.overflowed:
+            return
+
+        for change in changes:
+            if len(self.pending) >= self.max_pending:
+                self.overflowed = True
+                break
+            self.pending.append(change)
+        self.ready.set()
+
+    async def iter_events(self, keepalive_seconds: float) -> AsyncIterator[bytes]:
+        """
+        Server-sent events of the changes delivered, one `change` event per change, with the change sequence as
+        event id.
+
+        Once the subscription overflowed and the changes queued before are sent, a final `overflow` event tells the
+        subscriber which sequence to catch up from with the changes endpoints, and the stream ends.
+
+        Args:
+            keepalive_seconds (float): Send a keepalive comment after this long without events.
+
+        Yields:
+            bytes: Each event of the stream.
+        """
+        while True:
+            while self.pending:
+                sequence, data = self.pending.popleft()
+                self.last_sequence = sequence
+                yield b"id: %d\nevent: change\ndata: %s\n\n" % (sequence, data)
+
+            if self.overflowed:
+                yield b"event: overflow\ndata: %s\n\n" % dump_json(
+                    {"next_since": self.last_sequence}
+                )
+                return
+
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout=keepalive_seconds)
+            except TimeoutError:
+                yield SSE_KEEPALIVE
+
+
+class ChangeBroadcaster:
+    """
+    Fans the changes of the change log out to the subscriptions of this process.
+
+    The log is the only source of changes, so subscribers receive the changes committed by all workers and scripts,
+    in sequence order. It is read by a single task per process, from the sequence of the last change fanned out:
+    every `poll_seconds`, and right away when an endpoint of this worker commits changes and calls `notify`.
+
+    Publishing never blocks nor waits for subscribers: changes are serialized once, then handed over to the event
+    loop of each subscription, which queues them up to its bound.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: set[ChangeSubscription] = set()
+        self._lock = threading.Lock()
+        # sequence of the last change fanned out, None until following the log, reset when following it again
+        self._last_sequence: int | None = None
+        self._poller: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def subscription_count(self) -> int:
+        """Number of active subscriptions."""
+        return len(self._subscriptions)
+
+    def subscribe(self, subscription: ChangeSubscription) -> None:
+        """Start delivering changes to a subscription, from the last change fanned out."""
+        with self._lock:
+            subscription.last_sequence = self._last_sequence
+            self._subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        """Stop delivering changes to a subscription, and the reading of the log once none is left."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            last = not self._subscriptions
+        if last:
+            self.notify()
+
+    def publish(self, changes: Sequence[dict[str, Any]]) -> None:
+        """
+        Deliver changes read from the log to all subscriptions they match, and move the last sequence fanned out
+        forward. Changes already fanned out are skipped.
+
+        Args:
+            changes (Sequence[dict[str, Any]]): The changes, shaped like `ChangePublic`, in sequence order.
+        """
+        with self._lock:
+            if self._last_sequence is not None:
+                changes = [
+                    change
+                    for change in changes
+                    if change["sequence"] > self._last_sequence
+                ]
+            if changes:
+                self._last_sequence = changes[-1]["sequence"]
+            # subscriptions added from now on start after these changes
+            subscriptions = list(self._subscriptions)
+        if not subscriptions or not changes:
+            return
+
+        serialized = [dump_json(change) for change in changes]
+        for subscription in subscriptions:
+            matching = [
+                (change["sequence"], data)
+                for change, data in zip(changes, serialized)
+                if subscription.matches(change)
+            ]
+            if not matching:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, matching)
+            except RuntimeError:
+                # event loop of the subscription is closed
+                self.unsubscribe(subscription)
+
+    def notify(self) -> None:
+        """
+        Read the log right away, rather than at the next poll, as changes have been committed. Can be called from
+        async endpoints as well as from sync endpoints running in the thread pool.
+        """
+        poller, wakeup = self._poller, self._wakeup
+        if poller is None or poller.done() or wakeup is None:
+            return
+        try:
+            poller.get_loop().call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # event loop of the poller is closed, the next subscription starts a new one
+            pass
+
+    async def follow(self, engine: AsyncEngine, *, poll_seconds: float) -> None:
+        """
+        Start reading the log in the current event loop, unless already reading it. The task stops once there are no
+        subscriptions left, so call it before each `subscribe`.
+
+        A new task reads the log from its current end, so changes committed while nobody was subscribed are not sent
+        to the next subscriber.
+
+        Args:
+            engine (AsyncEngine): The engine of the database holding the change log.
+            poll_seconds (float): Seconds between reads of the log when not notified.
+        """
+        if self._is_polling():
+            return
+        async with AsyncSession(engine) as session:
+            last_sequence = (
+                await session.exec(build_last_change_sequence_statement())
+            ).one()
+        if self._is_polling():
+            # started by another subscription meanwhile
+            return
+
+        with self._lock:
+            self._last_sequence = last_sequence or 0
+        self._wakeup = asyncio.Event()
+        self._poller = asyncio.create_task(
+            self._poll(engine, self._wakeup, poll_seconds)
+        )
+
+    def _is_polling(self) -> bool:
+        poller = self._poller
+        return (
+            poller is not None
+            and not poller.done()
+            and not poller.get_loop().is_closed()
+        )
+
+    async def _poll(
+        self, engine: AsyncEngine, wakeup: asyncio.Event, poll_seconds: float
+    ) -> None:
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    return
+                since = self._last_sequence or 0
+
+            wakeup.clear()
+            try:
+                async with AsyncSession(engine) as session:
+                    changes = (
+                        await session.exec(
+                            build_changes_page_statement(
+                                entity=None,
+                                since=since,
+                                limit=CHANGE_LOG_POLL_PAGE_SIZE,
+                            )
+                        )
+                    ).all()
+            except Exception:
+                logger.exception("Change log could not be read, retrying")
+                changes = []
+            self.publish([change_log_row_to_public_dict(change) for change in changes])
+            if len(changes) == CHANGE_LOG_POLL_PAGE_SIZE:
+                continue
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=poll_seconds)
+            except TimeoutError:
+                pass
@@ -0,0 +1,237 @@
+from collections.abc import Sequence
+from typing import Any, Final
+
+from pydantic_core import from_json
+from sqlalchemy import Insert, Select, func, insert
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.internal.chunking import chunked
+from app.internal.responses import dump_json
+from app.schemas.changes import ChangeEntity, ChangeLogDb, ChangeOperation
+
+# rows per executemany call, as for the rows changed themselves
+CHANGE_LOG_INSERT_CHUNK_SIZE: Final[int] = 10_000
+
+
+def build_change_log_rows(
+    *, entity: ChangeEntity, operation: ChangeOperation, rows: Sequence[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Build the change log rows recording changes made to rows of an entity.
+
+    Args:
+        entity (ChangeEntity): The type of the rows changed.
+        operation (ChangeOperation): The change made.
+        rows (Sequence[dict[str, Any]]): Column values of the rows changed, with a `ref_data_uuid` each.
+
+    Returns:
+        list[dict[str, Any]]: Column values of the `ChangeLogDb` rows, the sequence being assigned on insert.
+    """
+    return [
+        {
+            "entity": entity,
+            "operation": operation,
+            "ref_data_uuid": row["ref_data_uuid"],
+            "payload": dump_json(row).decode(),
+        }
+        for row in rows
+    ]
+
+
+def build_change_log_insert_statement() -> Insert:
+    """
+    Build the Core statement appending change log rows, to be executed with a list of rows built by
+    `build_change_log_rows`.
+
+    Returns:
+        Insert: The insert statement.
+    """
+    return insert(ChangeLogDb.__table__)
+
+
+def build_last_change_sequence_statement() -> Select:
+    """
+    Build the statement reading the sequence of the last change of the log, the maximum of the rowid, which SQLite
+    reads from the end of the table.
+
+    Returns:
+        Select: The statement selecting the sequence, null if the log is empty.
+    """
+    return select(func.max(ChangeLogDb.sequence))
+
+
+def _build_changes(
+    *,
+    entity: ChangeEntity,
+    operation: ChangeOperation,
+    rows: Sequence[dict[str, Any]],
+    last_sequence: int,
+) -> list[dict[str, Any]]:
+    # rows appended by a single transaction get consecutive sequences, as SQLite serializes writers and rowids are
+    # assigned as the maximum plus one
+    first_sequence = last_sequence - len(rows) + 1
+    return [
+        {
+            "sequence": first_sequence + position,
+            "entity": entity,
+            "operation": operation,
+            "ref_data_uuid": row["ref_data_uuid"],
+            "payload": row,
+        }
+        for position, row in enumerate(rows)
+    ]
+
+
+def record_changes(
+    *,
+    session: Session,
+    entity: ChangeEntity,
+    operation: ChangeOperation,
+    rows: Sequence[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    Append changes to the change log, within the current transaction of the session, so they are committed (or
+    rolled back) together with the rows changed. The last sequence of the log is the global change sequence of
+    entity tags, see `get_change_sequence`.
+
+    SQLite serializes writers, so sequences are assigned in commit order, and a reader never sees a change with a
+    higher sequence before a change with a lower one.
+
+    Args:
+        session (Session): The database session.
+        entity (ChangeEntity): The type of the rows changed.
+        operation (ChangeOperation): The change made.
+        rows (Sequence[dict[str, Any]]): Column values of the rows changed.
+
+    Returns:
+        list[dict[str, Any]]: The changes recorded, shaped like `ChangePublic`, to be published once committed.
+    """
+    # relies on a single writer at a time: with concurrent writers, a change could be committed after a change with a
+    # higher sequence, and readers following the log from the higher one would skip it
+    statement = build_change_log_insert_statement()
+    change_log_rows = build_change_log_rows(
+        entity=entity, operation=operation, rows=rows
+    )
+    for chunk in chunked(change_log_rows, CHANGE_LOG_INSERT_CHUNK_SIZE):
+        session.connection().execute(statement, list(chunk))
+    last_sequence = session.exec(build_last_change_sequence_statement()).one()
+
+    return _build_changes(
+        entity=entity, operation=operation, rows=rows, last_sequence=last_sequence
+    )
+
+
+async def record_changes_async(
+    *,
+    session: AsyncSession,
+    entity: ChangeEntity,
+    operation: ChangeOperation,
+    rows: Sequence[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    Async version of `record_changes`, for async sessions.
+
+    Args:
+        session (AsyncSession): The async database session.
+        entity (ChangeEntity): The type of the rows changed.
+        operation (ChangeOperation): The change made.
+        rows (Sequence[dict[str, Any]]): Column values of the rows changed.
+
+    Returns:
+        list[dict[str, Any]]: The changes recorded, shaped like `ChangePublic`, to be published once committed.
+    """
+    statement = build_change_log_insert_statement()
+    change_log_rows = build_change_log_rows(
+        entity=entity, operation=operation, rows=rows
+    )
+    for chunk in chunked(change_log_rows, CHANGE_LOG_INSERT_CHUNK_SIZE):
+        await (await session.connection()).execute(statement, list(chunk))
+    last_sequence = (await session.exec(build_last_change_sequence_statement())).one()
+
+    return _build_changes(
+        entity=entity, operation=operation, rows=rows, last_sequence=last_sequence
+    )
+
+
+def build_changes_page_statement(
+    *, entity: ChangeEntity | None, since: int, limit: int | None
+) -> Select:
+    """
+    Build the statement fetching the changes of an entity, or of all entities, after a given sequence, in log order.
+
+    Args:
+        entity (ChangeEntity | None): The type of the rows changed, or None to fetch changes of all types.
+        since (int): Only fetch changes with a greater sequence.
+        limit (int | None): Maximum number of changes to fetch, or None to fetch all of them.
+
+    Returns:
+        Select: The statement selecting the changes.
+    """
+    statement = select(ChangeLogDb).where(ChangeLogDb.sequence > since)
+    if entity is not None:
+        statement = statement.where(ChangeLogDb.entity == entity)
+    return statement.order_by(ChangeLogDb.sequence).limit(limit)
+
+
+def change_log_row_to_public_dict(change: ChangeLogDb) -> dict[str, Any]:
+    """
+    Change read from the log, shaped like `ChangePublic`, its payload parsed from the JSON of a validated row.
+
+    Args:
+        change (ChangeLogDb): The change read from the log.
+
+    Returns:
+        dict[str, Any]: The change.
+    """
+    return {
+        "sequence": change.sequence,
+        "entity": change.entity,
+        "operation": change.operation,
+        "ref_data_uuid": change.ref_data_uuid,
+        "payload": from_json(change.payload),
+    }
+
+
+def build_changed_ref_data_uuids_statement(
+    *, entity: ChangeEntity, since: int
+) -> Select:
+    """
+    Build the statement fetching the sequence and reference data UUID of the changes of an entity after a given
+    sequence, without their payloads, for caches to invalidate what changed.
+
+    Args:
+        entity (ChangeEntity): The type of the rows changed.
+        since (int): Only fetch changes with a greater sequence.
+
+    Returns:
+        Select: The statement selecting (sequence, ref_data_uuid) of the changes.
+    """
+    return select(ChangeLogDb.sequence, ChangeLogDb.ref_data_uuid).where(
+        ChangeLogDb.entity == entity, ChangeLogDb.sequence > since
+    )
+
+
+def build_changes_page(
+    changes: Sequence[ChangeLogDb], *, since: int, limit: int
+) -> dict[str, Any]:
+    """
+    Build a page of changes, shaped like `ChangesPage`, from up to `limit + 1` changes fetched.
+
+    Payloads are parsed from the JSON stored in the log, they were serialized from validated rows.
+
+    Args:
+        changes (Sequence[ChangeLogDb]): The changes fetched, one more than `limit` if more are available.
+        since (int): The sequence the changes were requested after.
+        limit (int): Maximum number of changes in the page.
+
+    Returns:
+        dict[str, Any]: The page of changes.
+    """
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return {
+        "changes": [change_log_row_to_public_dict(change) for change in changes],
+        "next_since": changes[-1].sequence if changes else since,
+        "has_more": has_more,
+    }
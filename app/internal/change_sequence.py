@@ -0,0 +1,69 @@
+from typing import Final
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.responses import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.internal.change_log import build_last_change_sequence_statement
+
+ETAG_HEADER: Final[str] = "ETag"
+
+
+def get_change_sequence(session: Session) -> int:
+    """
+    Current global change sequence, the sequence of the last change of the change log, 0 if nothing was ever changed.
+
+    Every commit changing data appends to the change log, so the sequence moves with each of them, and entity tags
+    and the caches following the log share a single counter.
+    """
+    return session.exec(build_last_change_sequence_statement()).one() or 0
+
+
+async def get_change_sequence_async(session: AsyncSession) -> int:
+    """Async version of `get_change_sequence`, for async sessions."""
+    return (await session.exec(build_last_change_sequence_statement())).one() or 0
+
+
+def make_etag(sequence: int, variant: str | None = None) -> str:
+    """
+    Strong entity tag of a representation read at a given change sequence.
+
+    The sequence is read before the data, so a change committed in between makes the tag older than the data, and
+    clients fetch the data again on their next request instead of missing the change.
+
+    Args:
+        sequence (int): The change sequence read before the data.
+        variant (str | None): Distinguishes representations of the same data, e.g. their format.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    if variant is not None:
+        return f'"{sequence}-{variant}"'
+    return f'"{sequence}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an `If-None-Match` request header matches an entity tag, using the weak comparison required for it.
+
+    Args:
+        if_none_match (str | None): The header value, a comma separated list of entity tags, or `*`.
+        etag (str): The entity tag of the current representation.
+
+    Returns:
+        bool: True if the client already has the current representation.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    """Response telling the client its copy of the representation is still current."""
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
@@ -0,0 +1,26 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[tuple[T, ...]]:
+    """
+    Split an iterable into tuples of at most `size` elements.
+
+    Equivalent of `itertools.batched` (only available from Python 3.12).
+
+    Args:
+        iterable (Iterable[T]): The iterable to split.
+        size (int): Maximum number of elements per chunk.
+
+    Yields:
+        tuple[T, ...]: Consecutive chunks, the last one may be shorter.
+    """
+    if size < 1:
+        raise ValueError("Chunk size should be at least 1.")
+
+    iterator = iter(iterable)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
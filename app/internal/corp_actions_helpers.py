@@ -0,0 +1,244 @@
+import datetime
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlmodel import col, select
+
+from app.internal.chunking import chunked
+from app.internal.lookup_ref_data_uuid import SYMBOLS_LOOKUP_CHUNK_SIZE
+from app.schemas import SymbologySymbolDb
+from app.schemas.corp_actions import CorpActionDb, CorpActionsTypes
+
+
+def filter_corp_actions(
+    statement: Select,
+    *,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: datetime.datetime | None = None,
+    effective_to: datetime.datetime | None = None,
+) -> Select:
+    """
+    Restrict a statement selecting corporate actions to a type and an effective time window.
+
+    Args:
+        statement (Select): The statement to restrict.
+        action_type (CorpActionsTypes | None): Only select corporate actions of this type, if provided.
+        effective_from (datetime.datetime | None): Only select corporate actions effective at or after this time.
+        effective_to (datetime.datetime | None): Only select corporate actions effective at or before this time.
+
+    Returns:
+        Select: The restricted statement.
+    """
+    if action_type:
+        statement = statement.where(CorpActionDb.action_type == action_type)
+    if effective_from is not None:
+        statement = statement.where(CorpActionDb.effective_time >= effective_from)
+    if effective_to is not None:
+        statement = statement.where(CorpActionDb.effective_time <= effective_to)
+    return statement
+
+
+def build_corp_actions_page_statement(
+    *,
+    limit: int | None,
+    after: tuple[str, datetime.datetime] | None = None,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: datetime.datetime | None = None,
+    effective_to: datetime.datetime | None = None,
+) -> Select:
+    """
+    Build the statement fetching one page of corporate actions, ordered by (ref_data_uuid, effective_time).
+
+    The order matches the primary key, so pages are read from its index in order instead of sorting the whole table.
+
+    Args:
+        limit (int | None): Maximum number of rows to fetch, or None to fetch all remaining rows.
+        after (tuple[str, datetime.datetime] | None): Sort key of the last row of the previous page.
+        action_type (CorpActionsTypes | None): Only fetch corporate actions of this type, if provided.
+        effective_from (datetime.datetime | None): Only fetch corporate actions effective at or after this time.
+        effective_to (datetime.datetime | None): Only fetch corporate actions effective at or before this time.
+
+    Returns:
+        Select: The statement selecting the page.
+    """
+    sort_key = (CorpActionDb.ref_data_uuid, CorpActionDb.effective_time)
+    statement = select(CorpActionDb).order_by(*sort_key).limit(limit)
+
+    if after is not None:
+        statement = statement.where(tuple_(*sort_key) > after)
+
+    return filter_corp_actions(
+        statement,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+
+
+def build_existing_corp_action_keys_statements(
+    ref_data_uuids: Iterable[str],
+) -> Iterator[Select]:
+    """
+    Build the statements fetching the primary keys of all corporate actions of the given reference data UUIDs.
+
+    Reference data UUIDs are de-duplicated and split into chunks of `SYMBOLS_LOOKUP_CHUNK_SIZE`, and only primary key
+    columns are selected, so statements are answered from the primary key index.
+
+    Args:
+        ref_data_uuids (Iterable[str]): The reference data UUIDs to fetch corporate action keys of.
+
+    Yields:
+        Select: A statement selecting (ref_data_uuid, effective_time) of one chunk of reference data UUIDs.
+    """
+    for chunk in chunked(sorted(set(ref_data_uuids)), SYMBOLS_LOOKUP_CHUNK_SIZE):
+        yield select(CorpActionDb.ref_data_uuid, CorpActionDb.effective_time).where(
+            col(CorpActionDb.ref_data_uuid).in_(chunk)
+        )
+
+
+def build_corp_actions_of_ref_data_uuid_statement(
+    *,
+    ref_data_uuid: str,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: datetime.datetime | None = None,
+    effective_to: datetime.datetime | None = None,
+) -> Select:
+    """
+    Build the statement fetching the corporate actions of a reference data UUID, ordered by effective time.
+
+    The filter, the effective time window and the order match the primary key, so rows are read from its index in
+    order.
+
+    Args:
+        ref_data_uuid (str): The reference data UUID.
+        action_type (CorpActionsTypes | None): Only fetch corporate actions of this type, if provided.
+        effective_from (datetime.datetime | None): Only fetch corporate actions effective at or after this time.
+        effective_to (datetime.datetime | None): Only fetch corporate actions effective at or before this time.
+
+    Returns:
+        Select: The statement selecting the corporate actions.
+    """
+    statement = (
+        select(CorpActionDb)
+        .where(CorpActionDb.ref_data_uuid == ref_data_uuid)
+        .order_by(CorpActionDb.effective_time)
+    )
+    return filter_corp_actions(
+        statement,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+
+
+def build_corp_actions_of_symbol_statement(
+    *,
+    symbology: str,
+    symbol: str,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: datetime.datetime | None = None,
+    effective_to: datetime.datetime | None = None,
+) -> Select:
+    """
+    Build the statement fetching the corporate actions of the securities a (symbology, symbol) pair was assigned to,
+    at their effective time, ordered by (effective_time, ref_data_uuid).
+
+    A symbol may be reassigned to another security over time, so a corporate action is only selected if the symbol
+    was valid for its reference data UUID when it became effective, as when corporate actions are created by symbol.
+    The symbols are found with the symbol resolution index, then the corporate actions of each of them with the
+    primary key.
+
+    Args:
+        symbology (str): The symbology of the symbol.
+        symbol (str): The symbol.
+        action_type (CorpActionsTypes | None): Only fetch corporate actions of this type, if provided.
+        effective_from (datetime.datetime | None): Only fetch corporate actions effective at or after this time.
+        effective_to (datetime.datetime | None): Only fetch corporate actions effective at or before this time.
+
+    Returns:
+        Select: The statement selecting the corporate actions.
+    """
+    statement = (
+        select(CorpActionDb)
+        .join(
+            SymbologySymbolDb,
+            (SymbologySymbolDb.ref_data_uuid == CorpActionDb.ref_data_uuid)
+            & (SymbologySymbolDb.start_time <= CorpActionDb.effective_time)
+            & (SymbologySymbolDb.end_time >= CorpActionDb.effective_time),
+        )
+        .where(
+            SymbologySymbolDb.symbology == symbology,
+            SymbologySymbolDb.symbol == symbol,
+        )
+        # the symbol may have been assigned to the same security in overlapping periods
+        .distinct()
+        .order_by(CorpActionDb.effective_time, CorpActionDb.ref_data_uuid)
+    )
+    return filter_corp_actions(
+        statement,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+
+
+def build_corp_actions_calendar_statement(
+    *,
+    effective_from: datetime.datetime,
+    effective_to: datetime.datetime,
+    action_type: CorpActionsTypes | None = None,
+) -> Select:
+    """
+    Build the statement fetching the corporate actions of all securities effective in a window, ordered by
+    (effective_time, ref_data_uuid).
+
+    The window is searched with the (effective_time, action_type) index, which also filters the type without reading
+    rows of other types.
+
+    Args:
+        effective_from (datetime.datetime): Only fetch corporate actions effective at or after this time.
+        effective_to (datetime.datetime): Only fetch corporate actions effective at or before this time.
+        action_type (CorpActionsTypes | None): Only fetch corporate actions of this type, if provided.
+
+    Returns:
+        Select: The statement selecting the corporate actions.
+    """
+    statement = select(CorpActionDb).order_by(
+        CorpActionDb.effective_time, CorpActionDb.ref_data_uuid
+    )
+    return filter_corp_actions(
+        statement,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+
+
+def iter_corp_actions_as_public_dicts(
+    corp_actions: Iterable[CorpActionDb],
+) -> Iterator[dict[str, Any]]:
+    """
+    Convert corporate actions read from the database straight to JSON-ready dicts shaped like `CorpActionPublic`.
+
+    Like `iter_symbol_rows_as_public_dicts`, corporate actions are not validated again: they come from our own
+    database, so they already passed validation when they were created. Datetimes are formatted the same way
+    pydantic does.
+
+    Args:
+        corp_actions (Iterable[CorpActionDb]): The corporate actions.
+
+    Yields:
+        dict[str, Any]: One dict per corporate action.
+    """
+    for corp_action in corp_actions:
+        # keys in the same order as CorpActionPublic fields
+        yield {
+            "ref_data_uuid": corp_action.ref_data_uuid,
+            "effective_time": corp_action.effective_time.isoformat(),
+            "action_type": corp_action.action_type,
+            "additive_adjustment": corp_action.additive_adjustment,
+            "multiplicative_adjustment": corp_action.multiplicative_adjustment,
+            "message": None,
+            "error": None,
+        }
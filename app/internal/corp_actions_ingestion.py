@@ -0,0 +1,235 @@
+import datetime
+from collections.abc import Iterable, Sequence
+from typing import Any, Final, NamedTuple, TypeAlias
+
+from sqlalchemy import Insert, insert
+from sqlmodel import Session
+
+from app.internal.chunking import chunked
+from app.internal.corp_actions_helpers import (
+    build_existing_corp_action_keys_statements,
+)
+from app.internal.lookup_ref_data_uuid import (
+    build_existing_ref_data_uuids_statements,
+    build_symbol_candidates_statements,
+)
+from app.internal.symbol_resolver import PointInTimeKey, SymbolResolver
+from app.schemas import SymbologySymbolDb
+from app.schemas.corp_actions import CorpActionCreate, CorpActionDb
+
+# rows per executemany call, bounds the memory used by parameters
+CORP_ACTIONS_INSERT_CHUNK_SIZE: Final[int] = 10_000
+
+CorpActionRow: TypeAlias = dict[str, Any]
+"""Column values of a `CorpActionDb` row, as inserted."""
+
+CorpActionKey: TypeAlias = tuple[str, datetime.datetime]
+"""(ref_data_uuid, effective_time) primary key of a corporate action."""
+
+CREATED_MESSAGE: Final[str] = "Corporate Action created successfully."
+
+
+class CorpActionsCreationPlan(NamedTuple):
+    """Outcome of each item of a batch creation request, and the rows to insert for the accepted ones."""
+
+    outputs: list[dict[str, Any]]
+    rows: list[CorpActionRow]
+
+
+def resolve_corp_actions_ref_data_uuids(
+    *,
+    session: Session,
+    resolver: SymbolResolver,
+    corp_actions: Sequence[CorpActionCreate],
+) -> list[tuple[str, ...]]:
+    """
+    Find the reference data UUIDs each corporate action applies to, for all corporate actions at once.
+
+    Corporate actions given by (symbology, symbol) are resolved at their effective time by the in-memory resolver,
+    once caught up with the symbols committed by other workers and scripts, and only the pairs it misses are fetched
+    from the database, in chunks. Corporate actions given by ref_data_uuid are checked to exist in chunks too.
+
+    Args:
+        session (Session): The database session.
+        resolver (SymbolResolver): The in-memory symbol resolver, caught up with the change log and updated with
+            symbols fetched from the database.
+        corp_actions (Sequence[CorpActionCreate]): The corporate actions to resolve.
+
+    Returns:
+        list[tuple[str, ...]]: For each corporate action (in input order), the sorted reference data UUIDs it applies
+            to, empty if its symbol or reference data UUID is unknown.
+    """
+    results: list[tuple[str, ...]] = [()] * len(corp_actions)
+
+    positions_by_symbol = [
+        position
+        for position, corp_action in enumerate(corp_actions)
+        if corp_action.ref_data_uuid is None
+    ]
+    keys: list[PointInTimeKey] = [
+        (
+            corp_actions[position].symbology,
+            corp_actions[position].symbol,
+            corp_actions[position].effective_time,
+        )
+        for position in positions_by_symbol
+    ]
+    # a stale hit would attach a corporate action to the wrong security, catch up even if no key misses
+    resolver.catch_up(session)
+    resolved = resolver.resolve_many(keys)
+
+    missed = [
+        index for index, ref_data_uuids in enumerate(resolved) if not ref_data_uuids
+    ]
+    if missed:
+        fetched: list[SymbologySymbolDb] = []
+        for statement in build_symbol_candidates_statements(
+            (keys[index][0], keys[index][1]) for index in missed
+        ):
+            fetched.extend(session.exec(statement))
+
+        if fetched:
+            resolver.add(fetched)
+            for index, ref_data_uuids in zip(
+                missed, resolver.resolve_many([keys[index] for index in missed])
+            ):
+                resolved[index] = ref_data_uuids
+
+    for position, ref_data_uuids in zip(positions_by_symbol, resolved):
+        results[position] = ref_data_uuids
+
+    existing_ref_data_uuids: set[str] = set()
+    for statement in build_existing_ref_data_uuids_statements(
+        corp_action.ref_data_uuid
+        for corp_action in corp_actions
+        if corp_action.ref_data_uuid is not None
+    ):
+        existing_ref_data_uuids.update(session.exec(statement))
+
+    for position, corp_action in enumerate(corp_actions):
+        if corp_action.ref_data_uuid in existing_ref_data_uuids:
+            results[position] = (corp_action.ref_data_uuid,)
+
+    return results
+
+
+def fetch_existing_corp_action_keys(
+    *, session: Session, ref_data_uuids: Iterable[str]
+) -> set[CorpActionKey]:
+    """
+    Fetch the primary keys of all corporate actions of the given reference data UUIDs.
+
+    Args:
+        session (Session): The database session.
+        ref_data_uuids (Iterable[str]): The reference data UUIDs to fetch corporate action keys of.
+
+    Returns:
+        set[CorpActionKey]: The (ref_data_uuid, effective_time) keys found.
+    """
+    existing_keys: set[CorpActionKey] = set()
+    for statement in build_existing_corp_action_keys_statements(ref_data_uuids):
+        existing_keys.update(tuple(row) for row in session.exec(statement))
+    return existing_keys
+
+
+def plan_corp_actions_creation(
+    *,
+    corp_actions: Sequence[CorpActionCreate],
+    ref_data_uuids_per_item: Sequence[tuple[str, ...]],
+    existing_keys: set[CorpActionKey],
+) -> CorpActionsCreationPlan:
+    """
+    Decide, for each item of a batch creation request, which corporate action rows to insert.
+
+    An item is rejected as a whole if its symbol or reference data UUID is unknown, or if any of its rows would
+    duplicate a corporate action already in the database or planned for a previous item of the same request.
+
+    Args:
+        corp_actions (Sequence[CorpActionCreate]): The items of the batch creation request.
+        ref_data_uuids_per_item (Sequence[tuple[str, ...]]): Reference data UUIDs of each item, see
+            `resolve_corp_actions_ref_data_uuids`.
+        existing_keys (set[CorpActionKey]): Keys of corporate actions in the database, updated in place with the
+            keys of the rows planned.
+
+    Returns:
+        CorpActionsCreationPlan: The outcome of each item, in input order, as dicts shaped like
+            `CorpActionBatchResult`, and the rows to insert.
+    """
+    outputs: list[dict[str, Any]] = []
+    rows: list[CorpActionRow] = []
+
+    for corp_action, ref_data_uuids in zip(corp_actions, ref_data_uuids_per_item):
+        if not ref_data_uuids:
+            if corp_action.ref_data_uuid is not None:
+                error = f"No symbol found for ref_data_uuid {corp_action.ref_data_uuid}"
+            else:
+                error = (
+                    f"No symbol found for {corp_action.symbology} {corp_action.symbol} on "
+                    f"{corp_action.effective_time}"
+                )
+            outputs.append({"created": [], "error": error})
+            continue
+
+        keys = [
+            (ref_data_uuid, corp_action.effective_time)
+            for ref_data_uuid in ref_data_uuids
+        ]
+        duplicates = [key for key in keys if key in existing_keys]
+        if duplicates:
+            error = "Corporate action already exists for " + ", ".join(
+                f"ref_data_uuid {ref_data_uuid} on {effective_time}"
+                for ref_data_uuid, effective_time in duplicates
+            )
+            outputs.append({"created": [], "error": error})
+            continue
+
+        item_rows = [
+            {
+                "ref_data_uuid": ref_data_uuid,
+                "effective_time": corp_action.effective_time,
+                "action_type": corp_action.action_type,
+                "additive_adjustment": corp_action.additive_adjustment,
+                "multiplicative_adjustment": corp_action.multiplicative_adjustment,
+            }
+            for ref_data_uuid in ref_data_uuids
+        ]
+        existing_keys.update(keys)
+        rows.extend(item_rows)
+
+        # rows are returned as inserted, in the shape of CorpActionPublic, instead of being read back
+        outputs.append(
+            {
+                "created": [
+                    {**row, "message": CREATED_MESSAGE, "error": None}
+                    for row in item_rows
+                ],
+                "error": None,
+            }
+        )
+
+    return CorpActionsCreationPlan(outputs=outputs, rows=rows)
+
+
+def build_corp_actions_insert_statement() -> Insert:
+    """
+    Build the Core statement inserting corporate action rows, to be executed with a list of `CorpActionRow`
+    parameters, without building ORM instances.
+
+    Returns:
+        Insert: The insert statement.
+    """
+    return insert(CorpActionDb.__table__)
+
+
+def insert_corp_action_rows(*, session: Session, rows: Sequence[CorpActionRow]) -> None:
+    """
+    Insert corporate action rows in chunks of `CORP_ACTIONS_INSERT_CHUNK_SIZE`, within the current transaction of the
+    session.
+
+    Args:
+        session (Session): The database session.
+        rows (Sequence[CorpActionRow]): The rows to insert.
+    """
+    statement = build_corp_actions_insert_statement()
+    for chunk in chunked(rows, CORP_ACTIONS_INSERT_CHUNK_SIZE):
+        session.connection().execute(statement, list(chunk))
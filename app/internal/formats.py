@@ -0,0 +1,305 @@
+"""
+Content negotiation of the list and bulk endpoints. Besides JSON, the default, they return:
+
+- Apache Arrow IPC streams (`application/vnd.apache.arrow.stream`): one row per symbol or corporate action, with the
+  low cardinality string columns (symbology, exchange, action type) dictionary-encoded and times as `timestamp[us]`
+  columns. Consumers load them without copying the data, e.g. `pyarrow.ipc.open_stream(content).read_all()`, or
+  `pyarrow.ipc.open_stream(pyarrow.memory_map(path))` once saved to a file.
+- MessagePack (`application/msgpack`): the same documents as JSON, in a compact binary encoding. Exports are a
+  sequence of MessagePack documents instead of lines, read with `msgpack.Unpacker`.
+
+Both need the optional `formats` dependencies (`uv sync --extra formats`), requests accepting only them are rejected
+with 406 otherwise.
+"""
+
+import importlib.util
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from enum import StrEnum
+from functools import cache
+from typing import TYPE_CHECKING, Any, Final
+
+from fastapi import Header, HTTPException
+from starlette.status import HTTP_406_NOT_ACCEPTABLE
+
+from app.internal.change_sequence import make_etag
+from app.internal.streaming import NDJSON_MEDIA_TYPE, iter_record_batches
+from app.schemas.corp_actions import CorpActionDb
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+JSON_MEDIA_TYPE: Final[str] = "application/json"
+ARROW_STREAM_MEDIA_TYPE: Final[str] = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE: Final[str] = "application/msgpack"
+
+# representations depend on the Accept request header, for caches in between
+VARY_HEADER: Final[str] = "Vary"
+
+
+class ResponseFormat(StrEnum):
+    JSON = "json"
+    ARROW = "arrow"
+    MSGPACK = "msgpack"
+
+
+# media types each binary format is requested with
+_BINARY_MEDIA_TYPES: Final[dict[str, ResponseFormat]] = {
+    ARROW_STREAM_MEDIA_TYPE: ResponseFormat.ARROW,
+    MSGPACK_MEDIA_TYPE: ResponseFormat.MSGPACK,
+    "application/x-msgpack": ResponseFormat.MSGPACK,
+}
+
+# media type of the responses of each binary format
+FORMAT_MEDIA_TYPES: Final[dict[ResponseFormat, str]] = {
+    ResponseFormat.ARROW: ARROW_STREAM_MEDIA_TYPE,
+    ResponseFormat.MSGPACK: MSGPACK_MEDIA_TYPE,
+}
+
+# optional module each binary format is encoded with
+_FORMAT_MODULES: Final[dict[ResponseFormat, str]] = {
+    ResponseFormat.ARROW: "pyarrow",
+    ResponseFormat.MSGPACK: "msgpack",
+}
+
+# documents the alternative representations of the list and bulk endpoints in the OpenAPI schema
+PAGE_RESPONSES: Final[dict[int | str, dict[str, Any]]] = {
+    200: {"content": {ARROW_STREAM_MEDIA_TYPE: {}, MSGPACK_MEDIA_TYPE: {}}}
+}
+EXPORT_RESPONSES: Final[dict[int | str, dict[str, Any]]] = {
+    200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {},
+            ARROW_STREAM_MEDIA_TYPE: {},
+            MSGPACK_MEDIA_TYPE: {},
+        }
+    }
+}
+
+
+def is_format_available(response_format: ResponseFormat) -> bool:
+    """Whether the optional dependency a format is encoded with is installed, always True for JSON."""
+    module = _FORMAT_MODULES.get(response_format)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _parse_accept(accept: str) -> list[str]:
+    """Media ranges of an `Accept` header, most preferred first, without the ones the client refuses (q=0)."""
+    media_ranges: list[tuple[float, int, str]] = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            media_ranges.append((-quality, position, media_type.lower()))
+    return [media_type for _, _, media_type in sorted(media_ranges)]
+
+
+def negotiate_response_format(
+    accept: str | None, *, json_media_type: str = JSON_MEDIA_TYPE
+) -> ResponseFormat:
+    """
+    Pick the response format of a request from its `Accept` header.
+
+    JSON is returned when the header is missing or accepts any media type, so existing clients are not affected.
+    Binary formats whose optional dependency is not installed are skipped, as if not supported.
+
+    Args:
+        accept (str | None): The `Accept` request header.
+        json_media_type (str): The media type JSON is returned with by the endpoint, e.g. NDJSON for exports.
+
+    Returns:
+        ResponseFormat: The most preferred format the client accepts.
+
+    Raises:
+        HTTPException: 406 if none of the accepted media types can be returned.
+    """
+    if not accept:
+        return ResponseFormat.JSON
+
+    for media_type in _parse_accept(accept):
+        if media_type in ("*/*", "application/*", json_media_type):
+            return ResponseFormat.JSON
+        response_format = _BINARY_MEDIA_TYPES.get(media_type)
+        if response_format is not None and is_format_available(response_format):
+            return response_format
+
+    supported = [json_media_type] + [
+        media_type
+        for response_format, media_type in FORMAT_MEDIA_TYPES.items()
+        if is_format_available(response_format)
+    ]
+    raise HTTPException(
+        status_code=HTTP_406_NOT_ACCEPTABLE,
+        detail=f"None of the accepted media types is supported, expected one of: {', '.join(supported)}.",
+    )
+
+
+def get_page_format(accept: str | None = Header(None)) -> ResponseFormat:
+    """Response format of a list endpoint, negotiated from the `Accept` request header."""
+    return negotiate_response_format(accept)
+
+
+def get_export_format(accept: str | None = Header(None)) -> ResponseFormat:
+    """Response format of a bulk export endpoint, negotiated from the `Accept` request header."""
+    return negotiate_response_format(accept, json_media_type=NDJSON_MEDIA_TYPE)
+
+
+def make_representation_etag(sequence: int, response_format: ResponseFormat) -> str:
+    """
+    Strong entity tag of a representation read at a given change sequence, distinct for each format, as a strong tag
+    identifies the bytes of one representation. JSON keeps the plain tag of `make_etag`.
+    """
+    if response_format is ResponseFormat.JSON:
+        return make_etag(sequence)
+    return make_etag(sequence, variant=response_format)
+
+
+@cache
+def build_symbols_arrow_schema() -> "pa.Schema":
+    """Arrow schema of symbols, one row per symbol, columns as in `SYMBOL_ROW_COLUMNS`."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field("ref_data_uuid", pa.string(), nullable=False),
+            pa.field(
+                "symbology", pa.dictionary(pa.int32(), pa.string()), nullable=False
+            ),
+            pa.field("symbol", pa.string(), nullable=False),
+            pa.field("exchange", pa.dictionary(pa.int32(), pa.string())),
+            pa.field("start_time", pa.timestamp("us"), nullable=False),
+            pa.field("end_time", pa.timestamp("us"), nullable=False),
+        ]
+    )
+
+
+@cache
+def build_corp_actions_arrow_schema() -> "pa.Schema":
+    """Arrow schema of corporate actions, one row per corporate action, columns as returned by `corp_action_rows`."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field("ref_data_uuid", pa.string(), nullable=False),
+            pa.field("effective_time", pa.timestamp("us"), nullable=False),
+            pa.field(
+                "action_type", pa.dictionary(pa.int32(), pa.string()), nullable=False
+            ),
+            pa.field("additive_adjustment", pa.float64()),
+            pa.field("multiplicative_adjustment", pa.float64()),
+        ]
+    )
+
+
+def corp_action_rows(corp_actions: Iterable[CorpActionDb]) -> Iterator[tuple]:
+    """Rows of the columns of `build_corp_actions_arrow_schema`, one per corporate action."""
+    for corp_action in corp_actions:
+        yield (
+            corp_action.ref_data_uuid,
+            corp_action.effective_time,
+            corp_action.action_type,
+            corp_action.additive_adjustment,
+            corp_action.multiplicative_adjustment,
+        )
+
+
+def _build_record_batch(schema: "pa.Schema", rows: Sequence[tuple]) -> "pa.RecordBatch":
+    """Record batch of rows, transposed to columns, dictionary columns encoded with the distinct values of the rows."""
+    import pyarrow as pa
+
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = [
+        pa.array(values, field.type.value_type).dictionary_encode()
+        if pa.types.is_dictionary(field.type)
+        else pa.array(values, field.type)
+        for field, values in zip(schema, columns)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    """Bytes written to a buffer since it was last drained."""
+    content = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return content
+
+
+def iter_arrow_stream(
+    schema: "pa.Schema", batches: Iterable[Sequence[tuple]]
+) -> Iterator[bytes]:
+    """
+    Write batches of rows as an Arrow IPC stream, one record batch per batch of rows.
+
+    Each record batch comes with the dictionaries of its own values, so batches are encoded as they are produced,
+    without knowing the distinct values of the whole result beforehand.
+
+    Args:
+        schema (pa.Schema): The schema of the stream.
+        batches (Iterable[Sequence[tuple]]): Batches of rows, with one value per field of the schema.
+
+    Yields:
+        bytes: Chunks of the stream, the schema and the first record batch first.
+    """
+    import pyarrow as pa
+
+    buffer = io.BytesIO()
+    with pa.ipc.new_stream(buffer, schema) as writer:
+        for rows in batches:
+            writer.write_batch(_build_record_batch(schema, rows))
+            yield _drain(buffer)
+    # end of stream marker
+    yield _drain(buffer)
+
+
+def dump_arrow(schema: "pa.Schema", rows: Sequence[tuple]) -> bytes:
+    """
+    Serialize rows to an Arrow IPC stream holding a single record batch.
+
+    Args:
+        schema (pa.Schema): The schema of the stream.
+        rows (Sequence[tuple]): The rows, with one value per field of the schema.
+
+    Returns:
+        bytes: The Arrow IPC stream.
+    """
+    return b"".join(iter_arrow_stream(schema, [rows]))
+
+
+def dump_msgpack(content: Any) -> bytes:
+    """
+    Serialize JSON-ready content to MessagePack.
+
+    Args:
+        content (Any): The content, as it would be serialized to JSON.
+
+    Returns:
+        bytes: The MessagePack document.
+    """
+    import msgpack
+
+    return msgpack.packb(content)
+
+
+def iter_msgpack(documents: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Serialize JSON-ready documents to a sequence of MessagePack documents, in chunks of `EXPORT_BATCH_SIZE` documents.
+
+    Args:
+        documents (Iterable[Any]): The documents, as they would be serialized to NDJSON lines.
+
+    Yields:
+        bytes: Chunks of the sequence.
+    """
+    import msgpack
+
+    packer = msgpack.Packer()
+    for batch in iter_record_batches(map(packer.pack, documents)):
+        yield b"".join(batch)
@@ -26,3 +26,13 @@ def generate_ref_data_uuid() -> str:
         str: The generated UUID v7 identifier with the 'ref' prefix.
     """
     return _generate_uuid_v7_with_prefix("ref")
+
+
+def generate_profile_id() -> str:
+    """
+    Generate a UUID v7 identifier with the prefix 'prof', so profiles sort by the time they were taken.
+
+    Returns:
+        str: The generated UUID v7 identifier with the 'prof' prefix.
+    """
+    return _generate_uuid_v7_with_prefix("prof")
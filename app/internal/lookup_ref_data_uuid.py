@@ -1,53 +1,302 @@
+import datetime
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Final, TypeAlias
 
-from fastapi import Depends
-from sqlmodel import Session, select
+from sqlalchemy import Select
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.dependencies import get_session
+from app.internal.chunking import chunked
+from app.internal.symbol_resolver import ResolvedSymbol, SymbolKey, SymbolResolver
 from app.internal.symbols_helpers import (
     convert_symbology_maps_to_symbology_symbol_date_tuples,
 )
 from app.schemas import SymbologyMaps, SymbolsToQuery, SymbologySymbolDb
 
+# SQLite (before 3.32) limits a statement to 999 bound parameters
+SYMBOLS_LOOKUP_CHUNK_SIZE: Final[int] = 900
 
-async def lookup_ref_data_uuid_given_symbology_maps(
-    *, session: Session = Depends(get_session), symbology_maps: SymbologyMaps
+SymbolCandidates: TypeAlias = dict[SymbolKey, list[SymbologySymbolDb | ResolvedSymbol]]
+"""All database entries found for each (symbology, symbol) pair."""
+
+
+def build_symbol_candidates_statements(
+    keys: Iterable[SymbolKey],
+) -> Iterator[Select]:
+    """
+    Build the statements fetching all database entries for the given (symbology, symbol) pairs.
+
+    Pairs are de-duplicated, grouped by symbology and split into chunks of `SYMBOLS_LOOKUP_CHUNK_SIZE` symbols, so
+    the number of statements depends only on the number of distinct pairs, not on the number of time ranges queried
+    for them. Each statement filters on `symbology = ? AND symbol IN (...)` rather than on a
+    `(symbology, symbol) IN (...)` row value, as SQLite cannot use an index for the latter.
+
+    Args:
+        keys (Iterable[SymbolKey]): The (symbology, symbol) pairs to look up.
+
+    Yields:
+        Select: A statement selecting all entries matching one chunk of pairs.
+    """
+    symbols_per_symbology: dict[str, set[str]] = defaultdict(set)
+    for symbology, symbol in keys:
+        symbols_per_symbology[symbology].add(symbol)
+
+    for symbology, symbols in sorted(symbols_per_symbology.items()):
+        for chunk in chunked(sorted(symbols), SYMBOLS_LOOKUP_CHUNK_SIZE):
+            yield select(SymbologySymbolDb).where(
+                SymbologySymbolDb.symbology == symbology,
+                col(SymbologySymbolDb.symbol).in_(chunk),
+            )
+
+
+def build_symbols_valid_at_statement(
+    *, symbology: str, symbol: str, time: datetime.datetime
+) -> Select:
+    """
+    Build the statement fetching all database entries of a (symbology, symbol) pair valid at a given time.
+
+    Args:
+        symbology (str): The symbology of the symbol.
+        symbol (str): The symbol.
+        time (datetime.datetime): The point in time the symbol should be valid at.
+
+    Returns:
+        Select: The statement selecting matching entries.
+    """
+    return select(SymbologySymbolDb).where(
+        SymbologySymbolDb.symbol == symbol,
+        SymbologySymbolDb.symbology == symbology,
+        SymbologySymbolDb.start_time <= time,
+        SymbologySymbolDb.end_time >= time,
+    )
+
+
+def build_ref_data_uuid_exists_statement(*, ref_data_uuid: str) -> Select:
+    """
+    Build the statement checking whether any symbol has been assigned to a reference data UUID.
+
+    Args:
+        ref_data_uuid (str): The reference data UUID to check.
+
+    Returns:
+        Select: The statement returning the reference data UUID if it exists, or no rows otherwise.
+    """
+    return (
+        select(SymbologySymbolDb.ref_data_uuid)
+        .where(SymbologySymbolDb.ref_data_uuid == ref_data_uuid)
+        .limit(1)
+    )
+
+
+def build_existing_ref_data_uuids_statements(
+    ref_data_uuids: Iterable[str],
+) -> Iterator[Select]:
+    """
+    Build the statements checking which of the given reference data UUIDs have been assigned any symbol.
+
+    Reference data UUIDs are de-duplicated and split into chunks of `SYMBOLS_LOOKUP_CHUNK_SIZE`.
+
+    Args:
+        ref_data_uuids (Iterable[str]): The reference data UUIDs to check.
+
+    Yields:
+        Select: A statement returning the distinct reference data UUIDs of one chunk that exist.
+    """
+    for chunk in chunked(sorted(set(ref_data_uuids)), SYMBOLS_LOOKUP_CHUNK_SIZE):
+        yield (
+            select(SymbologySymbolDb.ref_data_uuid)
+            .where(col(SymbologySymbolDb.ref_data_uuid).in_(chunk))
+            .distinct()
+        )
+
+
+def _split_keys_known_to_resolver(
+    keys: Iterable[SymbolKey], resolver: SymbolResolver | None
+) -> tuple[SymbolCandidates, set[SymbolKey]]:
+    """Candidates of pairs known to the resolver, and the remaining pairs to fetch from the database."""
+    candidates: SymbolCandidates = defaultdict(list)
+
+    keys_to_fetch: set[SymbolKey] = set()
+    for key in set(keys):
+        intervals = resolver.get_intervals(key) if resolver else None
+        if intervals is None:
+            keys_to_fetch.add(key)
+        else:
+            candidates[key].extend(intervals)
+
+    return candidates, keys_to_fetch
+
+
+def _add_fetched_candidates(
+    candidates: SymbolCandidates,
+    fetched: Iterable[SymbologySymbolDb],
+    resolver: SymbolResolver | None,
+) -> SymbolCandidates:
+    """Add entries fetched from the database to the candidates, and to the resolver if provided."""
+    fetched = list(fetched)
+    for symbol in fetched:
+        candidates[(symbol.symbology, symbol.symbol)].append(symbol)
+
+    if resolver and fetched:
+        resolver.add(fetched)
+
+    return candidates
+
+
+def fetch_symbol_candidates(
+    *,
+    session: Session,
+    keys: Iterable[SymbolKey],
+    resolver: SymbolResolver | None = None,
+) -> SymbolCandidates:
+    """
+    Fetch all database entries for the given (symbology, symbol) pairs.
+
+    If a resolver is provided, it is first caught up with the symbols committed by other workers and scripts, then
+    pairs it already knows are served from memory, and only the remaining ones are fetched from the database (and
+    then added to the resolver).
+
+    Args:
+        session (Session): The database session.
+        keys (Iterable[SymbolKey]): The (symbology, symbol) pairs to look up.
+        resolver (SymbolResolver | None): In-memory resolver to try first. Defaults to None.
+
+    Returns:
+        SymbolCandidates: Entries grouped by (symbology, symbol), pairs without entries map to an empty list.
+    """
+    if resolver:
+        resolver.catch_up(session)
+    candidates, keys_to_fetch = _split_keys_known_to_resolver(keys, resolver)
+
+    fetched: list[SymbologySymbolDb] = []
+    for statement in build_symbol_candidates_statements(keys_to_fetch):
+        fetched.extend(session.exec(statement))
+
+    return _add_fetched_candidates(candidates, fetched, resolver)
+
+
+async def fetch_symbol_candidates_async(
+    *,
+    session: AsyncSession,
+    keys: Iterable[SymbolKey],
+    resolver: SymbolResolver | None = None,
+) -> SymbolCandidates:
+    """
+    Async version of `fetch_symbol_candidates`, for async sessions.
+
+    Args:
+        session (AsyncSession): The async database session.
+        keys (Iterable[SymbolKey]): The (symbology, symbol) pairs to look up.
+        resolver (SymbolResolver | None): In-memory resolver to try first. Defaults to None.
+
+    Returns:
+        SymbolCandidates: Entries grouped by (symbology, symbol), pairs without entries map to an empty list.
+    """
+    if resolver:
+        await resolver.catch_up_async(session)
+    candidates, keys_to_fetch = _split_keys_known_to_resolver(keys, resolver)
+
+    fetched: list[SymbologySymbolDb] = []
+    for statement in build_symbol_candidates_statements(keys_to_fetch):
+        fetched.extend(await session.exec(statement))
+
+    return _add_fetched_candidates(candidates, fetched, resolver)
+
+
+def match_ref_data_uuids(
+    *, candidates: SymbolCandidates, symbols_to_query: Iterable[SymbolsToQuery]
 ) -> dict[str, set[str]]:
     """
-    Lookup reference data UUIDs given symbology maps.
+    Match symbols to query against already fetched database entries.
 
-    This function iterates over the provided symbology maps, checks in the database if the symbols already exist,
-    and returns a set of unique reference data UUIDs.
+    An entry matches when it has the same symbology and symbol, and its validity range lies within the queried one.
 
     Args:
-        session (Session): The database session dependency.
-        symbology_maps (SymbologyMaps): The symbology maps to query.
+        candidates (SymbolCandidates): Entries fetched with `fetch_symbol_candidates`.
+        symbols_to_query (Iterable[SymbolsToQuery]): The symbols to match.
 
     Returns:
-        dict[str, list[str]]: A dict of unique reference data UUIDs, and defined symbologies for this symbol.
+        dict[str, set[str]]: A dict of unique reference data UUIDs, and defined symbologies for this symbol.
     """
+    unique_ref_data_uuids: dict[str, set[str]] = defaultdict(set)
+    for symbol_to_query in symbols_to_query:
+        # TODO <MFido> [02/04/2025] we assume (to be reviewed) that more than one symbol can be found, either get rid
+        #  of this assumption or document explicitly
+        for symbol in candidates.get(
+            (symbol_to_query.symbology, symbol_to_query.symbol), ()
+        ):
+            if (
+                symbol.start_time >= symbol_to_query.start_time
+                and symbol.end_time <= symbol_to_query.end_time
+            ):
+                unique_ref_data_uuids[symbol.ref_data_uuid].add(symbol.symbology)
+    return unique_ref_data_uuids
 
-    # iterate over symbols provided, and check in database if they already exists
-    symbols_to_query: list[SymbolsToQuery] = (
+
+async def lookup_ref_data_uuids_given_list_of_symbology_maps(
+    *,
+    session: AsyncSession,
+    list_of_symbology_maps: list[SymbologyMaps],
+    resolver: SymbolResolver | None = None,
+) -> list[dict[str, set[str]]]:
+    """
+    Lookup reference data UUIDs for many symbology maps at once.
+
+    All symbols of all symbology maps are fetched with a constant number of queries (one per
+    `SYMBOLS_LOOKUP_CHUNK_SIZE` distinct (symbology, symbol) pairs), and then matched in memory.
+
+    Args:
+        session (AsyncSession): The async database session.
+        list_of_symbology_maps (list[SymbologyMaps]): The symbology maps to query.
+        resolver (SymbolResolver | None): In-memory resolver to try before the database. Defaults to None.
+
+    Returns:
+        list[dict[str, set[str]]]: For each symbology map (in input order), a dict of unique reference data UUIDs,
+            and defined symbologies for this symbol.
+    """
+    symbols_to_query_per_map: list[list[SymbolsToQuery]] = [
         convert_symbology_maps_to_symbology_symbol_date_tuples(
             symbology_maps=symbology_maps
         )
+        for symbology_maps in list_of_symbology_maps
+    ]
+    candidates = await fetch_symbol_candidates_async(
+        session=session,
+        keys=(
+            (symbol_to_query.symbology, symbol_to_query.symbol)
+            for symbols_to_query in symbols_to_query_per_map
+            for symbol_to_query in symbols_to_query
+        ),
+        resolver=resolver,
     )
-    unique_ref_data_uuids: dict[str, set[str]] = defaultdict(set)
-    for symbol_to_query in symbols_to_query:
-        statement = select(SymbologySymbolDb).where(
-            SymbologySymbolDb.symbol == symbol_to_query.symbol,
-            SymbologySymbolDb.symbology == symbol_to_query.symbology,
-            SymbologySymbolDb.start_time >= symbol_to_query.start_time,
-            SymbologySymbolDb.end_time <= symbol_to_query.end_time,
-        )
+    return [
+        match_ref_data_uuids(candidates=candidates, symbols_to_query=symbols_to_query)
+        for symbols_to_query in symbols_to_query_per_map
+    ]
+
 
-        results = session.exec(statement)
-        # TODO <MFido> [02/04/2025] we use .all() here with the assumption (to be reviewed) that more than one symbol
-        #  can be found, either get rid of this assumption (and replace with .one() or document explicitly
-        all_symbols: list[SymbologySymbolDb] = results.all()
+async def lookup_ref_data_uuid_given_symbology_maps(
+    *,
+    session: AsyncSession,
+    symbology_maps: SymbologyMaps,
+    resolver: SymbolResolver | None = None,
+) -> dict[str, set[str]]:
+    """
+    Lookup reference data UUIDs given symbology maps.
+
+    This function checks in the database if the symbols provided already exist, and returns a set of unique
+    reference data UUIDs.
+
+    Args:
+        session (AsyncSession): The async database session.
+        symbology_maps (SymbologyMaps): The symbology maps to query.
+        resolver (SymbolResolver | None): In-memory resolver to try before the database. Defaults to None.
 
-        # if we found a symbol / symbols, update the unique_ref_data_uuids dict with the ref_data_uuid as key and symbology as value
-        for symbol in all_symbols:
-            unique_ref_data_uuids[symbol.ref_data_uuid].add(symbol.symbology)
+    Returns:
+        dict[str, list[str]]: A dict of unique reference data UUIDs, and defined symbologies for this symbol.
+    """
+    (unique_ref_data_uuids,) = await lookup_ref_data_uuids_given_list_of_symbology_maps(
+        session=session, list_of_symbology_maps=[symbology_maps], resolver=resolver
+    )
     return unique_ref_data_uuids
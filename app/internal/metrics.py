@@ -0,0 +1,435 @@
+"""
+Metrics of the service, exposed by `GET /metrics` in the Prometheus text exposition format.
+
+Request metrics are recorded by `MetricsMiddleware`, labelled by route template (e.g. `/symbols/{ref_data_uuid}`)
+rather than path, so the number of series stays bounded. Database metrics are recorded by cursor events of the
+engines passed to `ServiceMetrics.instrument_engine`, and attributed to the route of the request executing the
+statement, `<none>` outside requests (e.g. at startup). Each statement is also passed on to the statement observers,
+see `app/internal/slow_queries.py`.
+
+Metrics are kept in memory by each worker process, like the caches, so each worker is scraped on its own. Recording
+a request costs a few microseconds, see `ServiceMetrics.observe_request`.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from typing import ClassVar, Final, NamedTuple, TypeAlias
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROMETHEUS_MEDIA_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+# route label of statements executed outside requests, and of requests not matching any route
+NO_ROUTE: Final[str] = "<none>"
+UNMATCHED_ROUTE: Final[str] = "<unmatched>"
+
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STATEMENT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+# 256 B to 256 MiB, by powers of 4
+SIZE_BUCKETS: Final[tuple[float, ...]] = tuple(float(4**i) for i in range(4, 15))
+STATEMENTS_PER_REQUEST_BUCKETS: Final[tuple[float, ...]] = (
+    0,
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1_000,
+)
+
+LabelValues: TypeAlias = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base of the metric types, a family of series identified by the values of its labels."""
+
+    type_name: ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # observations come from the event loop and from the threads running sync endpoints
+        self._lock = threading.Lock()
+
+    def render(self) -> Iterator[str]:
+        """Lines of the family in the text exposition format."""
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._render_samples()
+
+    def _render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, buckets: int):
+        # observations per bucket, not cumulative, the last bucket being +Inf
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        # buckets are upper bounds, inclusive
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+
+    def get_count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series.counts) if series is not None else 0
+
+    def get_sum(self, labels: LabelValues = ()) -> float:
+        series = self._series.get(labels)
+        return series.sum if series is not None else 0.0
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = [
+                (labels, list(series.counts), series.sum)
+                for labels, series in self._series.items()
+            ]
+        bucket_labelnames = (*self.labelnames, "le")
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for upper_bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    bucket_labelnames, (*labels, _format_value(upper_bound))
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            series_labels = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{series_labels} {_format_value(total)}"
+            yield f"{self.name}_count{series_labels} {cumulative}"
+
+
+def route_label(scope: Scope) -> str:
+    """Route template of a request, set in the scope once routed, `UNMATCHED_ROUTE` if no route matched."""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class RequestMetrics:
+    """What is measured of the request being handled, shared with the database events through a context variable."""
+
+    __slots__ = ("scope", "status", "response_size", "statements")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        # a request failing before a response is started is answered with 500 by the server
+        self.status = 500
+        self.response_size = 0
+        self.statements = 0
+
+
+# request of the current context, copied to the threads running sync endpoints and iterating streaming responses
+_current_request: contextvars.ContextVar[RequestMetrics | None] = (
+    contextvars.ContextVar("current_request_metrics", default=None)
+)
+
+
+class TrackedStatement(NamedTuple):
+    """A statement executed by an instrumented engine."""
+
+    statement: str
+    route: str
+    # seconds spent executing the statement: the aiosqlite driver fetches the rows of queries on execution, while
+    # the sqlite3 driver only steps queries to their first row, the rest being read as the result is consumed
+    duration: float
+    # rows affected as reported by the driver on execution, 0 for queries, as SQLite does not count their rows
+    # until they are fetched
+    rows: int
+    returns_rows: bool
+
+
+class ServiceMetrics:
+    """The metrics of the service, see the module docstring."""
+
+    def __init__(self):
+        self.requests_in_flight = Gauge(
+            "http_requests_in_flight", "Requests being handled."
+        )
+        self.requests = Counter(
+            "http_requests_total",
+            "Requests handled, by route and status code.",
+            ("method", "route", "status"),
+        )
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Time from receiving a request to the end of its response, by route.",
+            ("method", "route"),
+            buckets=LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes",
+            "Size of response bodies, by route.",
+            ("method", "route"),
+            buckets=SIZE_BUCKETS,
+        )
+        self.statements_per_request = Histogram(
+            "db_statements_per_request",
+            "Database statements executed by a request, by route.",
+            ("method", "route"),
+            buckets=STATEMENTS_PER_REQUEST_BUCKETS,
+        )
+        self.statement_duration = Histogram(
+            "db_statement_duration_seconds",
+            "Time spent executing database statements, by route of the request executing them.",
+            ("route",),
+            buckets=STATEMENT_LATENCY_BUCKETS,
+        )
+        self.rows_affected = Counter(
+            "db_rows_affected_total",
+            "Rows written by database statements, as reported by the driver, by route of the request executing them.",
+            ("route",),
+        )
+
+        self._statement_observers: list[Callable[[TrackedStatement], None]] = []
+
+    @property
+    def metrics(self) -> tuple[Metric, ...]:
+        return (
+            self.requests_in_flight,
+            self.requests,
+            self.request_duration,
+            self.response_size,
+            self.statements_per_request,
+            self.statement_duration,
+            self.rows_affected,
+        )
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, served with `PROMETHEUS_MEDIA_TYPE`.
+        """
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def observe_request(self, request: RequestMetrics, duration: float) -> None:
+        """
+        Record a handled request.
+
+        Args:
+            request (RequestMetrics): What was measured of the request.
+            duration (float): Seconds from receiving the request to the end of its response.
+        """
+        method = request.scope["method"]
+        route = route_label(request.scope)
+        self.requests.inc((method, route, str(request.status)))
+        self.request_duration.observe(duration, (method, route))
+        self.response_size.observe(request.response_size, (method, route))
+        self.statements_per_request.observe(request.statements, (method, route))
+
+    def observe_statement(self, statement: TrackedStatement) -> None:
+        """
+        Record a statement executed by an instrumented engine, and pass it on to the statement observers.
+
+        Args:
+            statement (TrackedStatement): The statement, once executed.
+        """
+        labels = (statement.route,)
+        self.statement_duration.observe(statement.duration, labels)
+        if statement.rows:
+            self.rows_affected.inc(labels, statement.rows)
+
+        for observer in self._statement_observers:
+            observer(statement)
+
+    def add_statement_observer(
+        self, observer: Callable[[TrackedStatement], None]
+    ) -> None:
+        """
+        Pass each statement executed by the instrumented engines to an observer, e.g. the slow query log.
+
+        Observers are called from the thread executing the statement, and should be cheap.
+
+        Args:
+            observer (Callable[[TrackedStatement], None]): Called with each statement, once executed.
+        """
+        self._statement_observers.append(observer)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """
+        Record the statements executed by an engine. For async engines, pass `async_engine.sync_engine`.
+
+        Args:
+            engine (Engine): The engine to instrument.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def uninstrument_engine(self, engine: Engine) -> None:
+        """Stop recording the statements of an engine instrumented by `instrument_engine`."""
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault("metrics_started_at", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        duration = time.perf_counter() - conn.info["metrics_started_at"].pop()
+
+        request = _current_request.get()
+        if request is not None:
+            request.statements += 1
+            route = route_label(request.scope)
+        else:
+            route = NO_ROUTE
+
+        # the result is not looked at, so reading it costs nothing more, and the rows of queries are not counted
+        self.observe_statement(
+            TrackedStatement(
+                statement=statement,
+                route=route,
+                duration=duration,
+                rows=max(context.rowcount, 0),
+                returns_rows=cursor.description is not None,
+            )
+        )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the metrics of each HTTP request.
+
+    A plain ASGI middleware rather than a `BaseHTTPMiddleware`, so streaming responses are not buffered, and their
+    duration and size are recorded once fully sent.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: ServiceMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(scope)
+
+        async def send_measured(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                request.status = message["status"]
+            elif message["type"] == "http.response.body":
+                request.response_size += len(message.get("body", b""))
+            await send(message)
+
+        token = _current_request.set(request)
+        self.metrics.requests_in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            duration = time.perf_counter() - started_at
+            self.metrics.requests_in_flight.dec()
+            _current_request.reset(token)
+            self.metrics.observe_request(request, duration)
@@ -0,0 +1,71 @@
+import base64
+import datetime
+from typing import Any, Final
+
+from fastapi import HTTPException
+from pydantic import NaiveDatetime, TypeAdapter, ValidationError
+from starlette.status import HTTP_400_BAD_REQUEST
+
+DEFAULT_PAGE_SIZE: Final[int] = 1_000
+MAX_PAGE_SIZE: Final[int] = 10_000
+
+# response header carrying the cursor of the next page, absent on the last page
+NEXT_CURSOR_HEADER: Final[str] = "X-Next-Cursor"
+
+SymbolsCursor = TypeAdapter(tuple[str, str, NaiveDatetime])
+"""Position in symbols listing: (ref_data_uuid, symbology, start_time) of the last row returned."""
+
+CorpActionsCursor = TypeAdapter(tuple[str, NaiveDatetime])
+"""Position in corporate actions listing: (ref_data_uuid, effective_time) of the last row returned."""
+
+
+def encode_cursor(cursor_type: TypeAdapter, key: tuple[Any, ...]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        cursor_type (TypeAdapter): The cursor type, e.g. `SymbolsCursor`.
+        key (tuple[Any, ...]): The sort key of the last row returned.
+
+    Returns:
+        str: URL-safe cursor to pass back to get the next page.
+    """
+    return base64.urlsafe_b64encode(cursor_type.dump_json(key)).decode("ascii")
+
+
+def decode_cursor(cursor_type: TypeAdapter, cursor: str) -> tuple[Any, ...]:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Args:
+        cursor_type (TypeAdapter): The cursor type, e.g. `SymbolsCursor`.
+        cursor (str): The cursor provided by the client.
+
+    Returns:
+        tuple[Any, ...]: The sort key of the last row of the previous page.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or of another type.
+    """
+    try:
+        return cursor_type.validate_json(base64.urlsafe_b64decode(cursor))
+    except (ValueError, ValidationError):
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor."
+        )
+
+
+def check_time_window(
+    start: datetime.datetime | None, end: datetime.datetime | None
+) -> None:
+    """
+    Validate a time window filter provided as query parameters.
+
+    Raises:
+        HTTPException: 400 if the window ends before it starts.
+    """
+    if start is not None and end is not None and start > end:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail="Time window should not end before it starts.",
+        )
@@ -0,0 +1,266 @@
+"""
+Requests profiled on demand: a request carrying the profiling token, in the `X-Profile` header or the `profile` query
+parameter, is run under cProfile, and its profile written to the profile directory, where `GET /admin/profiles` lists
+it. The id of the profile is returned in the `X-Profile-Id` response header, and the profile is downloaded with
+`GET /admin/profiles/{profile_id}`, as a pstats file to open with `python -m pstats` or snakeviz, or as a text report.
+
+Other requests are only looked at for the header and query parameter, and not at all when no token is set.
+
+cProfile profiles the thread it is enabled in, i.e. the event loop: the code of `async def` endpoints and of streaming
+responses is profiled call by call, while sync endpoints, run in the threadpool, show as time spent waiting for their
+thread. Everything else the event loop runs meanwhile, e.g. other requests, is profiled too, so profiles are best
+taken on a quiet worker. One request is profiled at a time per worker, requests asking for a profile while another
+one is being taken are served without one.
+"""
+
+import cProfile
+import datetime
+import hmac
+import io
+import json
+import logging
+import pstats
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Final
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.internal.id_generator import generate_profile_id
+from app.internal.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER: Final[str] = "X-Profile"
+PROFILE_QUERY_PARAMETER: Final[str] = "profile"
+PROFILE_ID_HEADER: Final[str] = "X-Profile-Id"
+
+PROFILE_SUFFIX: Final[str] = ".prof"
+METADATA_SUFFIX: Final[str] = ".json"
+
+# lines of the text report, by cumulative time
+REPORT_LINES: Final[int] = 60
+
+_PROFILE_HEADER_KEY: Final[bytes] = PROFILE_HEADER.lower().encode()
+_PROFILE_QUERY_KEY: Final[bytes] = PROFILE_QUERY_PARAMETER.encode() + b"="
+_PROFILE_ID: Final = re.compile(
+    r"prof-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+
+class ProfileStore:
+    """
+    Profiles written to a directory, each as a pstats file and a JSON file describing the request profiled.
+
+    Profile ids are UUID v7, so they sort by the time profiles were taken. Ids are checked before being turned into
+    paths, as they come from the URL.
+    """
+
+    def __init__(self, directory: Path, *, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def path_of(self, profile_id: str) -> Path | None:
+        """Path of the pstats file of a profile, None if there is no such profile."""
+        if _PROFILE_ID.fullmatch(profile_id) is None:
+            return None
+        path = self.directory / f"{profile_id}{PROFILE_SUFFIX}"
+        return path if path.exists() else None
+
+    def save(
+        self, profile_id: str, profiler: cProfile.Profile, metadata: dict[str, Any]
+    ) -> None:
+        """
+        Write a profile, then delete the oldest profiles beyond `max_profiles`.
+
+        The pstats file is written last, so a profile is only listed once complete.
+
+        Args:
+            profile_id (str): The id of the profile.
+            profiler (cProfile.Profile): The profiler, disabled.
+            metadata (dict[str, Any]): The description of the request profiled, shaped like `ProfileInfo`.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}{METADATA_SUFFIX}").write_text(
+            json.dumps(metadata)
+        )
+        # written next to its final path then renamed, so it is never read partially written
+        temporary_path = self.directory / f"{profile_id}{PROFILE_SUFFIX}.tmp"
+        profiler.dump_stats(temporary_path)
+        temporary_path.replace(self.directory / f"{profile_id}{PROFILE_SUFFIX}")
+
+        paths = self._profile_paths()
+        for path in paths[: max(len(paths) - self.max_profiles, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(METADATA_SUFFIX).unlink(missing_ok=True)
+
+    def list_profiles(self) -> list[dict[str, Any]]:
+        """
+        Profiles of the directory, newest first.
+
+        Returns:
+            list[dict[str, Any]]: One dict per profile, shaped like `ProfileInfo`.
+        """
+        profiles = []
+        for path in reversed(self._profile_paths()):
+            try:
+                metadata = json.loads(path.with_suffix(METADATA_SUFFIX).read_text())
+                size = path.stat().st_size
+            except FileNotFoundError:
+                # deleted by another worker in the meantime
+                continue
+            profiles.append({"profile_id": path.stem, **metadata, "size": size})
+        return profiles
+
+    def report(self, profile_id: str) -> str | None:
+        """
+        Text report of a profile, the functions taking the most time including the functions they call first.
+
+        Args:
+            profile_id (str): The id of the profile.
+
+        Returns:
+            str | None: The report, None if there is no such profile.
+        """
+        path = self.path_of(profile_id)
+        if path is None:
+            return None
+        stream = io.StringIO()
+        stats = pstats.Stats(str(path), stream=stream)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            REPORT_LINES
+        )
+        return stream.getvalue()
+
+    def _profile_paths(self) -> list[Path]:
+        """Paths of the pstats files of the directory, oldest first."""
+        return sorted(self.directory.glob(f"prof-*{PROFILE_SUFFIX}"))
+
+
+class RequestProfiler:
+    """
+    Profiling of the requests carrying `token`, one at a time, their profiles being written to `store`.
+
+    Profiling is disabled when `token` is None, the middleware then passing requests on without looking at them.
+    """
+
+    def __init__(self, *, token: str | None, store: ProfileStore):
+        self.token = token
+        self.store = store
+        self._lock = threading.Lock()
+
+    def is_requested(self, scope: Scope) -> bool:
+        """Whether a request carries the profiling token, in the header or the query parameter."""
+        token = self.token
+        if token is None:
+            return False
+
+        for key, value in scope["headers"]:
+            if key == _PROFILE_HEADER_KEY:
+                return hmac.compare_digest(value, token.encode())
+
+        query_string = scope.get("query_string", b"")
+        if _PROFILE_QUERY_KEY in query_string:
+            for key, value in parse_qsl(query_string.decode("latin-1")):
+                if key == PROFILE_QUERY_PARAMETER:
+                    return hmac.compare_digest(value.encode(), token.encode())
+        return False
+
+    def acquire(self) -> bool:
+        """Reserve the profiler for a request, False if another request is being profiled."""
+        return self._lock.acquire(blocking=False)
+
+    def release(self) -> None:
+        """Make the profiler available to the next request."""
+        self._lock.release()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling the requests carrying the profiling token, from the start of the request to the end of
+    its response, streamed or not.
+
+    Added last, so it wraps the metrics middleware, and the time taken to write a profile is not recorded as part of
+    the request.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self.profiler.token is None
+            or not self.profiler.is_requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.profiler.acquire():
+            logger.info(
+                "Request %s %s not profiled, another request is being profiled",
+                scope["method"],
+                scope["path"],
+            )
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self.profiler.release()
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile_id = generate_profile_id()
+        # a request failing before a response is started is answered with 500 by the server
+        status = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler is active in this thread, e.g. the whole worker is run under a profiler
+            logger.warning("Request %s %s not profiled", scope["method"], scope["path"])
+            await self.app(scope, receive, send)
+            return
+
+        created_at = datetime.datetime.now(datetime.UTC)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            metadata = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_label(scope),
+                "status": status,
+                "duration_seconds": time.perf_counter() - started_at,
+                "created_at": created_at.isoformat(),
+            }
+            try:
+                await run_in_threadpool(
+                    self.profiler.store.save, profile_id, profiler, metadata
+                )
+            except OSError:
+                logger.exception("Profile %s could not be written", profile_id)
+            else:
+                logger.info(
+                    "Profiled request %s %s as %s",
+                    scope["method"],
+                    scope["path"],
+                    profile_id,
+                )
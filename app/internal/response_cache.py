@@ -0,0 +1,174 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import NamedTuple, TypeAlias
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.internal.change_log import build_changed_ref_data_uuids_statement
+from app.schemas.changes import ChangeEntity
+
+SymbolResponseKey: TypeAlias = tuple[str, str | None]
+"""(ref_data_uuid, symbology) of a `GET /symbols/{ref_data_uuid}` request, symbology None for all symbologies."""
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    expires_at: float
+
+
+class SymbolResponseCache:
+    """
+    Bounded cache of serialized `GET /symbols/{ref_data_uuid}` responses, evicting the least recently used entry when
+    full, and expiring entries after `ttl_seconds`.
+
+    Entries of a ref_data_uuid are invalidated when symbols are written for it: right away by `invalidate` for writes
+    of this worker, and by `catch_up` from the change log for writes of other workers or scripts. A response is only
+    stored if it was read at a sequence the cache has caught up to, so a response read before a concurrent write is
+    never stored after that write was invalidated.
+
+    Used from the event loop only, so entries and counters are not locked.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+
+        self._entries: OrderedDict[SymbolResponseKey, CachedResponse] = OrderedDict()
+        # symbologies of the entries of each ref_data_uuid, to invalidate all of them at once
+        self._symbologies: dict[str, set[str | None]] = {}
+        # sequence of the change log up to which the entries are up to date
+        self._last_sequence: int | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the cache, shaped like `CacheStats`."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: SymbolResponseKey) -> None:
+        del self._entries[key]
+        ref_data_uuid, symbology = key
+        symbologies = self._symbologies[ref_data_uuid]
+        symbologies.discard(symbology)
+        if not symbologies:
+            del self._symbologies[ref_data_uuid]
+
+    def get(self, key: SymbolResponseKey) -> bytes | None:
+        """
+        Serialized response of a request, marked as most recently used.
+
+        Args:
+            key (SymbolResponseKey): The (ref_data_uuid, symbology) of the request.
+
+        Returns:
+            bytes | None: The response content, or None if not cached or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.content
+
+    def put(self, key: SymbolResponseKey, content: bytes, *, sequence: int) -> None:
+        """
+        Store the serialized response of a request, evicting the least recently used entries if full.
+
+        Args:
+            key (SymbolResponseKey): The (ref_data_uuid, symbology) of the request.
+            content (bytes): The response content.
+            sequence (int): Change sequence read before the symbols of the response were.
+        """
+        if self.max_entries <= 0:
+            return
+        if self._last_sequence is None or sequence < self._last_sequence:
+            # changes after the response was read may have been invalidated already
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CachedResponse(
+            content=content, expires_at=self._clock() + self.ttl_seconds
+        )
+        ref_data_uuid, symbology = key
+        self._symbologies.setdefault(ref_data_uuid, set()).add(symbology)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, ref_data_uuids: Iterable[str]) -> None:
+        """
+        Drop the entries of all symbologies of the given reference data UUIDs.
+
+        Args:
+            ref_data_uuids (Iterable[str]): The reference data UUIDs symbols were written for.
+        """
+        for ref_data_uuid in set(ref_data_uuids):
+            for symbology in list(self._symbologies.get(ref_data_uuid, ())):
+                self._remove((ref_data_uuid, symbology))
+                self.invalidations += 1
+
+    async def catch_up(self, session: AsyncSession, sequence: int) -> None:
+        """
+        Invalidate the entries of symbols changed since the last catch up, by any worker.
+
+        Nothing is read when the change log did not grow, so this only costs a query after writes.
+
+        Args:
+            session (AsyncSession): The async database session.
+            sequence (int): The current change sequence, i.e. of the last change of the change log, as read for the
+                entity tag of the request.
+        """
+        if self._last_sequence is None or not self._entries:
+            # nothing cached, responses read from now on are up to date
+            self._last_sequence = max(self._last_sequence or 0, sequence)
+            return
+        if sequence <= self._last_sequence:
+            return
+
+        # concurrent catch ups may read the same changes, invalidating twice is harmless
+        changes = (
+            await session.exec(
+                build_changed_ref_data_uuids_statement(
+                    entity=ChangeEntity.SYMBOL, since=self._last_sequence
+                )
+            )
+        ).all()
+
+        self.invalidate(ref_data_uuid for _, ref_data_uuid in changes)
+        self._last_sequence = max(
+            self._last_sequence,
+            sequence,
+            *(change_sequence for change_sequence, _ in changes),
+        )
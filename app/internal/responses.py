@@ -0,0 +1,42 @@
+from typing import Any, Final
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+# numpy arrays and scalars are serialized natively, e.g. adjusted prices
+JSON_OPTIONS: Final[int] = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _encode_fallback(obj: Any) -> Any:
+    """Encode objects orjson does not serialize natively (e.g. exceptions in validation errors) as FastAPI does."""
+    return jsonable_encoder(obj)
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize content to JSON with orjson, the same way as responses of the application.
+
+    Naive datetimes are written in ISO 8601 without offset, as by `datetime.isoformat` and pydantic, and other
+    objects orjson does not know of fall back to `jsonable_encoder`, so the output matches the default FastAPI
+    encoding.
+
+    Args:
+        content (Any): The content to serialize.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return orjson.dumps(content, default=_encode_fallback, option=JSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson rather than the standard library `json` module, the default response class
+    of the application, see `scripts/benchmark_json_responses.py`.
+
+    Non-finite floats are written as `null` instead of failing the request.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,206 @@
+"""
+Slow query log: statements of the instrumented engines are fingerprinted, i.e. their parameters and literals
+stripped, so executions of the same statement with different parameters are counted together, then:
+
+- statements slower than the threshold are logged, with their fingerprint, duration, row count and route;
+- the statements most expensive in total are kept in a table served by `GET /admin/slowQueries`, which shows
+  statements executed in a loop (e.g. once per symbol of a request) even when each execution is fast.
+
+Unlike `database_echo`, which logs every statement with its parameters, this is cheap enough to leave on in
+production: fingerprints are cached by statement text, as SQLAlchemy executes the same few statements over and over.
+"""
+
+import datetime
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Final, NamedTuple
+
+from app.internal.metrics import TrackedStatement
+
+logger = logging.getLogger(__name__)
+
+# distinct fingerprints kept in the table, the cheapest in total being dropped to make room for new ones
+MAX_FINGERPRINTS: Final[int] = 1_000
+
+_STRING_LITERAL: Final = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL: Final = re.compile(r"\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+# bound parameters of the other parameter styles, e.g. :name, %(name)s, %s or $1
+_PLACEHOLDER: Final = re.compile(r"(?<![:\w]):\w+|%\(\w+\)s|%s|\$\d+")
+# lists of parameters, e.g. expanded IN clauses, whose length depends on the parameters
+_PLACEHOLDER_LIST: Final = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+# repeated lists, e.g. multi-row VALUES or tuple IN clauses
+_REPEATED_LISTS: Final = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE: Final = re.compile(r"\s+")
+
+
+class Fingerprint(NamedTuple):
+    id: str
+    statement: str
+
+
+@lru_cache(maxsize=4_096)
+def fingerprint_statement(statement: str) -> Fingerprint:
+    """
+    Fingerprint of a statement, the same for all executions of a statement whatever its parameters.
+
+    Literals and bound parameters are replaced with `?`, lists of parameters of any length, and repeated lists of
+    them (e.g. multi-row VALUES), with `(...)`, and whitespace is collapsed.
+
+    Args:
+        statement (str): The SQL statement, as sent to the database.
+
+    Returns:
+        Fingerprint: The normalized statement, and a short hash of it to refer to it.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    normalized = _REPEATED_LISTS.sub("(...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    digest = hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+    return Fingerprint(id=digest, statement=normalized)
+
+
+class _FingerprintStats:
+    __slots__ = (
+        "statement",
+        "calls",
+        "slow_calls",
+        "total_seconds",
+        "max_seconds",
+        "rows",
+        "routes",
+        "last_seen",
+    )
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.slow_calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.routes: dict[str, int] = {}
+        self.last_seen = 0.0
+
+
+class SlowQueryLog:
+    """
+    Log of the statements slower than `threshold_seconds`, and table of the statements most expensive in total, by
+    fingerprint, since the log was created or last reset.
+
+    Statements are observed from the event loop and from the threads running sync endpoints, so the table is locked.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_seconds: float,
+        max_fingerprints: int = MAX_FINGERPRINTS,
+        # seconds since the epoch
+        clock: Callable[[], float] = time.time,
+    ):
+        self.threshold_seconds = threshold_seconds
+        self.max_fingerprints = max_fingerprints
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: dict[str, _FingerprintStats] = {}
+        self._since = clock()
+
+    def observe(self, statement: TrackedStatement) -> None:
+        """
+        Account a statement executed by an instrumented engine, and log it if slower than the threshold.
+
+        Args:
+            statement (TrackedStatement): The statement, once executed.
+        """
+        fingerprint = fingerprint_statement(statement.statement)
+        slow = statement.duration >= self.threshold_seconds
+
+        with self._lock:
+            stats = self._stats.get(fingerprint.id)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    cheapest = min(
+                        self._stats, key=lambda key: self._stats[key].total_seconds
+                    )
+                    del self._stats[cheapest]
+                stats = self._stats[fingerprint.id] = _FingerprintStats(
+                    fingerprint.statement
+                )
+
+            stats.calls += 1
+            stats.slow_calls += slow
+            stats.total_seconds += statement.duration
+            stats.max_seconds = max(stats.max_seconds, statement.duration)
+            stats.rows += statement.rows
+            stats.routes[statement.route] = stats.routes.get(statement.route, 0) + 1
+            stats.last_seen = self._clock()
+
+        if slow:
+            logger.warning(
+                "Slow query %s: %.1f ms, %d rows, route %s: %s",
+                fingerprint.id,
+                statement.duration * 1_000,
+                statement.rows,
+                statement.route,
+                fingerprint.statement,
+                extra={
+                    "fingerprint": fingerprint.id,
+                    "statement": fingerprint.statement,
+                    "duration_seconds": statement.duration,
+                    "rows": statement.rows,
+                    "route": statement.route,
+                },
+            )
+
+    def top(self, limit: int) -> list[dict[str, Any]]:
+        """
+        Statements most expensive in total, i.e. duration of all their executions.
+
+        Args:
+            limit (int): Maximum number of statements returned.
+
+        Returns:
+            list[dict[str, Any]]: One dict per fingerprint, shaped like `SlowQueryStats`, most expensive first.
+        """
+        with self._lock:
+            ranked = sorted(
+                self._stats.items(),
+                key=lambda item: item[1].total_seconds,
+                reverse=True,
+            )[:limit]
+            return [
+                {
+                    "fingerprint": fingerprint_id,
+                    "statement": stats.statement,
+                    "calls": stats.calls,
+                    "slow_calls": stats.slow_calls,
+                    "total_seconds": stats.total_seconds,
+                    "mean_seconds": stats.total_seconds / stats.calls,
+                    "max_seconds": stats.max_seconds,
+                    "rows": stats.rows,
+                    "routes": dict(stats.routes),
+                    "last_seen": datetime.datetime.fromtimestamp(
+                        stats.last_seen, datetime.UTC
+                    ),
+                }
+                for fingerprint_id, stats in ranked
+            ]
+
+    @property
+    def since(self) -> datetime.datetime:
+        """Time the statements of the table have been accounted since."""
+        return datetime.datetime.fromtimestamp(self._since, datetime.UTC)
+
+    def reset(self) -> None:
+        """Clear the table, to account statements from now on only, e.g. after a deployment."""
+        with self._lock:
+            self._stats.clear()
+            self._since = self._clock()
@@ -0,0 +1,379 @@
+"""
+Point-in-time universe snapshots: all symbols valid at an as-of time, written to a compact columnar file that
+consumers memory-map instead of parsing JSON.
+
+File layout (all integers little-endian, every section starts at a multiple of 8 bytes):
+
+    header          magic b"SYMSNAP\\0", version u32, section count u32, as_of i64, row count u64,
+                    string count u64, change sequence u64, then (offset u64, length u64) of each section, in the
+                    order below
+    ref_data_uuid   u32[row count], index into the string table
+    symbology       u32[row count], index into the string table
+    symbol          u32[row count], index into the string table
+    exchange        u32[row count], index into the string table, or `NULL_STRING_INDEX`
+    start_time      i64[row count], microseconds since 1970-01-01 (naive times, as stored)
+    end_time        i64[row count], microseconds since 1970-01-01 (naive times, as stored)
+    string_offsets  u64[string count + 1], string `i` is string_data[string_offsets[i]:string_offsets[i + 1]]
+    string_data     UTF-8 bytes of all distinct strings, concatenated
+
+Rows are ordered by (ref_data_uuid, symbology, start_time). Each distinct string is stored once, so the columns are
+fixed-width arrays that can be used in place, e.g. `numpy.frombuffer(mapped, dtype="<u4", count=rows, offset=...)`.
+The change sequence is the global change sequence read before the rows, a snapshot is stale once a symbol was changed
+after it.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from sqlmodel import Session
+
+from app.internal.change_log import build_changed_ref_data_uuids_statement
+from app.internal.change_sequence import get_change_sequence
+from app.internal.streaming import EXPORT_BATCH_SIZE
+from app.internal.symbols_helpers import build_symbols_page_statement
+from app.schemas.changes import ChangeEntity
+
+SNAPSHOT_MAGIC: Final[bytes] = b"SYMSNAP\0"
+SNAPSHOT_VERSION: Final[int] = 2
+SNAPSHOT_MEDIA_TYPE: Final[str] = "application/vnd.symbol-meta.snapshot"
+SNAPSHOT_SUFFIX: Final[str] = ".symsnap"
+
+# index of the exchange column standing for a missing exchange
+NULL_STRING_INDEX: Final[int] = 0xFFFFFFFF
+
+SECTIONS: Final[tuple[str, ...]] = (
+    "ref_data_uuid",
+    "symbology",
+    "symbol",
+    "exchange",
+    "start_time",
+    "end_time",
+    "string_offsets",
+    "string_data",
+)
+
+_HEADER: Final[struct.Struct] = struct.Struct("<8sIIqQQQ")
+_SECTION: Final[struct.Struct] = struct.Struct("<QQ")
+_HEADER_SIZE: Final[int] = _HEADER.size + _SECTION.size * len(SECTIONS)
+
+_EPOCH: Final[datetime.datetime] = datetime.datetime(1970, 1, 1)
+_MICROSECOND: Final[datetime.timedelta] = datetime.timedelta(microseconds=1)
+
+
+class SnapshotRow(NamedTuple):
+    """A symbol of a snapshot, with its strings and times decoded."""
+
+    ref_data_uuid: str
+    symbology: str
+    symbol: str
+    exchange: str | None
+    start_time: datetime.datetime
+    end_time: datetime.datetime
+
+
+def datetime_to_epoch_us(value: datetime.datetime) -> int:
+    """Microseconds since 1970-01-01 of a naive datetime."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def epoch_us_to_datetime(value: int) -> datetime.datetime:
+    """Naive datetime of microseconds since 1970-01-01."""
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def snapshot_path(snapshot_dir: Path, as_of: datetime.date) -> Path:
+    """Path of the snapshot file of an as-of date."""
+    return snapshot_dir / f"symbols-{as_of.isoformat()}{SNAPSHOT_SUFFIX}"
+
+
+def list_snapshot_paths(snapshot_dir: Path) -> list[Path]:
+    """Paths of all snapshot files of a directory, sorted by as-of date."""
+    return sorted(snapshot_dir.glob(f"symbols-*{SNAPSHOT_SUFFIX}"))
+
+
+def write_snapshot(
+    path: Path,
+    *,
+    as_of: datetime.datetime,
+    change_sequence: int,
+    rows: Iterable[tuple],
+) -> int:
+    """
+    Write rows to a snapshot file, replacing it atomically, so readers never see a partially written file.
+
+    Strings are interned while rows are read, and columns are accumulated as fixed-width arrays, so memory use is
+    about the size of the file itself.
+
+    Args:
+        path (Path): The snapshot file.
+        as_of (datetime.datetime): Time the rows are valid at.
+        change_sequence (int): The change sequence read before the rows.
+        rows (Iterable[tuple]): (ref_data_uuid, symbology, symbol, exchange, start_time, end_time) rows, in order.
+
+    Returns:
+        int: The number of rows written.
+    """
+    strings: dict[str, int] = {}
+    ref_data_uuids, symbologies, symbols, exchanges = (array("I") for _ in range(4))
+    start_times, end_times = array("q"), array("q")
+
+    for ref_data_uuid, symbology, symbol, exchange, start_time, end_time in rows:
+        ref_data_uuids.append(strings.setdefault(ref_data_uuid, len(strings)))
+        symbologies.append(strings.setdefault(symbology, len(strings)))
+        symbols.append(strings.setdefault(symbol, len(strings)))
+        exchanges.append(
+            NULL_STRING_INDEX
+            if exchange is None
+            else strings.setdefault(exchange, len(strings))
+        )
+        start_times.append(datetime_to_epoch_us(start_time))
+        end_times.append(datetime_to_epoch_us(end_time))
+
+    string_offsets = array("Q", [0])
+    encoded_strings: list[bytes] = []
+    for string in strings:
+        encoded_strings.append(string.encode())
+        string_offsets.append(string_offsets[-1] + len(encoded_strings[-1]))
+
+    sections = [
+        ref_data_uuids,
+        symbologies,
+        symbols,
+        exchanges,
+        start_times,
+        end_times,
+        string_offsets,
+    ]
+    if sys.byteorder != "little":
+        for section in sections:
+            section.byteswap()
+    contents = [section.tobytes() for section in sections]
+    contents.append(b"".join(encoded_strings))
+
+    section_headers: list[bytes] = []
+    offset = _HEADER_SIZE
+    for content in contents:
+        offset += len(_padding(offset))
+        section_headers.append(_SECTION.pack(offset, len(content)))
+        offset += len(content)
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        len(SECTIONS),
+        datetime_to_epoch_us(as_of),
+        len(ref_data_uuids),
+        len(strings),
+        change_sequence,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as f:
+        try:
+            f.write(header)
+            f.write(b"".join(section_headers))
+            for content in contents:
+                f.write(_padding(f.tell()))
+                f.write(content)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+    return len(ref_data_uuids)
+
+
+def generate_snapshot(
+    session: Session, snapshot_dir: Path, as_of: datetime.date, *, max_snapshots: int
+) -> Path:
+    """
+    Write the snapshot of all symbols valid at the start of an as-of date, reading them through a server-side
+    cursor, then delete the least recently written snapshots beyond `max_snapshots`.
+
+    Args:
+        session (Session): The database session.
+        snapshot_dir (Path): Directory of the snapshot files.
+        as_of (datetime.date): The as-of date.
+        max_snapshots (int): Snapshots kept in the directory.
+
+    Returns:
+        Path: The snapshot file.
+    """
+    as_of_time = datetime.datetime.combine(as_of, datetime.time.min)
+    # read before the rows, so a symbol committed in between makes the snapshot stale rather than missed
+    change_sequence = get_change_sequence(session)
+    statement = build_symbols_page_statement(
+        limit=None, valid_from=as_of_time, valid_to=as_of_time
+    )
+    path = snapshot_path(snapshot_dir, as_of)
+    write_snapshot(
+        path,
+        as_of=as_of_time,
+        change_sequence=change_sequence,
+        rows=session.exec(statement.execution_options(yield_per=EXPORT_BATCH_SIZE)),
+    )
+
+    paths = _paths_by_write_time(snapshot_dir)
+    for stale_path in paths[: max(len(paths) - max_snapshots, 0)]:
+        if stale_path != path:
+            stale_path.unlink(missing_ok=True)
+    return path
+
+
+def _paths_by_write_time(snapshot_dir: Path) -> list[Path]:
+    write_times: dict[Path, int] = {}
+    for path in list_snapshot_paths(snapshot_dir):
+        try:
+            write_times[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # deleted by another worker in the meantime
+            continue
+    return sorted(write_times, key=write_times.__getitem__)
+
+
+def is_snapshot_stale(session: Session, path: Path) -> bool:
+    """
+    Whether a symbol was changed after a snapshot was generated, from the change sequence of its header.
+
+    Args:
+        session (Session): The database session.
+        path (Path): The snapshot file.
+
+    Returns:
+        bool: True if the snapshot misses changes of the change log, or has an unsupported version.
+    """
+    try:
+        with SymbolSnapshot(path) as snapshot:
+            change_sequence = snapshot.change_sequence
+    except ValueError:
+        # written by a previous version
+        return True
+    statement = build_changed_ref_data_uuids_statement(
+        entity=ChangeEntity.SYMBOL, since=change_sequence
+    ).limit(1)
+    return session.exec(statement).first() is not None
+
+
+class SymbolSnapshot:
+    """
+    Read-only view of a snapshot file, memory-mapped.
+
+    Columns are exposed as memoryviews over the mapped file, nothing is copied or decoded until rows or strings are
+    accessed. Use as a context manager, or call `close`, to unmap the file; columns must not be used afterwards.
+    """
+
+    def __init__(self, path: Path):
+        if sys.byteorder != "little":
+            raise ValueError(
+                "Snapshots can only be memory-mapped on little-endian hosts."
+            )
+
+        with open(path, "rb") as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (
+                magic,
+                version,
+                section_count,
+                as_of,
+                row_count,
+                string_count,
+                change_sequence,
+            ) = _HEADER.unpack_from(self._mapped)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a symbol snapshot.")
+            if version != SNAPSHOT_VERSION or section_count != len(SECTIONS):
+                raise ValueError(f"Unsupported snapshot version {version} of {path}.")
+        except BaseException:
+            self._mapped.close()
+            raise
+
+        self.as_of: datetime.datetime = epoch_us_to_datetime(as_of)
+        self.row_count: int = row_count
+        self.string_count: int = string_count
+        self.change_sequence: int = change_sequence
+
+        # all views over the mapped file, which cannot be unmapped until they are released
+        self._views: list[memoryview] = [memoryview(self._mapped)]
+        self._sections: dict[str, memoryview] = {}
+        for position, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                self._mapped, _HEADER.size + position * _SECTION.size
+            )
+            self._sections[name] = self._view(self._views[0][offset : offset + length])
+
+        self.ref_data_uuid: memoryview = self._column("ref_data_uuid", "I")
+        self.symbology: memoryview = self._column("symbology", "I")
+        self.symbol: memoryview = self._column("symbol", "I")
+        self.exchange: memoryview = self._column("exchange", "I")
+        self.start_time: memoryview = self._column("start_time", "q")
+        self.end_time: memoryview = self._column("end_time", "q")
+        self._string_offsets: memoryview = self._column("string_offsets", "Q")
+        self._string_data: memoryview = self._sections["string_data"]
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _column(self, name: str, format: str) -> memoryview:
+        return self._view(self._sections[name].cast(format))
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __enter__(self) -> "SymbolSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the views over the file, and unmap it."""
+        for view in reversed(self._views):
+            view.release()
+        self._mapped.close()
+
+    def string(self, index: int) -> str | None:
+        """String of the string table, or None for `NULL_STRING_INDEX`."""
+        if index == NULL_STRING_INDEX:
+            return None
+        return str(
+            self._string_data[
+                self._string_offsets[index] : self._string_offsets[index + 1]
+            ],
+            "utf-8",
+        )
+
+    def rows(self) -> Iterator[SnapshotRow]:
+        """
+        Decode all rows, in file order.
+
+        Yields:
+            SnapshotRow: Each row of the snapshot.
+        """
+        strings = [self.string(index) for index in range(self.string_count)]
+        for position in range(self.row_count):
+            exchange = self.exchange[position]
+            yield SnapshotRow(
+                ref_data_uuid=strings[self.ref_data_uuid[position]],
+                symbology=strings[self.symbology[position]],
+                symbol=strings[self.symbol[position]],
+                exchange=None if exchange == NULL_STRING_INDEX else strings[exchange],
+                start_time=epoch_us_to_datetime(self.start_time[position]),
+                end_time=epoch_us_to_datetime(self.end_time[position]),
+            )
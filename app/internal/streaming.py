@@ -0,0 +1,74 @@
+from collections.abc import Iterable, Iterator
+from typing import Final, TypeVar
+
+from sqlalchemy import Select
+from sqlmodel import Session
+
+T = TypeVar("T")
+
+NDJSON_MEDIA_TYPE: Final[str] = "application/x-ndjson"
+
+# number of rows fetched from the database cursor at once, and of records written per chunk of the response
+EXPORT_BATCH_SIZE: Final[int] = 1_000
+
+
+def iter_db_objects(session: Session, statement: Select) -> Iterator:
+    """
+    Iterate over the results of a statement through a server-side cursor, closing the session when done.
+
+    Rows are fetched `EXPORT_BATCH_SIZE` at a time instead of materializing the whole result, and the session is
+    closed once the iteration completes or is abandoned (e.g. client disconnected), as it outlives the request
+    handler when used by a streaming response.
+
+    Args:
+        session (Session): The database session.
+        statement (Select): The statement to execute.
+
+    Yields:
+        Database objects returned by the statement.
+    """
+    try:
+        yield from session.exec(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+    finally:
+        session.close()
+
+
+def iter_record_batches(records: Iterable[T]) -> Iterator[list[T]]:
+    """
+    Group records in batches of `EXPORT_BATCH_SIZE`, each written as one chunk of a streaming response.
+
+    The first record is a batch on its own, so the first byte goes out as soon as it is produced.
+
+    Args:
+        records (Iterable[T]): The records.
+
+    Yields:
+        list[T]: Batches of consecutive records.
+    """
+    batch: list[T] = []
+    batch_size = 1
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+            batch_size = EXPORT_BATCH_SIZE
+
+    if batch:
+        yield batch
+
+
+def iter_ndjson(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Join serialized JSON records into newline delimited JSON, in chunks of `EXPORT_BATCH_SIZE` records.
+
+    Args:
+        lines (Iterable[bytes]): The records, each serialized as a single line JSON document.
+
+    Yields:
+        bytes: Chunks of the NDJSON document.
+    """
+    for batch in iter_record_batches(lines):
+        yield b"\n".join(batch) + b"\n"
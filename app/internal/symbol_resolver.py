@@ -0,0 +1,363 @@
+import datetime
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple, TypeAlias
+
+import numpy as np
+from pydantic_core import from_json
+from sqlalchemy import Select
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.internal.change_log import build_last_change_sequence_statement
+from app.internal.snapshots import datetime_to_epoch_us
+from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeLogDb
+
+SymbolKey: TypeAlias = tuple[str, str]
+"""(symbology, symbol) pair, used to find all historical entries of a symbol."""
+
+PointInTimeKey: TypeAlias = tuple[str, str, datetime.datetime]
+"""(symbology, symbol, time) triple, identifying what a symbol referred to at a given time."""
+
+
+class ResolvedSymbol(NamedTuple):
+    """Validity interval of a symbol, exposes the same attributes as `SymbologySymbolDb` used for matching."""
+
+    symbology: str
+    symbol: str
+    start_time: datetime.datetime
+    end_time: datetime.datetime
+    ref_data_uuid: str
+
+    @classmethod
+    def from_db_object(cls, db_object: SymbologySymbolDb) -> "ResolvedSymbol":
+        return cls(
+            symbology=db_object.symbology,
+            symbol=db_object.symbol,
+            start_time=db_object.start_time,
+            end_time=db_object.end_time,
+            ref_data_uuid=db_object.ref_data_uuid,
+        )
+
+    @classmethod
+    def from_change_payload(cls, payload: dict[str, Any]) -> "ResolvedSymbol":
+        """Validity interval of a symbol recorded in the change log, with its times serialized as ISO strings."""
+        return cls(
+            symbology=payload["symbology"],
+            symbol=payload["symbol"],
+            start_time=datetime.datetime.fromisoformat(payload["start_time"]),
+            end_time=datetime.datetime.fromisoformat(payload["end_time"]),
+            ref_data_uuid=payload["ref_data_uuid"],
+        )
+
+
+class _IntervalIndexArrays(NamedTuple):
+    """Columns of an interval index as NumPy arrays, in microseconds since 1970-01-01, for vectorized lookups."""
+
+    start_times: np.ndarray
+    end_times: np.ndarray
+    max_end_times: np.ndarray
+
+
+class _IntervalIndex:
+    """
+    Immutable index over the validity intervals of a single (symbology, symbol) pair.
+
+    Intervals are sorted by start time, together with the running maximum of their end times. A point-in-time
+    lookup bisects the start times, then walks back only as long as an earlier interval can still cover the point,
+    so non-overlapping histories are answered in O(log n).
+    """
+
+    __slots__ = ("intervals", "start_times", "max_end_times", "_arrays")
+
+    def __init__(self, intervals: Iterable[ResolvedSymbol]):
+        self.intervals: tuple[ResolvedSymbol, ...] = tuple(
+            sorted(set(intervals), key=lambda interval: interval.start_time)
+        )
+        self.start_times: tuple[datetime.datetime, ...] = tuple(
+            interval.start_time for interval in self.intervals
+        )
+
+        max_end_times: list[datetime.datetime] = []
+        for interval in self.intervals:
+            max_end_times.append(
+                max(max_end_times[-1], interval.end_time)
+                if max_end_times
+                else interval.end_time
+            )
+        self.max_end_times: tuple[datetime.datetime, ...] = tuple(max_end_times)
+        self._arrays: _IntervalIndexArrays | None = None
+
+    @property
+    def arrays(self) -> _IntervalIndexArrays:
+        """The index as NumPy arrays, built on first use."""
+        if self._arrays is None:
+            self._arrays = _IntervalIndexArrays(
+                *(
+                    np.array(
+                        [datetime_to_epoch_us(time) for time in times], dtype=np.int64
+                    )
+                    for times in (
+                        self.start_times,
+                        (interval.end_time for interval in self.intervals),
+                        self.max_end_times,
+                    )
+                )
+            )
+        return self._arrays
+
+    def valid_at(self, time: datetime.datetime) -> list[ResolvedSymbol]:
+        """Intervals covering `time`, bounds included."""
+        found: list[ResolvedSymbol] = []
+        position = bisect_right(self.start_times, time) - 1
+        while position >= 0 and self.max_end_times[position] >= time:
+            if self.intervals[position].end_time >= time:
+                found.append(self.intervals[position])
+            position -= 1
+        return found
+
+    def valid_at_many(
+        self, times: Sequence[datetime.datetime]
+    ) -> list[list[ResolvedSymbol]]:
+        """
+        Intervals covering each of `times`, in any order.
+
+        The last interval started at or before each time is found with a single `numpy.searchsorted` over all times.
+        It is the only candidate unless an earlier interval still covers the time, which only happens for overlapping
+        intervals, in which case the time is looked up by `valid_at`.
+        """
+        start_times, end_times, max_end_times = self.arrays
+        times_us = np.fromiter(
+            (datetime_to_epoch_us(time) for time in times),
+            dtype=np.int64,
+            count=len(times),
+        )
+        positions = np.searchsorted(start_times, times_us, side="right") - 1
+        is_covered = (positions >= 0) & (
+            end_times[np.maximum(positions, 0)] >= times_us
+        )
+        is_overlapped = (positions >= 1) & (
+            max_end_times[np.maximum(positions - 1, 0)] >= times_us
+        )
+
+        found: list[list[ResolvedSymbol]] = []
+        for time, position, covered, overlapped in zip(
+            times, positions.tolist(), is_covered.tolist(), is_overlapped.tolist()
+        ):
+            if overlapped:
+                found.append(self.valid_at(time))
+            elif covered:
+                found.append([self.intervals[position]])
+            else:
+                found.append([])
+        return found
+
+
+class SymbolResolver:
+    """
+    In-memory resolver of (symbology, symbol, time) to reference data UUIDs.
+
+    The resolver keeps one interval index per (symbology, symbol) pair. It is loaded from the database at startup,
+    and updated by endpoints after they commit new symbols. Symbols committed by other workers or scripts, including
+    new intervals of pairs already known, are added by `catch_up` from the change log, which callers run before
+    resolving, so lookups only read the changes committed since the previous one.
+
+    Indexes are replaced, never mutated, so lookups can run concurrently with updates without locking. Pairs unknown
+    to a resolver not loaded, or created before the change log, are to be fetched from the database.
+    """
+
+    def __init__(self):
+        self._indexes: dict[SymbolKey, _IntervalIndex] = {}
+        self._write_lock = threading.Lock()
+        self.is_loaded: bool = False
+        # sequence of the last change of the log applied, None until loaded or first caught up
+        self._last_sequence: int | None = None
+
+    def __len__(self) -> int:
+        return sum(len(index.intervals) for index in self._indexes.values())
+
+    def load(self, session: Session) -> None:
+        """
+        (Re)build all interval indexes from the database.
+
+        Args:
+            session (Session): The database session.
+        """
+        statement = select(
+            SymbologySymbolDb.symbology,
+            SymbologySymbolDb.symbol,
+            SymbologySymbolDb.start_time,
+            SymbologySymbolDb.end_time,
+            SymbologySymbolDb.ref_data_uuid,
+        )
+
+        # read in the same transaction as the symbols, changes committed since then are applied by `catch_up`
+        last_sequence = session.exec(build_last_change_sequence_statement()).one() or 0
+        intervals_per_key: dict[SymbolKey, list[ResolvedSymbol]] = defaultdict(list)
+        for row in session.exec(statement):
+            interval = ResolvedSymbol(*row)
+            intervals_per_key[(interval.symbology, interval.symbol)].append(interval)
+
+        with self._write_lock:
+            self._indexes = {
+                key: _IntervalIndex(intervals)
+                for key, intervals in intervals_per_key.items()
+            }
+            self._last_sequence = last_sequence
+            self.is_loaded = True
+
+    def _build_catch_up_statement(self) -> Select | None:
+        """Statement fetching the symbol changes not applied yet, None if the resolver has not started following."""
+        if self._last_sequence is None:
+            return None
+        return (
+            select(ChangeLogDb.sequence, ChangeLogDb.payload)
+            .where(
+                ChangeLogDb.entity == ChangeEntity.SYMBOL,
+                ChangeLogDb.sequence > self._last_sequence,
+            )
+            .order_by(ChangeLogDb.sequence)
+        )
+
+    def _apply_changes(self, changes: Iterable[tuple[int, str]]) -> None:
+        """Add the symbols of (sequence, payload) changes, and move the last sequence applied forward."""
+        changes = list(changes)
+        if not changes:
+            return
+        self.add(
+            ResolvedSymbol.from_change_payload(from_json(payload))
+            for _, payload in changes
+        )
+        with self._write_lock:
+            self._last_sequence = max(self._last_sequence or 0, changes[-1][0])
+
+    def catch_up(self, session: Session) -> None:
+        """
+        Add the symbols committed since the resolver was loaded or last caught up, by any worker or script.
+
+        A resolver neither loaded nor caught up yet starts following the change log from its current end, pairs it
+        does not know being fetched from the database by callers.
+
+        Args:
+            session (Session): The database session.
+        """
+        statement = self._build_catch_up_statement()
+        if statement is None:
+            last_sequence = session.exec(build_last_change_sequence_statement()).one()
+            with self._write_lock:
+                if self._last_sequence is None:
+                    self._last_sequence = last_sequence or 0
+            return
+        self._apply_changes(session.exec(statement))
+
+    async def catch_up_async(self, session: AsyncSession) -> None:
+        """
+        Async version of `catch_up`, for async sessions.
+
+        Args:
+            session (AsyncSession): The async database session.
+        """
+        statement = self._build_catch_up_statement()
+        if statement is None:
+            last_sequence = (
+                await session.exec(build_last_change_sequence_statement())
+            ).one()
+            with self._write_lock:
+                if self._last_sequence is None:
+                    self._last_sequence = last_sequence or 0
+            return
+        self._apply_changes(await session.exec(statement))
+
+    def add(self, symbols: Iterable[ResolvedSymbol | SymbologySymbolDb]) -> None:
+        """
+        Add committed symbols to the indexes. Adding a symbol already known is a no-op.
+
+        Args:
+            symbols (Iterable[ResolvedSymbol | SymbologySymbolDb]): The symbols to add.
+        """
+        new_intervals_per_key: dict[SymbolKey, list[ResolvedSymbol]] = defaultdict(list)
+        for symbol in symbols:
+            interval = (
+                symbol
+                if isinstance(symbol, ResolvedSymbol)
+                else ResolvedSymbol.from_db_object(symbol)
+            )
+            new_intervals_per_key[(interval.symbology, interval.symbol)].append(
+                interval
+            )
+
+        with self._write_lock:
+            for key, new_intervals in new_intervals_per_key.items():
+                current = self._indexes.get(key)
+                self._indexes[key] = _IntervalIndex(
+                    (*current.intervals, *new_intervals) if current else new_intervals
+                )
+
+    def resolve(
+        self, *, symbology: str, symbol: str, time: datetime.datetime
+    ) -> set[str]:
+        """
+        Find reference data UUIDs a (symbology, symbol) pair referred to at a given time.
+
+        Args:
+            symbology (str): The symbology of the symbol.
+            symbol (str): The symbol.
+            time (datetime.datetime): The point in time, bounds of validity intervals are included.
+
+        Returns:
+            set[str]: Reference data UUIDs found, empty if the symbol is unknown at this time.
+        """
+        index = self._indexes.get((symbology, symbol))
+        if index is None:
+            return set()
+        return {interval.ref_data_uuid for interval in index.valid_at(time)}
+
+    def resolve_many(self, keys: Sequence[PointInTimeKey]) -> list[tuple[str, ...]]:
+        """
+        Find reference data UUIDs for many (symbology, symbol, time) triples at once.
+
+        Keys are grouped by (symbology, symbol), then the times of each group are bisected into its intervals at once,
+        see `_IntervalIndex.valid_at_many`.
+
+        Args:
+            keys (Sequence[PointInTimeKey]): The triples to resolve.
+
+        Returns:
+            list[tuple[str, ...]]: For each key (in input order), the sorted reference data UUIDs found, empty if the
+                symbol is unknown at this time.
+        """
+        results: list[tuple[str, ...]] = [()] * len(keys)
+
+        positions_per_key: dict[SymbolKey, list[int]] = defaultdict(list)
+        for position, (symbology, symbol, _) in enumerate(keys):
+            positions_per_key[(symbology, symbol)].append(position)
+
+        for key, positions in positions_per_key.items():
+            index = self._indexes.get(key)
+            if index is None:
+                continue
+
+            matches = index.valid_at_many([keys[position][2] for position in positions])
+            for position, intervals in zip(positions, matches):
+                if intervals:
+                    results[position] = tuple(
+                        sorted({interval.ref_data_uuid for interval in intervals})
+                    )
+
+        return results
+
+    def get_intervals(self, key: SymbolKey) -> tuple[ResolvedSymbol, ...] | None:
+        """
+        All known validity intervals of a (symbology, symbol) pair, sorted by start time.
+
+        Args:
+            key (SymbolKey): The (symbology, symbol) pair.
+
+        Returns:
+            tuple[ResolvedSymbol, ...] | None: The intervals, or None if the pair is unknown to the resolver.
+        """
+        index = self._indexes.get(key)
+        return index.intervals if index else None
@@ -1,5 +1,11 @@
+import datetime
 from _operator import attrgetter
+from collections.abc import Iterable, Iterator
 from itertools import groupby
+from typing import Any, Final
+
+from sqlalchemy import Select, tuple_
+from sqlmodel import select
 
 from app.schemas import (
     SymbologySymbolDb,
@@ -9,27 +15,44 @@ from app.schemas import (
     SymbolsToQuery,
 )
 
+# columns fetched to build public objects, selecting them instead of the ORM entity skips identity map bookkeeping
+SYMBOL_ROW_COLUMNS: Final = (
+    SymbologySymbolDb.ref_data_uuid,
+    SymbologySymbolDb.symbology,
+    SymbologySymbolDb.symbol,
+    SymbologySymbolDb.exchange,
+    SymbologySymbolDb.start_time,
+    SymbologySymbolDb.end_time,
+)
 
-def convert_list_of_db_objects_to_public_objects(
-    db_objects: list[SymbologySymbolDb],
-) -> list[SymbologySymbolPublic]:
-    """
-    Convert a list of symbols database objects to public objects.
+# order in which rows should be fetched, so they can be grouped into public objects
+SYMBOLS_SORT_KEY: Final = (
+    SymbologySymbolDb.ref_data_uuid,
+    SymbologySymbolDb.symbology,
+    SymbologySymbolDb.start_time,
+)
 
-    Args:
-        db_objects (list[SymbologySymbolDb]): The list of database objects to convert.
 
-    Returns:
-        list[SymbologySymbolPublic]: The list of converted public objects.
+def iter_db_objects_as_public_objects(
+    db_objects: Iterable[SymbologySymbolDb],
+) -> Iterator[SymbologySymbolPublic]:
     """
-    # we need to group-by ref_data_uuid
+    Convert symbols database objects to public objects, one ref_data_uuid at a time.
 
-    # we need to group-by ref_data_uuid
-    grouped_by_uuid: list[SymbologySymbolPublic] = []
+    Database objects are consumed lazily, so an ordered database cursor can be converted without loading it whole.
+    Objects should be ordered by ref_data_uuid and symbology, otherwise a ref_data_uuid may be split into several
+    public objects.
+
+    Args:
+        db_objects (Iterable[SymbologySymbolDb]): The database objects to convert.
 
+    Yields:
+        SymbologySymbolPublic: One public object per consecutive group of objects with the same ref_data_uuid.
+    """
     # TODO <MFido> [27/03/2025] find a way how can i get away from using hard-coded strings here and instead
     #  rely on schema names
 
+    # we need to group-by ref_data_uuid
     for ref_data_uuid, group in groupby(db_objects, key=attrgetter("ref_data_uuid")):
         temp_group = {
             "ref_data_uuid": ref_data_uuid,
@@ -43,9 +66,70 @@ def convert_list_of_db_objects_to_public_objects(
                 for s in symbology_group
             )
 
-        grouped_by_uuid.append(SymbologySymbolPublic(**temp_group))
+        yield SymbologySymbolPublic(**temp_group)
+
+
+def convert_list_of_db_objects_to_public_objects(
+    db_objects: list[SymbologySymbolDb],
+) -> list[SymbologySymbolPublic]:
+    """
+    Convert a list of symbols database objects to public objects.
+
+    Args:
+        db_objects (list[SymbologySymbolDb]): The list of database objects to convert.
 
-    return grouped_by_uuid
+    Returns:
+        list[SymbologySymbolPublic]: The list of converted public objects.
+    """
+    return list(iter_db_objects_as_public_objects(db_objects))
+
+
+def iter_symbol_rows_as_public_dicts(
+    rows: Iterable[tuple],
+) -> Iterator[dict[str, Any]]:
+    """
+    Convert symbol rows fetched from the database straight to JSON-ready dicts shaped like `SymbologySymbolPublic`.
+
+    Unlike `iter_db_objects_as_public_objects`, rows are not validated again: they come from our own database, so
+    they already passed validation when they were created. Datetimes are formatted the same way pydantic does.
+
+    Args:
+        rows (Iterable[tuple]): Rows of `SYMBOL_ROW_COLUMNS`, ordered by `SYMBOLS_SORT_KEY`.
+
+    Yields:
+        dict[str, Any]: One dict per consecutive group of rows with the same ref_data_uuid.
+    """
+    public_dict: dict[str, Any] | None = None
+    symbology_map: dict[str, list[dict[str, Any]]] = {}
+    for ref_data_uuid, symbology, symbol, exchange, start_time, end_time in rows:
+        if public_dict is None or ref_data_uuid != public_dict["ref_data_uuid"]:
+            if public_dict is not None:
+                yield public_dict
+
+            # keys in the same order as SymbologySymbolPublic fields
+            symbology_map = {}
+            public_dict = {
+                "symbology_map": symbology_map,
+                "force_duplicates": False,
+                "ref_data_uuid": ref_data_uuid,
+                "message": None,
+                "error": None,
+            }
+
+        symbol_specs = symbology_map.get(symbology)
+        if symbol_specs is None:
+            symbol_specs = symbology_map[symbology] = []
+        symbol_specs.append(
+            {
+                "symbol": symbol,
+                "exchange": exchange,
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+            }
+        )
+
+    if public_dict is not None:
+        yield public_dict
 
 
 def convert_symbology_maps_to_symbology_symbol_date_tuples(
@@ -72,3 +156,69 @@ def convert_symbology_maps_to_symbology_symbol_date_tuples(
                 )
             )
     return symbols_to_query
+
+
+def build_symbols_by_ref_data_uuid_statement(
+    *, ref_data_uuid: str, symbology: str | None = None
+) -> Select:
+    """
+    Build the statement fetching all symbols of a reference data UUID, as `SYMBOL_ROW_COLUMNS` rows ordered by
+    (symbology, start_time).
+
+    Args:
+        ref_data_uuid (str): The reference data UUID of the symbols.
+        symbology (str | None): Only fetch symbols of this symbology, if provided. Defaults to None.
+
+    Returns:
+        Select: The statement selecting matching symbols.
+    """
+    statement = (
+        select(*SYMBOL_ROW_COLUMNS)
+        .where(SymbologySymbolDb.ref_data_uuid == ref_data_uuid)
+        .order_by(*SYMBOLS_SORT_KEY)
+    )
+
+    if symbology:
+        # filter by symbology if provided
+        statement = statement.where(SymbologySymbolDb.symbology == symbology)
+
+    return statement
+
+
+def build_symbols_page_statement(
+    *,
+    limit: int | None,
+    after: tuple[str, str, datetime.datetime] | None = None,
+    symbology: str | None = None,
+    valid_from: datetime.datetime | None = None,
+    valid_to: datetime.datetime | None = None,
+) -> Select:
+    """
+    Build the statement fetching one page of symbols, as `SYMBOL_ROW_COLUMNS` rows ordered by
+    (ref_data_uuid, symbology, start_time).
+
+    The order matches the `ix_symbologysymboldb_ref_data_uuid` index, so pages are read from the index in order
+    instead of sorting the whole table, and rows of a ref_data_uuid are consecutive, as required to group them.
+
+    Args:
+        limit (int | None): Maximum number of rows to fetch, or None to fetch all remaining rows.
+        after (tuple[str, str, datetime.datetime] | None): Sort key of the last row of the previous page.
+        symbology (str | None): Only fetch symbols of this symbology, if provided.
+        valid_from (datetime.datetime | None): Only fetch symbols still valid at this time, if provided.
+        valid_to (datetime.datetime | None): Only fetch symbols already valid at this time, if provided.
+
+    Returns:
+        Select: The statement selecting the page.
+    """
+    statement = select(*SYMBOL_ROW_COLUMNS).order_by(*SYMBOLS_SORT_KEY).limit(limit)
+
+    if after is not None:
+        statement = statement.where(tuple_(*SYMBOLS_SORT_KEY) > after)
+    if symbology:
+        statement = statement.where(SymbologySymbolDb.symbology == symbology)
+    if valid_from is not None:
+        statement = statement.where(SymbologySymbolDb.end_time >= valid_from)
+    if valid_to is not None:
+        statement = statement.where(SymbologySymbolDb.start_time <= valid_to)
+
+    return statement
@@ -0,0 +1,242 @@
+from collections.abc import Iterable, Sequence
+from typing import Any, Final, NamedTuple, TypeAlias
+
+from sqlalchemy import Insert, insert
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.internal.chunking import chunked
+from app.internal.id_generator import generate_ref_data_uuid
+from app.internal.lookup_ref_data_uuid import SymbolCandidates, match_ref_data_uuids
+from app.internal.symbol_resolver import ResolvedSymbol
+from app.internal.symbols_helpers import (
+    convert_symbology_maps_to_symbology_symbol_date_tuples,
+)
+from app.schemas import (
+    SymbologySymbolCreate,
+    SymbologySymbolDb,
+    SymbolsToQuery,
+)
+
+# rows per executemany call, bounds the memory used by parameters and lets other requests run between chunks
+SYMBOLS_INSERT_CHUNK_SIZE: Final[int] = 10_000
+
+SymbolRow: TypeAlias = dict[str, Any]
+"""Column values of a `SymbologySymbolDb` row, as inserted."""
+
+ALL_SYMBOLOGIES_EXIST_ERROR: Final[str] = (
+    "All symbologies provided for this ref_data_uuid are already in the database. This request type can only be "
+    "used to define new symbologies to an existing ref_data_uuid / define new symbol with new ref_data_uuid. Use "
+    "other method to change existing symbologies."
+)
+MULTIPLE_REF_DATA_UUIDS_ERROR: Final[str] = (
+    "Multiple ref_data_uuids have been found for symbols provided, cannot determine which one to use. Please verify "
+    "the request provided."
+)
+NO_SYMBOLS_ERROR: Final[str] = "No symbols have been provided for this item."
+CREATED_MESSAGE: Final[str] = "Symbol created successfully"
+
+
+class SymbolsCreationPlan(NamedTuple):
+    """Outcome of each item of a creation request, and the rows to insert for the successful ones."""
+
+    outputs: list[dict[str, Any]]
+    rows: list[SymbolRow]
+
+    @property
+    def created_symbols(self) -> list[ResolvedSymbol]:
+        """Validity intervals of the rows to insert, to add to the resolver once committed."""
+        return [
+            ResolvedSymbol(
+                symbology=row["symbology"],
+                symbol=row["symbol"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                ref_data_uuid=row["ref_data_uuid"],
+            )
+            for row in self.rows
+        ]
+
+
+def get_symbols_to_query_per_item(
+    symbols: Iterable[SymbologySymbolCreate],
+) -> list[list[SymbolsToQuery]]:
+    """
+    Convert the symbology map of each item of a creation request to symbols to query.
+
+    Args:
+        symbols (Iterable[SymbologySymbolCreate]): The items of the creation request.
+
+    Returns:
+        list[list[SymbolsToQuery]]: Symbols to query of each item, in input order.
+    """
+    return [
+        convert_symbology_maps_to_symbology_symbol_date_tuples(
+            symbology_maps=symbol.symbology_map
+        )
+        for symbol in symbols
+    ]
+
+
+def _item_output(
+    symbol: SymbologySymbolCreate,
+    *,
+    ref_data_uuid: str | None,
+    message: str | None = None,
+    error: str | None = None,
+) -> dict[str, Any]:
+    # items have already been validated as part of the request, a dict shaped like SymbologySymbolPublic avoids
+    # building (or validating) a model per item
+    return {
+        "symbology_map": symbol.symbology_map,
+        "force_duplicates": symbol.force_duplicates,
+        "ref_data_uuid": ref_data_uuid,
+        "message": message,
+        "error": error,
+    }
+
+
+def plan_symbols_creation(
+    *,
+    symbols: Sequence[SymbologySymbolCreate],
+    symbols_to_query_per_item: Sequence[Sequence[SymbolsToQuery]],
+    candidates: SymbolCandidates,
+) -> SymbolsCreationPlan:
+    """
+    Decide, for each item of a creation request, which ref_data_uuid its symbols belong to and which rows to insert.
+
+    An item matching a single existing ref_data_uuid adds its symbologies not defined yet to it, an item matching no
+    ref_data_uuid gets a new one, and an item matching several ref_data_uuids is rejected. Rows planned for an item
+    are added to the candidates, so the following items of the same request see them.
+
+    Args:
+        symbols (Sequence[SymbologySymbolCreate]): The items of the creation request.
+        symbols_to_query_per_item (Sequence[Sequence[SymbolsToQuery]]): Symbols to query of each item, see
+            `get_symbols_to_query_per_item`.
+        candidates (SymbolCandidates): Entries fetched for all symbols of the request, updated in place.
+
+    Returns:
+        SymbolsCreationPlan: The outcome of each item, in input order, as dicts shaped like `SymbologySymbolPublic`,
+            and the rows to insert.
+    """
+    outputs: list[dict[str, Any]] = []
+    rows: list[SymbolRow] = []
+
+    for symbol, symbols_to_query in zip(symbols, symbols_to_query_per_item):
+        symbology_maps = symbol.symbology_map
+
+        ref_data_uuids = match_ref_data_uuids(
+            candidates=candidates, symbols_to_query=symbols_to_query
+        )
+
+        if len(ref_data_uuids) > 1:
+            outputs.append(
+                _item_output(
+                    symbol, ref_data_uuid=None, error=MULTIPLE_REF_DATA_UUIDS_ERROR
+                )
+            )
+            continue
+
+        if ref_data_uuids:
+            # Only one unique ref_data_uuid found, use it
+            ref_data_uuid, symbologies_already_in_database = next(
+                iter(ref_data_uuids.items())
+            )
+            if symbology_maps.keys() <= symbologies_already_in_database:
+                outputs.append(
+                    _item_output(
+                        symbol,
+                        ref_data_uuid=ref_data_uuid,
+                        error=ALL_SYMBOLOGIES_EXIST_ERROR,
+                    )
+                )
+                continue
+
+            # filter out symbologies that are already in the database
+            symbology_maps = {
+                symbology_name: symbology_values
+                for symbology_name, symbology_values in symbology_maps.items()
+                if symbology_name not in symbologies_already_in_database
+            }
+        else:
+            # generate new unique ref_data_uuid to each symbol
+            ref_data_uuid = generate_ref_data_uuid()
+
+        item_rows: list[SymbolRow] = []
+        for symbology_name, symbology_values in symbology_maps.items():
+            # TODO <MFido> [27/03/2025] we should instead iterate over sorted symbology values by start_time
+            for symbol_spec_entry in symbology_values:
+                row = {
+                    "ref_data_uuid": ref_data_uuid,
+                    "symbology": symbology_name,
+                    "symbol": symbol_spec_entry.symbol,
+                    "exchange": symbol_spec_entry.exchange,
+                    "start_time": symbol_spec_entry.start_time,
+                    "end_time": symbol_spec_entry.end_time,
+                }
+                item_rows.append(row)
+
+                # make the new symbol visible to the following items of the same request
+                candidates[(symbology_name, symbol_spec_entry.symbol)].append(
+                    ResolvedSymbol(
+                        symbology=symbology_name,
+                        symbol=symbol_spec_entry.symbol,
+                        start_time=symbol_spec_entry.start_time,
+                        end_time=symbol_spec_entry.end_time,
+                        ref_data_uuid=ref_data_uuid,
+                    )
+                )
+
+        if not item_rows:
+            outputs.append(
+                _item_output(symbol, ref_data_uuid=None, error=NO_SYMBOLS_ERROR)
+            )
+            continue
+
+        rows.extend(item_rows)
+        outputs.append(
+            _item_output(symbol, ref_data_uuid=ref_data_uuid, message=CREATED_MESSAGE)
+        )
+
+    return SymbolsCreationPlan(outputs=outputs, rows=rows)
+
+
+def build_symbols_insert_statement() -> Insert:
+    """
+    Build the Core statement inserting symbol rows, to be executed with a list of `SymbolRow` parameters.
+
+    The statement targets the table rather than the ORM entity, so rows are inserted with a plain `executemany`,
+    without building ORM instances or registering them in the identity map.
+
+    Returns:
+        Insert: The insert statement.
+    """
+    return insert(SymbologySymbolDb.__table__)
+
+
+def insert_symbol_rows(*, session: Session, rows: Sequence[SymbolRow]) -> None:
+    """
+    Insert symbol rows in chunks of `SYMBOLS_INSERT_CHUNK_SIZE`, within the current transaction of the session.
+
+    Args:
+        session (Session): The database session.
+        rows (Sequence[SymbolRow]): The rows to insert.
+    """
+    statement = build_symbols_insert_statement()
+    for chunk in chunked(rows, SYMBOLS_INSERT_CHUNK_SIZE):
+        session.connection().execute(statement, list(chunk))
+
+
+async def insert_symbol_rows_async(
+    *, session: AsyncSession, rows: Sequence[SymbolRow]
+) -> None:
+    """
+    Async version of `insert_symbol_rows`, for async sessions.
+
+    Args:
+        session (AsyncSession): The async database session.
+        rows (Sequence[SymbolRow]): The rows to insert.
+    """
+    statement = build_symbols_insert_statement()
+    for chunk in chunked(rows, SYMBOLS_INSERT_CHUNK_SIZE):
+        await (await session.connection()).execute(statement, list(chunk))
@@ -1,14 +1,18 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
-from .db import create_db_and_tables
-from .routers import symbols, corp_actions
+from sqlmodel import Session
+
+from .db import create_db_and_tables, engine
+from .dependencies import request_profiler, service_metrics, symbol_resolver
+from .internal.metrics import MetricsMiddleware
+from .internal.profiling import ProfilingMiddleware
+from .internal.responses import FastJSONResponse
+from .routers import symbols, corp_actions, snapshots, events, admin, metrics
 
 
 @asynccontextmanager
@@ -17,7 +21,7 @@ async def lifespan(app: FastAPI):
     Async context manager for the FastAPI application lifespan.
 
     This function is used to manage the lifespan of the FastAPI application.
-    It creates the database and tables before the application starts and ensures
+    It creates the database and tables, and loads the in-memory symbol resolver before the application starts and ensures
     that the resources are properly cleaned up after the application stops.
 
     Args:
@@ -30,6 +34,10 @@ async def lifespan(app: FastAPI):
     # Create db and tables
     create_db_and_tables()
 
+    # Load all symbols into the in-memory resolver
+    with Session(engine) as session:
+        symbol_resolver.load(session)
+
     # yield app
     yield
 
@@ -41,17 +49,27 @@ app = FastAPI(
         "corporate actions and symbology changes for financial securities"
     ),
     lifespan=lifespan,
+    # orjson instead of the json module, for large listings
+    default_response_class=FastJSONResponse,
 )
 
 # Include more routes here
 app.include_router(symbols.router)
 app.include_router(corp_actions.router)
+app.include_router(snapshots.router)
+app.include_router(events.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
+
+app.add_middleware(MetricsMiddleware, metrics=service_metrics)
+# added last so it runs first, wrapping the metrics middleware
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     Handles validation errors for incoming requests.
 
@@ -60,23 +78,24 @@ async def validation_exception_handler(
     with a status code of 422 (Unprocessable Entity) and includes details about
     the validation errors.
 
+    Errors and body are serialized by orjson directly, only the objects it does not know of (e.g. exceptions in the
+    error contexts) going through `jsonable_encoder`, as large invalid bodies are echoed back.
+
     Args:
         request (Request): The incoming request that caused the validation error.
         exc (RequestValidationError): The exception instance containing details about the validation error.
 
     Returns:
-        JSONResponse: A JSON response containing the error message, details of the validation errors,
+        FastJSONResponse: A JSON response containing the error message, details of the validation errors,
             and original request body.
     """
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-        content=jsonable_encoder(
-            {
-                "error": "Request could not be processed due to error in data, see details section.",
-                "detail": exc.errors(),
-                "body": exc.body,
-            }
-        ),
+        content={
+            "error": "Request could not be processed due to error in data, see details section.",
+            "detail": exc.errors(),
+            "body": exc.body,
+        },
     )
 
 
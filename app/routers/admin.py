@@ -0,0 +1,211 @@
+import hmac
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.status import (
+    HTTP_204_NO_CONTENT,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_404_NOT_FOUND,
+)
+
+from app.config import Settings, get_settings
+from app.dependencies import (
+    get_request_profiler,
+    get_slow_query_log,
+    get_symbol_response_cache,
+)
+from app.internal.profiling import ProfileStore, RequestProfiler
+from app.internal.response_cache import SymbolResponseCache
+from app.internal.slow_queries import SlowQueryLog
+from app.schemas.admin import CacheStats, ProfileInfo, SlowQueries, SlowQueryStats
+
+PSTATS_MEDIA_TYPE = "application/octet-stream"
+
+# the admin token, passed as `Authorization: Bearer <token>`
+admin_token_scheme = HTTPBearer(auto_error=False)
+
+
+def check_admin_token(
+    *,
+    settings: Settings = Depends(get_settings),
+    credentials: HTTPAuthorizationCredentials | None = Depends(admin_token_scheme),
+) -> None:
+    """
+    Dependency restricting an admin endpoint to holders of the admin token, the endpoint not being found when no
+    admin token is set.
+
+    Args:
+        settings (Settings): The application settings dependency, holding the admin token.
+        credentials (HTTPAuthorizationCredentials | None): The bearer token of the request, None if not given.
+
+    Raises:
+        HTTPException: 404 if no admin token is set, 401 if the request does not carry it.
+    """
+    if settings.admin_token is None:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# every admin endpoint requires the admin token
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(check_admin_token)],
+)
+
+
+@router.get("/caches")
+async def get_cache_stats(
+    *,
+    symbol_response_cache: SymbolResponseCache = Depends(get_symbol_response_cache),
+) -> dict[str, CacheStats]:
+    """
+    Retrieve the counters of the in-memory caches of the worker answering the request.
+
+    Each worker has its own caches, so counters differ from one request to the next when running several workers.
+
+    Args:
+        symbol_response_cache (SymbolResponseCache): The cache of `GET /symbols/{ref_data_uuid}` responses.
+
+    Returns:
+        dict[str, CacheStats]: The counters of each cache, by cache name.
+    """
+    return {"symbols": CacheStats(**symbol_response_cache.stats())}
+
+
+@router.get("/slowQueries")
+async def get_slow_queries(
+    *,
+    slow_query_log: SlowQueryLog = Depends(get_slow_query_log),
+    settings: Settings = Depends(get_settings),
+    limit: int | None = Query(None, ge=1),
+) -> SlowQueries:
+    """
+    Retrieve the statements most expensive in total executed by the worker answering the request, by fingerprint.
+
+    Executions of a statement with different parameters share a fingerprint, so a statement executed in a loop ranks
+    high even if each execution is fast. Statements are accounted since the worker started or the table was reset.
+
+    Args:
+        slow_query_log (SlowQueryLog): The slow query log of this worker.
+        settings (Settings): The application settings dependency.
+        limit (int | None): Maximum number of statements returned, `slow_query_top_n` by default.
+
+    Returns:
+        SlowQueries: The statements, most expensive first.
+    """
+    return SlowQueries(
+        since=slow_query_log.since,
+        threshold_seconds=slow_query_log.threshold_seconds,
+        statements=[
+            SlowQueryStats(**stats)
+            for stats in slow_query_log.top(limit or settings.slow_query_top_n)
+        ],
+    )
+
+
+@router.delete("/slowQueries", status_code=HTTP_204_NO_CONTENT)
+async def reset_slow_queries(
+    *,
+    slow_query_log: SlowQueryLog = Depends(get_slow_query_log),
+) -> None:
+    """
+    Clear the table of statements of the worker answering the request, e.g. to compare statements before and after
+    a deployment.
+
+    Args:
+        slow_query_log (SlowQueryLog): The slow query log of this worker.
+    """
+    slow_query_log.reset()
+
+
+def get_profile_store(
+    *,
+    request_profiler: RequestProfiler = Depends(get_request_profiler),
+) -> ProfileStore:
+    """
+    Dependency that provides the store of the profiles, the profile endpoints not being found when profiling is
+    disabled.
+
+    Args:
+        request_profiler (RequestProfiler): The request profiler, and the store of its profiles.
+
+    Raises:
+        HTTPException: 404 if no profiling token is set.
+
+    Returns:
+        ProfileStore: The store of the profiles taken by all workers.
+    """
+    if request_profiler.token is None:
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND, detail="Profiling is disabled"
+        )
+    return request_profiler.store
+
+
+@router.get("/profiles")
+async def get_all_profiles(
+    *,
+    store: ProfileStore = Depends(get_profile_store),
+) -> list[ProfileInfo]:
+    """
+    Retrieve the profiles of the requests that carried the profiling token, taken by any worker.
+
+    Args:
+        store (ProfileStore): The store of the profiles.
+
+    Returns:
+        list[ProfileInfo]: The profiles kept, newest first.
+    """
+    return [ProfileInfo(**profile) for profile in store.list_profiles()]
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=FileResponse,
+    responses={
+        200: {
+            "content": {PSTATS_MEDIA_TYPE: {}, "text/plain": {}},
+            "description": "The pstats file, or the text report, of the profile.",
+        }
+    },
+)
+def get_profile(
+    *,
+    store: ProfileStore = Depends(get_profile_store),
+    profile_id: str,
+    profile_format: Literal["pstats", "text"] = Query("pstats", alias="format"),
+) -> Response:
+    """
+    Download the profile of a request, as a pstats file by default, e.g. for `python -m pstats` or snakeviz, or as a
+    text report of the functions taking the most time including the functions they call.
+
+    Args:
+        store (ProfileStore): The store of the profiles.
+        profile_id (str): The id of the profile, returned in the `X-Profile-Id` header of the request profiled.
+        profile_format (Literal["pstats", "text"]): The format of the profile, `format` in the query string.
+
+    Returns:
+        Response: The pstats file, or the text report.
+    """
+    if profile_format == "text":
+        report = store.report(profile_id)
+        if report is not None:
+            return PlainTextResponse(report)
+    else:
+        path = store.path_of(profile_id)
+        if path is not None:
+            return FileResponse(path, media_type=PSTATS_MEDIA_TYPE, filename=path.name)
+
+    raise HTTPException(
+        status_code=HTTP_404_NOT_FOUND, detail=f"No profile found for id {profile_id}"
+    )
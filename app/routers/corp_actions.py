@@ -1,14 +1,111 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import select, Session
-from starlette.responses import Response
-from starlette.status import HTTP_201_CREATED, HTTP_404_NOT_FOUND
+from bisect import bisect_right
+from itertools import chain
+from typing import Final
 
-from app.dependencies import get_session
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import NaiveDatetime, TypeAdapter, ValidationError
+from sqlmodel import Session
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.status import (
+    HTTP_201_CREATED,
+    HTTP_207_MULTI_STATUS,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
+
+from app.constants import HIGHEST_DATETIME
+from app.dependencies import (
+    get_adjustment_curves,
+    get_change_broadcaster,
+    get_session,
+    get_symbol_resolver,
+)
+from app.internal.adjustment_curves import AdjustmentCurveCache
+from app.internal.change_broadcaster import ChangeBroadcaster
+from app.internal.change_log import (
+    build_changes_page,
+    build_changes_page_statement,
+    record_changes,
+)
+from app.internal.change_sequence import (
+    ETAG_HEADER,
+    etag_matches,
+    get_change_sequence,
+    make_etag,
+    not_modified_response,
+)
+from app.internal.corp_actions_helpers import (
+    build_corp_actions_calendar_statement,
+    build_corp_actions_of_ref_data_uuid_statement,
+    build_corp_actions_of_symbol_statement,
+    build_corp_actions_page_statement,
+    iter_corp_actions_as_public_dicts,
+)
+from app.internal.corp_actions_ingestion import (
+    fetch_existing_corp_action_keys,
+    insert_corp_action_rows,
+    plan_corp_actions_creation,
+    resolve_corp_actions_ref_data_uuids,
+)
+from app.internal.formats import (
+    EXPORT_RESPONSES,
+    FORMAT_MEDIA_TYPES,
+    JSON_MEDIA_TYPE,
+    PAGE_RESPONSES,
+    VARY_HEADER,
+    ResponseFormat,
+    build_corp_actions_arrow_schema,
+    corp_action_rows,
+    dump_arrow,
+    dump_msgpack,
+    get_export_format,
+    get_page_format,
+    iter_arrow_stream,
+    iter_msgpack,
+    make_representation_etag,
+)
+from app.internal.lookup_ref_data_uuid import (
+    build_ref_data_uuid_exists_statement,
+    build_symbols_valid_at_statement,
+)
+from app.internal.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    CorpActionsCursor,
+    check_time_window,
+    decode_cursor,
+    encode_cursor,
+)
+from app.internal.responses import dump_json
+from app.internal.snapshots import datetime_to_epoch_us
+from app.internal.streaming import (
+    NDJSON_MEDIA_TYPE,
+    iter_db_objects,
+    iter_ndjson,
+    iter_record_batches,
+)
+from app.internal.symbol_resolver import SymbolResolver
 from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation, ChangesPage
 from app.schemas.corp_actions import (
+    AdjustedPriceSeries,
+    AdjustmentCurveBreakpoint,
+    AdjustmentCurvePublic,
+    AdjustmentFactor,
+    CorpActionBatchResult,
     CorpActionCreate,
     CorpActionPublic,
     CorpActionDb,
+    CorpActionsTypes,
+    PriceSeries,
+)
+
+PRICE_SERIES_ADAPTER: Final[TypeAdapter[list[PriceSeries]]] = TypeAdapter(
+    list[PriceSeries]
 )
 
 router = APIRouter(
@@ -18,17 +115,404 @@ router = APIRouter(
 )
 
 
-@router.get("/")
+@router.get("/", response_model=list[CorpActionPublic], responses=PAGE_RESPONSES)
 def get_all_corp_actions(
-    *, session: Session = Depends(get_session)
-) -> list[CorpActionPublic]:
-    statement = select(CorpActionDb)
+    *,
+    session: Session = Depends(get_session),
+    response_format: ResponseFormat = Depends(get_page_format),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: NaiveDatetime | None = None,
+    effective_to: NaiveDatetime | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Retrieve corporate actions from the database, one page at a time.
+
+    This endpoint fetches up to `limit` corporate actions, ordered by (ref_data_uuid, effective_time). If more
+    corporate actions are available, the `X-Next-Cursor` response header holds the cursor to request the next page
+    with.
+
+    The `ETag` response header is derived from the global change sequence. If it matches the `If-None-Match` request
+    header, nothing changed since the page was last fetched, and 304 is returned without reading corporate actions.
+
+    Depending on the `Accept` request header, the page is returned as JSON (default), MessagePack with the same
+    shape, or an Arrow IPC stream with one row per corporate action, see `app/internal/formats.py`.
+
+    Args:
+        session (Session): The database session dependency.
+        response_format (ResponseFormat): The format negotiated from the `Accept` request header.
+        limit (int): Maximum number of corporate actions per page.
+        cursor (str | None): Cursor returned with the previous page, or None for the first page.
+        action_type (CorpActionsTypes | None): Only return corporate actions of this type.
+        effective_from (NaiveDatetime | None): Only return corporate actions effective at or after this time.
+        effective_to (NaiveDatetime | None): Only return corporate actions effective at or before this time.
+        if_none_match (str | None): Entity tags of the page held by the client.
+
+    Returns:
+        Response: A page of corporate actions, serialized as a list of CorpActionPublic, or 304 if not modified.
+    """
+    check_time_window(effective_from, effective_to)
+
+    etag = make_representation_etag(get_change_sequence(session), response_format)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+    headers: dict[str, str] = {ETAG_HEADER: etag, VARY_HEADER: "Accept"}
+
+    # fetch one extra row to know whether there is a next page
+    statement = build_corp_actions_page_statement(
+        limit=limit + 1,
+        after=decode_cursor(CorpActionsCursor, cursor) if cursor else None,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
     results = session.exec(statement)
-    all_corp_actions = results.all()
+    page = results.all()
+
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            CorpActionsCursor, (last.ref_data_uuid, last.effective_time)
+        )
+
+    if response_format is ResponseFormat.ARROW:
+        return Response(
+            content=dump_arrow(
+                build_corp_actions_arrow_schema(), list(corp_action_rows(page))
+            ),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+
+    # rows come from our own database, serialize them without validating them again
+    public_dicts = list(iter_corp_actions_as_public_dicts(page))
+    if response_format is ResponseFormat.MSGPACK:
+        return Response(
+            content=dump_msgpack(public_dicts),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+    return Response(
+        content=dump_json(public_dicts), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
+
+
+@router.get("/export", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+def export_corp_actions(
+    *,
+    session: Session = Depends(get_session),
+    response_format: ResponseFormat = Depends(get_export_format),
+    action_type: CorpActionsTypes | None = None,
+    effective_from: NaiveDatetime | None = None,
+    effective_to: NaiveDatetime | None = None,
+) -> StreamingResponse:
+    """
+    Stream all corporate actions as newline delimited JSON, one CorpActionPublic object per line.
+
+    Corporate actions are read from the database through a server-side cursor and written as they are produced, so
+    memory use does not depend on the table size.
+
+    Depending on the `Accept` request header, corporate actions are streamed as NDJSON (default), a sequence of
+    MessagePack documents with the same shape, or an Arrow IPC stream with one row per corporate action and one
+    record batch per `EXPORT_BATCH_SIZE` rows, see `app/internal/formats.py`.
+
+    Args:
+        session (Session): The database session dependency.
+        response_format (ResponseFormat): The format negotiated from the `Accept` request header.
+        action_type (CorpActionsTypes | None): Only export corporate actions of this type.
+        effective_from (NaiveDatetime | None): Only export corporate actions effective at or after this time.
+        effective_to (NaiveDatetime | None): Only export corporate actions effective at or before this time.
+
+    Returns:
+        StreamingResponse: The stream of corporate actions.
+    """
+    check_time_window(effective_from, effective_to)
+
+    statement = build_corp_actions_page_statement(
+        limit=None,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+    corp_actions = iter_db_objects(session, statement)
+    headers = {VARY_HEADER: "Accept"}
+    if response_format is ResponseFormat.ARROW:
+        return StreamingResponse(
+            iter_arrow_stream(
+                build_corp_actions_arrow_schema(),
+                iter_record_batches(corp_action_rows(corp_actions)),
+            ),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+
+    public_dicts = iter_corp_actions_as_public_dicts(corp_actions)
+    if response_format is ResponseFormat.MSGPACK:
+        return StreamingResponse(
+            iter_msgpack(public_dicts),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+    return StreamingResponse(
+        iter_ndjson(dump_json(public_dict) for public_dict in public_dicts),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+@router.get("/changes", response_model=ChangesPage)
+def get_corp_action_changes(
+    *,
+    session: Session = Depends(get_session),
+    since: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """
+    Retrieve changes made to corporate actions after a given sequence of the change log, in order.
+
+    Clients keep the `next_since` of the last page they processed, and request changes after it to stay in sync,
+    instead of fetching all corporate actions again.
+
+    Args:
+        session (Session): The database session dependency.
+        since (int): Only return changes after this sequence, 0 for all changes.
+        limit (int): Maximum number of changes per page.
+
+    Returns:
+        Response: The page of changes, serialized as a ChangesPage.
+    """
+    # fetch one extra change to know whether there are more
+    statement = build_changes_page_statement(
+        entity=ChangeEntity.CORP_ACTION, since=since, limit=limit + 1
+    )
+    changes = session.exec(statement).all()
+
+    return Response(
+        content=dump_json(build_changes_page(changes, since=since, limit=limit)),
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/calendar", response_model=list[CorpActionPublic])
+def get_corp_actions_calendar(
+    *,
+    session: Session = Depends(get_session),
+    effective_from: NaiveDatetime,
+    effective_to: NaiveDatetime,
+    action_type: CorpActionsTypes | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Retrieve the corporate actions of all securities effective in a window, e.g. all stock splits of next week.
+
+    The window is searched with the (effective_time, action_type) index, so the cost depends on the number of
+    corporate actions in the window, not on the size of the table. Like `GET /corpActions/`, it returns 304 without
+    reading corporate actions if the `If-None-Match` request header matches.
+
+    Args:
+        session (Session): The database session dependency.
+        effective_from (NaiveDatetime): Only return corporate actions effective at or after this time.
+        effective_to (NaiveDatetime): Only return corporate actions effective at or before this time.
+        action_type (CorpActionsTypes | None): Only return corporate actions of this type.
+        if_none_match (str | None): Entity tags of the corporate actions held by the client.
+
+    Returns:
+        Response: The corporate actions, ordered by (effective_time, ref_data_uuid), serialized as a list of
+            CorpActionPublic, or 304 if not modified.
+    """
+    check_time_window(effective_from, effective_to)
+
+    etag = make_etag(get_change_sequence(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    statement = build_corp_actions_calendar_statement(
+        effective_from=effective_from,
+        effective_to=effective_to,
+        action_type=action_type,
+    )
+    return Response(
+        content=dump_json(
+            list(iter_corp_actions_as_public_dicts(session.exec(statement)))
+        ),
+        media_type=JSON_MEDIA_TYPE,
+        headers={ETAG_HEADER: etag},
+    )
+
+
+@router.get("/bySymbol", response_model=list[CorpActionPublic])
+def get_corp_actions_by_symbol(
+    *,
+    session: Session = Depends(get_session),
+    symbology: str,
+    symbol: str,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: NaiveDatetime | None = None,
+    effective_to: NaiveDatetime | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Retrieve the corporate actions of the securities a (symbology, symbol) pair was assigned to, at the time each
+    corporate action became effective.
+
+    Args:
+        session (Session): The database session dependency.
+        symbology (str): The symbology of the symbol.
+        symbol (str): The symbol.
+        action_type (CorpActionsTypes | None): Only return corporate actions of this type.
+        effective_from (NaiveDatetime | None): Only return corporate actions effective at or after this time.
+        effective_to (NaiveDatetime | None): Only return corporate actions effective at or before this time.
+        if_none_match (str | None): Entity tags of the corporate actions held by the client.
+
+    Returns:
+        Response: The corporate actions, ordered by (effective_time, ref_data_uuid), serialized as a list of
+            CorpActionPublic, or 304 if not modified.
+    """
+    check_time_window(effective_from, effective_to)
 
-    return [
-        CorpActionPublic(**corp_action.model_dump()) for corp_action in all_corp_actions
-    ]
+    etag = make_etag(get_change_sequence(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    statement = build_corp_actions_of_symbol_statement(
+        symbology=symbology,
+        symbol=symbol,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+    return Response(
+        content=dump_json(
+            list(iter_corp_actions_as_public_dicts(session.exec(statement)))
+        ),
+        media_type=JSON_MEDIA_TYPE,
+        headers={ETAG_HEADER: etag},
+    )
+
+
+@router.get("/{ref_data_uuid}", response_model=list[CorpActionPublic])
+def get_corp_actions_by_ref_data_uuid(
+    *,
+    session: Session = Depends(get_session),
+    ref_data_uuid: str,
+    action_type: CorpActionsTypes | None = None,
+    effective_from: NaiveDatetime | None = None,
+    effective_to: NaiveDatetime | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Retrieve the corporate actions of a security, read from the primary key index.
+
+    Args:
+        session (Session): The database session dependency.
+        ref_data_uuid (str): The reference data UUID of the security.
+        action_type (CorpActionsTypes | None): Only return corporate actions of this type.
+        effective_from (NaiveDatetime | None): Only return corporate actions effective at or after this time.
+        effective_to (NaiveDatetime | None): Only return corporate actions effective at or before this time.
+        if_none_match (str | None): Entity tags of the corporate actions held by the client.
+
+    Returns:
+        Response: The corporate actions, ordered by effective time, empty if the security has none, serialized as a
+            list of CorpActionPublic, or 304 if not modified.
+    """
+    check_time_window(effective_from, effective_to)
+
+    etag = make_etag(get_change_sequence(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    statement = build_corp_actions_of_ref_data_uuid_statement(
+        ref_data_uuid=ref_data_uuid,
+        action_type=action_type,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+    return Response(
+        content=dump_json(
+            list(iter_corp_actions_as_public_dicts(session.exec(statement)))
+        ),
+        media_type=JSON_MEDIA_TYPE,
+        headers={ETAG_HEADER: etag},
+    )
+
+
+@router.get("/{ref_data_uuid}/adjustment")
+def get_adjustment_factor(
+    *,
+    session: Session = Depends(get_session),
+    adjustment_curves: AdjustmentCurveCache = Depends(get_adjustment_curves),
+    ref_data_uuid: str,
+    start: NaiveDatetime,
+    end: NaiveDatetime | None = None,
+) -> AdjustmentFactor:
+    """
+    Compute the adjustment of a price of a security observed at `start` to the basis of `end`.
+
+    The adjustment composes those of all corporate actions effective after `start` and up to `end` included, in
+    chronological order. It is answered from the cached cumulative adjustment curve of the security in O(log n), see
+    `app/internal/adjustment_curves.py`.
+
+    Args:
+        session (Session): The database session dependency.
+        adjustment_curves (AdjustmentCurveCache): The adjustment curves cache dependency.
+        ref_data_uuid (str): The reference data UUID of the security.
+        start (NaiveDatetime): Time the price was observed at.
+        end (NaiveDatetime | None): Time of the basis to adjust to, defaults to after all corporate actions.
+
+    Returns:
+        AdjustmentFactor: The composed adjustment, the identity if no corporate action is in the window.
+    """
+    end = HIGHEST_DATETIME if end is None else end
+    check_time_window(start, end)
+
+    curve = adjustment_curves.get(session, ref_data_uuid)
+    adjustment = curve.factor(start, end)
+    return AdjustmentFactor(
+        ref_data_uuid=ref_data_uuid,
+        start=start,
+        end=end,
+        multiplicative=adjustment.multiplicative,
+        additive=adjustment.additive,
+        corp_action_count=bisect_right(curve.effective_times, end)
+        - bisect_right(curve.effective_times, start),
+    )
+
+
+@router.get("/{ref_data_uuid}/adjustmentCurve")
+def get_adjustment_curve(
+    *,
+    session: Session = Depends(get_session),
+    adjustment_curves: AdjustmentCurveCache = Depends(get_adjustment_curves),
+    ref_data_uuid: str,
+) -> AdjustmentCurvePublic:
+    """
+    Retrieve the cumulative adjustment curve of a security, for consumers composing adjustments themselves.
+
+    Args:
+        session (Session): The database session dependency.
+        adjustment_curves (AdjustmentCurveCache): The adjustment curves cache dependency.
+        ref_data_uuid (str): The reference data UUID of the security.
+
+    Returns:
+        AdjustmentCurvePublic: The breakpoints of the curve, empty if the security has no corporate actions.
+    """
+    curve = adjustment_curves.get(session, ref_data_uuid)
+    return AdjustmentCurvePublic(
+        ref_data_uuid=ref_data_uuid,
+        breakpoints=[
+            AdjustmentCurveBreakpoint(
+                effective_time=breakpoint.effective_time,
+                multiplicative=breakpoint.multiplicative,
+                additive=breakpoint.additive,
+                cumulative_multiplicative=curve.cumulative_multiplicative[position + 1],
+                cumulative_additive=curve.cumulative_additive[position + 1],
+            )
+            for position, breakpoint in enumerate(curve.breakpoints)
+        ],
+    )
 
 
 @router.post(
@@ -40,43 +524,57 @@ def get_all_corp_actions(
 def create_corp_action(
     *,
     session: Session = Depends(get_session),
+    resolver: SymbolResolver = Depends(get_symbol_resolver),
+    broadcaster: ChangeBroadcaster = Depends(get_change_broadcaster),
     corp_action: CorpActionCreate,
     response: Response,
 ) -> list[CorpActionPublic]:
     db_objects: list[CorpActionDb] = []
     if corp_action.ref_data_uuid is None:
-        # lookup ref_data_uuid using (symbology, symbol) pair
-        statement = select(SymbologySymbolDb).where(
-            SymbologySymbolDb.symbol == corp_action.symbol,
-            SymbologySymbolDb.symbology == corp_action.symbology,
-            SymbologySymbolDb.start_time <= corp_action.effective_date,
-            SymbologySymbolDb.end_time >= corp_action.effective_date,
+        # lookup ref_data_uuid using (symbology, symbol) pair, in memory first, once caught up with the symbols
+        # committed by other workers and scripts, as a stale hit would attach the action to the wrong security
+        resolver.catch_up(session)
+        ref_data_uuids = resolver.resolve(
+            symbology=corp_action.symbology,
+            symbol=corp_action.symbol,
+            time=corp_action.effective_time,
         )
 
-        results = session.exec(statement)
-        # TODO <MFido> [02/04/2025] we use .all() here with the assumption (to be reviewed) that more than one symbol
-        #  can be found, either get rid of this assumption (and replace with .one() or document explicitly
-        all_symbols: list[SymbologySymbolDb] = results.all()
+        if not ref_data_uuids:
+            # symbol may be unknown to a resolver not loaded, fall back to the database
+            statement = build_symbols_valid_at_statement(
+                symbology=corp_action.symbology,
+                symbol=corp_action.symbol,
+                time=corp_action.effective_time,
+            )
 
-        if not all_symbols:
-            msg = f"No symbol found for {corp_action.symbology} {corp_action.symbol} on {corp_action.effective_date}"
-            return [CorpActionPublic(**corp_action.model_dump(), error=msg)]
+            results = session.exec(statement)
+            # TODO <MFido> [02/04/2025] we use .all() here with the assumption (to be reviewed) that more than one symbol
+            #  can be found, either get rid of this assumption (and replace with .one() or document explicitly
+            all_symbols: list[SymbologySymbolDb] = results.all()
+            resolver.add(all_symbols)
+
+            # collect unique ref_data_uuids
+            ref_data_uuids = set([symbol.ref_data_uuid for symbol in all_symbols])
 
-        # collect unique ref_data_uuids
-        ref_data_uuids = set([symbol.ref_data_uuid for symbol in all_symbols])
+        if not ref_data_uuids:
+            msg = f"No symbol found for {corp_action.symbology} {corp_action.symbol} on {corp_action.effective_time}"
+            return [CorpActionPublic(**corp_action.model_dump(), error=msg)]
 
         for uuid in ref_data_uuids:
-            db_object = CorpActionDb(**corp_action.model_dump(), ref_data_uuid=uuid)
+            db_object = CorpActionDb(
+                **corp_action.model_dump(exclude={"ref_data_uuid"}), ref_data_uuid=uuid
+            )
 
             session.add(db_object)
             db_objects.append(db_object)
 
     else:
         results = session.exec(
-            select(SymbologySymbolDb).where(
-                SymbologySymbolDb.ref_data_uuid == corp_action.ref_data_uuid
+            build_ref_data_uuid_exists_statement(
+                ref_data_uuid=corp_action.ref_data_uuid
             )
-        ).one_or_none()
+        ).first()
 
         if not results:
             response.status_code = HTTP_404_NOT_FOUND
@@ -94,7 +592,14 @@ def create_corp_action(
         session.add(db_object)
         db_objects.append(db_object)
 
+    record_changes(
+        session=session,
+        entity=ChangeEntity.CORP_ACTION,
+        operation=ChangeOperation.CREATE,
+        rows=[db_object.model_dump() for db_object in db_objects],
+    )
     session.commit()
+    broadcaster.notify()
 
     output: list[CorpActionPublic] = []
     # below refreshes the db_objects with the latest db values
@@ -108,6 +613,163 @@ def create_corp_action(
     return output
 
 
+@router.post(
+    "/batch",
+    status_code=HTTP_201_CREATED,
+    response_model=list[CorpActionBatchResult],
+    summary="Create many corporate actions at once.",
+)
+def create_corp_actions_batch(
+    *,
+    session: Session = Depends(get_session),
+    resolver: SymbolResolver = Depends(get_symbol_resolver),
+    broadcaster: ChangeBroadcaster = Depends(get_change_broadcaster),
+    corp_actions: list[CorpActionCreate],
+) -> Response:
+    """
+    Create many corporate actions in a single transaction.
+
+    Symbols of all items are resolved in one set-based pass (in memory first, then from the database for the pairs
+    missed), existing corporate actions are checked for all resolved ref_data_uuids at once, and rows are inserted
+    with chunked Core `executemany` statements. Created corporate actions are returned as inserted, without reading
+    them back.
+
+    Args:
+        session (Session): The database session dependency.
+        resolver (SymbolResolver): The in-memory symbol resolver.
+        broadcaster (ChangeBroadcaster): The change broadcaster, notified of the created corporate actions.
+        corp_actions (list[CorpActionCreate]): The corporate actions to create.
+
+    Returns:
+        Response: The outcome of each item, in input order, with status 201 if all items succeeded, 207 if only
+            some of them did, or 400 if none did.
+    """
+    ref_data_uuids_per_item = resolve_corp_actions_ref_data_uuids(
+        session=session, resolver=resolver, corp_actions=corp_actions
+    )
+    existing_keys = fetch_existing_corp_action_keys(
+        session=session, ref_data_uuids=chain.from_iterable(ref_data_uuids_per_item)
+    )
+
+    plan = plan_corp_actions_creation(
+        corp_actions=corp_actions,
+        ref_data_uuids_per_item=ref_data_uuids_per_item,
+        existing_keys=existing_keys,
+    )
+
+    if plan.rows:
+        insert_corp_action_rows(session=session, rows=plan.rows)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.CORP_ACTION,
+            operation=ChangeOperation.CREATE,
+            rows=plan.rows,
+        )
+        session.commit()
+        broadcaster.notify()
+
+    status_code = HTTP_201_CREATED
+    if all(output["error"] is not None for output in plan.outputs):
+        status_code = HTTP_400_BAD_REQUEST
+    elif any(output["error"] is not None for output in plan.outputs):
+        status_code = HTTP_207_MULTI_STATUS
+
+    return Response(
+        content=dump_json(plan.outputs),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+async def read_price_series(request: Request) -> list[PriceSeries]:
+    """
+    Validate the price series of the request body straight from JSON.
+
+    Series hold millions of values, which the default body parsing decodes to Python objects with `json.loads`
+    before validating them, at more than twice the cost.
+
+    Raises:
+        RequestValidationError: If the body is not a valid list of price series.
+    """
+    try:
+        return PRICE_SERIES_ADAPTER.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+
+@router.post(
+    "/adjust",
+    response_model=list[AdjustedPriceSeries],
+    summary="Adjust price series for corporate actions.",
+    # the body is read by read_price_series, document it as if it were a body parameter
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                JSON_MEDIA_TYPE: {
+                    "schema": {
+                        "type": "array",
+                        "items": PriceSeries.model_json_schema(),
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
+)
+def adjust_price_series(
+    *,
+    session: Session = Depends(get_session),
+    adjustment_curves: AdjustmentCurveCache = Depends(get_adjustment_curves),
+    price_series: list[PriceSeries] = Depends(read_price_series),
+) -> Response:
+    """
+    Adjust price series of one or many securities for their corporate actions, each price according to the time it
+    was observed at.
+
+    Each series is adjusted with vectorized lookups into the cached cumulative adjustment curve of its security, see
+    `AdjustmentCurve.adjust_prices`, so millions of prices are adjusted without a Python loop per price.
+
+    Args:
+        session (Session): The database session dependency.
+        adjustment_curves (AdjustmentCurveCache): The adjustment curves cache dependency.
+        price_series (list[PriceSeries]): The price series to adjust.
+
+    Returns:
+        Response: The adjusted series, in input order, serialized as a list of AdjustedPriceSeries.
+
+    Raises:
+        HTTPException: 400 if a series has timestamps out of the 64 bits range, or prices observed after the end
+            of its basis.
+    """
+    outputs: list[dict] = []
+    for series in price_series:
+        end = HIGHEST_DATETIME if series.end is None else series.end
+        try:
+            timestamps = np.asarray(series.timestamps, dtype=np.int64)
+        except OverflowError as exc:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"Timestamps of {series.ref_data_uuid} should fit in 64 bits.",
+            ) from exc
+        if timestamps.size and timestamps.max() > datetime_to_epoch_us(end):
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"Prices of {series.ref_data_uuid} should not be observed after {end}.",
+            )
+
+        curve = adjustment_curves.get(session, series.ref_data_uuid)
+        outputs.append(
+            {
+                "ref_data_uuid": series.ref_data_uuid,
+                "end": end,
+                # serialized by orjson straight from the array
+                "prices": curve.adjust_prices(timestamps, series.prices, end),
+            }
+        )
+
+    return Response(content=dump_json(outputs), media_type=JSON_MEDIA_TYPE)
+
+
 @router.put(
     "/",
     summary="Make edits to existing corporate action.",
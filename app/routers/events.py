@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import StreamingResponse
+
+from app.config import Settings, get_settings
+from app.dependencies import get_async_engine, get_change_broadcaster
+from app.internal.change_broadcaster import (
+    SSE_MEDIA_TYPE,
+    ChangeBroadcaster,
+    ChangeSubscription,
+)
+from app.schemas.changes import ChangeEntity
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}}},
+)
+async def stream_changes(
+    *,
+    broadcaster: ChangeBroadcaster = Depends(get_change_broadcaster),
+    engine: AsyncEngine = Depends(get_async_engine),
+    settings: Settings = Depends(get_settings),
+    entity: list[ChangeEntity] | None = Query(None),
+    symbology: list[str] | None = Query(None),
+    ref_data_uuid: list[str] | None = Query(None),
+) -> StreamingResponse:
+    """
+    Push symbol and corporate action changes as server-sent events, once committed by any worker or script.
+
+    Changes are read from the change log, in sequence order: right away for changes committed by this worker, and
+    within `events_poll_seconds` for the others. Each change is sent as a `change` event, with the change sequence as
+    event id and a ChangePublic as data. Changes are queued per subscriber up to `events_max_pending`: a subscriber
+    falling further behind receives an `overflow` event with the sequence to catch up from with the changes
+    endpoints, and the stream ends. The same applies after a reconnection, from the `Last-Event-ID` received, as
+    changes are not replayed by this endpoint.
+
+    Args:
+        broadcaster (ChangeBroadcaster): The change broadcaster dependency.
+        engine (AsyncEngine): The async engine dependency, the change log is read with.
+        settings (Settings): The application settings dependency.
+        entity (list[ChangeEntity] | None): Only push changes of these entities.
+        symbology (list[str] | None): Only push symbol changes of these symbologies.
+        ref_data_uuid (list[str] | None): Only push changes of these reference data UUIDs.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    subscription = ChangeSubscription(
+        loop=asyncio.get_running_loop(),
+        max_pending=settings.events_max_pending,
+        entities=entity or (),
+        symbologies=symbology or (),
+        ref_data_uuids=ref_data_uuid or (),
+    )
+    # subscribe before the response starts, so no change committed after the request is missed, the subscription
+    # starting from the last change fanned out
+    await broadcaster.follow(engine, poll_seconds=settings.events_poll_seconds)
+    broadcaster.subscribe(subscription)
+
+    async def iter_events() -> AsyncIterator[bytes]:
+        try:
+            async for event in subscription.iter_events(
+                settings.events_keepalive_seconds
+            ):
+                yield event
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        iter_events(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
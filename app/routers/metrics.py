@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from starlette.responses import PlainTextResponse
+
+from app.dependencies import get_service_metrics
+from app.internal.metrics import PROMETHEUS_MEDIA_TYPE, ServiceMetrics
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    responses={200: {"content": {PROMETHEUS_MEDIA_TYPE: {}}}},
+)
+async def get_metrics(
+    *,
+    metrics: ServiceMetrics = Depends(get_service_metrics),
+) -> PlainTextResponse:
+    """
+    Retrieve the metrics of the worker answering the request, in the Prometheus text exposition format.
+
+    Request latencies, in-flight requests, response sizes, and database statements and rows per route, see
+    `app/internal/metrics.py`. Each worker has its own metrics, so each worker should be scraped on its own.
+
+    Args:
+        metrics (ServiceMetrics): The metrics of this process.
+
+    Returns:
+        PlainTextResponse: The metrics exposition.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
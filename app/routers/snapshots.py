@@ -0,0 +1,129 @@
+import datetime
+from pathlib import Path
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+from starlette.responses import FileResponse
+from starlette.status import HTTP_201_CREATED
+
+from app.config import Settings, get_settings
+from app.dependencies import get_session
+from app.internal.snapshots import (
+    SNAPSHOT_MEDIA_TYPE,
+    SymbolSnapshot,
+    generate_snapshot,
+    is_snapshot_stale,
+    list_snapshot_paths,
+    snapshot_path,
+)
+from app.schemas.snapshots import SnapshotInfo
+
+router = APIRouter(
+    prefix="/snapshots",
+    tags=["snapshots"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def get_snapshot_info(path: Path) -> SnapshotInfo:
+    """Describe a snapshot file from its header."""
+    with SymbolSnapshot(path) as snapshot:
+        return SnapshotInfo(
+            as_of=snapshot.as_of.date(),
+            row_count=snapshot.row_count,
+            change_sequence=snapshot.change_sequence,
+            size=path.stat().st_size,
+        )
+
+
+@router.get("/")
+def get_all_snapshots(
+    *, settings: Settings = Depends(get_settings)
+) -> list[SnapshotInfo]:
+    """
+    List the snapshot files available, sorted by as-of date.
+
+    Args:
+        settings (Settings): The application settings dependency.
+
+    Returns:
+        list[SnapshotInfo]: The snapshots available.
+    """
+    snapshots = []
+    for path in list_snapshot_paths(settings.snapshot_dir):
+        try:
+            snapshots.append(get_snapshot_info(path))
+        except FileNotFoundError:
+            # deleted by another worker in the meantime
+            continue
+        except ValueError:
+            # written by a previous version, regenerated on its next request
+            continue
+    return snapshots
+
+
+@router.get(
+    "/{as_of}",
+    response_class=FileResponse,
+    responses={200: {"content": {SNAPSHOT_MEDIA_TYPE: {}}}},
+)
+def get_snapshot(
+    *,
+    session: Session = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+    as_of: datetime.date,
+) -> FileResponse:
+    """
+    Download the snapshot file of all symbols valid at an as-of date, see `app/internal/snapshots.py` for its layout.
+
+    The snapshot is generated on first request, then served as is until a symbol is changed, the change sequence of
+    its header being behind the change log.
+
+    Args:
+        session (Session): The database session dependency.
+        settings (Settings): The application settings dependency.
+        as_of (datetime.date): The as-of date.
+
+    Returns:
+        FileResponse: The snapshot file.
+    """
+    path = snapshot_path(settings.snapshot_dir, as_of)
+    if not path.exists() or is_snapshot_stale(session, path):
+        generate_snapshot(
+            session,
+            settings.snapshot_dir,
+            as_of,
+            max_snapshots=settings.snapshot_max_snapshots,
+        )
+
+    return FileResponse(path, media_type=SNAPSHOT_MEDIA_TYPE, filename=path.name)
+
+
+@router.post("/{as_of}", status_code=HTTP_201_CREATED)
+def regenerate_snapshot(
+    *,
+    session: Session = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+    as_of: datetime.date,
+) -> SnapshotInfo:
+    """
+    Generate the snapshot file of an as-of date again, from the symbols currently in the database.
+
+    The file is replaced atomically, consumers having the previous file memory-mapped keep reading it unchanged.
+
+    Args:
+        session (Session): The database session dependency.
+        settings (Settings): The application settings dependency.
+        as_of (datetime.date): The as-of date.
+
+    Returns:
+        SnapshotInfo: The snapshot generated.
+    """
+    return get_snapshot_info(
+        generate_snapshot(
+            session,
+            settings.snapshot_dir,
+            as_of,
+            max_snapshots=settings.snapshot_max_snapshots,
+        )
+    )
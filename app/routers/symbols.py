@@ -1,21 +1,90 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
-from starlette.responses import Response
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from pydantic import NaiveDatetime
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.responses import Response, StreamingResponse
 from starlette.status import (
     HTTP_207_MULTI_STATUS,
     HTTP_201_CREATED,
     HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
 )
 
-from app.internal.id_generator import generate_ref_data_uuid
-from app.dependencies import get_session
-from app.internal.lookup_ref_data_uuid import lookup_ref_data_uuid_given_symbology_maps
-from app.internal.symbols_helpers import convert_list_of_db_objects_to_public_objects
+from app.dependencies import (
+    get_async_session,
+    get_change_broadcaster,
+    get_session,
+    get_symbol_resolver,
+    get_symbol_response_cache,
+)
+from app.internal.change_broadcaster import ChangeBroadcaster
+from app.internal.change_log import (
+    build_changes_page,
+    build_changes_page_statement,
+    record_changes_async,
+)
+from app.internal.change_sequence import (
+    ETAG_HEADER,
+    etag_matches,
+    get_change_sequence_async,
+    make_etag,
+    not_modified_response,
+)
+from app.internal.formats import (
+    EXPORT_RESPONSES,
+    FORMAT_MEDIA_TYPES,
+    JSON_MEDIA_TYPE,
+    PAGE_RESPONSES,
+    VARY_HEADER,
+    ResponseFormat,
+    build_symbols_arrow_schema,
+    dump_arrow,
+    dump_msgpack,
+    get_export_format,
+    get_page_format,
+    iter_arrow_stream,
+    iter_msgpack,
+    make_representation_etag,
+)
+from app.internal.lookup_ref_data_uuid import fetch_symbol_candidates_async
+from app.internal.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    SymbolsCursor,
+    check_time_window,
+    decode_cursor,
+    encode_cursor,
+)
+from app.internal.response_cache import SymbolResponseCache
+from app.internal.symbol_resolver import SymbolResolver
+from app.internal.responses import dump_json
+from app.internal.symbols_helpers import (
+    build_symbols_by_ref_data_uuid_statement,
+    build_symbols_page_statement,
+    iter_symbol_rows_as_public_dicts,
+)
+from app.internal.symbols_ingestion import (
+    get_symbols_to_query_per_item,
+    insert_symbol_rows_async,
+    plan_symbols_creation,
+)
+from app.internal.streaming import (
+    NDJSON_MEDIA_TYPE,
+    iter_db_objects,
+    iter_ndjson,
+    iter_record_batches,
+)
 from app.schemas import (
     SymbologySymbolCreate,
-    SymbologySymbolDb,
     SymbologySymbolPublic,
+    SymbolsResolveRequest,
+    SymbolResolveResult,
+    SymbolResolveStatus,
 )
+from app.schemas.changes import ChangeEntity, ChangeOperation, ChangesPage
 
 router = APIRouter(
     prefix="/symbols",
@@ -24,186 +93,396 @@ router = APIRouter(
 )
 
 
-@router.get("/")
+@router.get("/", response_model=list[SymbologySymbolPublic], responses=PAGE_RESPONSES)
 async def get_all_symbols(
-    *, session: Session = Depends(get_session)
-) -> list[SymbologySymbolPublic]:
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    response_format: ResponseFormat = Depends(get_page_format),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    symbology: str | None = None,
+    valid_from: NaiveDatetime | None = None,
+    valid_to: NaiveDatetime | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
     """
-    Retrieve all symbols from the database.
+    Retrieve symbols from the database, one page at a time.
 
-    This endpoint fetches all symbols from the database and returns them as a list of SymbologySymbolDb objects.
+    This endpoint fetches up to `limit` symbols, ordered by (ref_data_uuid, symbology, start_time), and returns them
+    grouped by ref_data_uuid. If more symbols are available, the `X-Next-Cursor` response header holds the cursor to
+    request the next page with. A ref_data_uuid with many symbols may be split across consecutive pages.
+
+    The `ETag` response header is derived from the global change sequence. If it matches the `If-None-Match` request
+    header, nothing changed since the page was last fetched, and 304 is returned without reading symbols.
+
+    Depending on the `Accept` request header, the page is returned as JSON (default), MessagePack with the same
+    shape, or an Arrow IPC stream with one row per symbol, see `app/internal/formats.py`.
+
+    Args:
+        session (AsyncSession): The async database session dependency.
+        response_format (ResponseFormat): The format negotiated from the `Accept` request header.
+        limit (int): Maximum number of symbols (rows) per page.
+        cursor (str | None): Cursor returned with the previous page, or None for the first page.
+        symbology (str | None): Only return symbols of this symbology.
+        valid_from (NaiveDatetime | None): Only return symbols still valid at this time.
+        valid_to (NaiveDatetime | None): Only return symbols already valid at this time.
+        if_none_match (str | None): Entity tags of the page held by the client.
+
+    Returns:
+        Response: A page of symbols, grouped by ref_data_uuid, serialized as a list of SymbologySymbolPublic, or 304
+            if not modified.
+    """
+    check_time_window(valid_from, valid_to)
+
+    etag = make_representation_etag(
+        await get_change_sequence_async(session), response_format
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    # fetch one extra row to know whether there is a next page
+    statement = build_symbols_page_statement(
+        limit=limit + 1,
+        after=decode_cursor(SymbolsCursor, cursor) if cursor else None,
+        symbology=symbology,
+        valid_from=valid_from,
+        valid_to=valid_to,
+    )
+    results = await session.exec(statement)
+    page = results.all()
+
+    headers: dict[str, str] = {ETAG_HEADER: etag, VARY_HEADER: "Accept"}
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            SymbolsCursor, (last.ref_data_uuid, last.symbology, last.start_time)
+        )
+
+    if response_format is ResponseFormat.ARROW:
+        return Response(
+            content=dump_arrow(build_symbols_arrow_schema(), page),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+
+    # rows come from our own database, serialize them without validating them again
+    public_dicts = list(iter_symbol_rows_as_public_dicts(page))
+    if response_format is ResponseFormat.MSGPACK:
+        return Response(
+            content=dump_msgpack(public_dicts),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+    return Response(
+        content=dump_json(public_dicts), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
+
+
+@router.get("/export", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_symbols(
+    *,
+    session: Session = Depends(get_session),
+    response_format: ResponseFormat = Depends(get_export_format),
+    symbology: str | None = None,
+    valid_from: NaiveDatetime | None = None,
+    valid_to: NaiveDatetime | None = None,
+) -> StreamingResponse:
+    """
+    Stream all symbols as newline delimited JSON, one SymbologySymbolPublic object per line.
+
+    Symbols are read from the database through a server-side cursor ordered by ref_data_uuid, grouped incrementally
+    and written as soon as each ref_data_uuid is complete, so memory use does not depend on the table size. The
+    synchronous session is fine here, as the streaming response iterates rows in a thread pool.
+
+    Depending on the `Accept` request header, symbols are streamed as NDJSON (default), a sequence of MessagePack
+    documents with the same shape, or an Arrow IPC stream with one row per symbol and one record batch per
+    `EXPORT_BATCH_SIZE` rows, see `app/internal/formats.py`.
 
     Args:
         session (Session): The database session dependency.
+        response_format (ResponseFormat): The format negotiated from the `Accept` request header.
+        symbology (str | None): Only export symbols of this symbology.
+        valid_from (NaiveDatetime | None): Only export symbols still valid at this time.
+        valid_to (NaiveDatetime | None): Only export symbols already valid at this time.
 
     Returns:
-        list[SymbologySymbolDb]: A list of all symbols in the database.
+        StreamingResponse: The stream of symbols.
     """
+    check_time_window(valid_from, valid_to)
 
-    statement = select(SymbologySymbolDb)
-    results = session.exec(statement)
-    all_symbols = results.all()
+    statement = build_symbols_page_statement(
+        limit=None, symbology=symbology, valid_from=valid_from, valid_to=valid_to
+    )
+    rows = iter_db_objects(session, statement)
+    headers = {VARY_HEADER: "Accept"}
+    if response_format is ResponseFormat.ARROW:
+        return StreamingResponse(
+            iter_arrow_stream(build_symbols_arrow_schema(), iter_record_batches(rows)),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
 
-    # convert to public version so the output is consistent between endpoints
-    all_symbols_public = convert_list_of_db_objects_to_public_objects(all_symbols)
-    return all_symbols_public
+    public_dicts = iter_symbol_rows_as_public_dicts(rows)
+    if response_format is ResponseFormat.MSGPACK:
+        return StreamingResponse(
+            iter_msgpack(public_dicts),
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+    return StreamingResponse(
+        iter_ndjson(dump_json(public_dict) for public_dict in public_dicts),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
 
 
-@router.get("/{ref_data_uuid}")
-@router.get("/{ref_data_uuid}/symbology/{symbology}")
+@router.get("/changes", response_model=ChangesPage)
+async def get_symbol_changes(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    since: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """
+    Retrieve changes made to symbols after a given sequence of the change log, in order.
+
+    Clients keep the `next_since` of the last page they processed, and request changes after it to stay in sync,
+    instead of fetching all symbols again. Payloads are symbol rows, i.e. one symbology of a ref_data_uuid each.
+
+    Args:
+        session (AsyncSession): The async database session dependency.
+        since (int): Only return changes after this sequence, 0 for all changes.
+        limit (int): Maximum number of changes per page.
+
+    Returns:
+        Response: The page of changes, serialized as a ChangesPage.
+    """
+    # fetch one extra change to know whether there are more
+    statement = build_changes_page_statement(
+        entity=ChangeEntity.SYMBOL, since=since, limit=limit + 1
+    )
+    changes = (await session.exec(statement)).all()
+
+    return Response(
+        content=dump_json(build_changes_page(changes, since=since, limit=limit)),
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/{ref_data_uuid}", response_model=SymbologySymbolPublic)
+@router.get(
+    "/{ref_data_uuid}/symbology/{symbology}", response_model=SymbologySymbolPublic
+)
 async def get_symbol_by_ref_data_uuid(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
+    cache: SymbolResponseCache = Depends(get_symbol_response_cache),
     ref_data_uuid: str,
     symbology: str | None = None,
-) -> SymbologySymbolPublic:
+    if_none_match: str | None = Header(None),
+) -> Response:
     """
     Retrieve a symbol by its reference data UUID.
 
     This endpoint fetches a symbol from the database using its reference data UUID and returns it as a SymbologySymbolPublic object.
+    Like `GET /symbols/`, it returns 304 without reading symbols if the `If-None-Match` request header matches.
+
+    Serialized responses are cached in memory per (ref_data_uuid, symbology), and invalidated when symbols are
+    written for the ref_data_uuid, by this worker or any other, see `SymbolResponseCache`.
 
     Args:
-        session (Session): The database session dependency.
+        session (AsyncSession): The async database session dependency.
+        cache (SymbolResponseCache): The response cache dependency.
         ref_data_uuid (str): The reference data UUID of the symbol.
         symbology (str | None): The symbology of the symbol. Defaults to None.
+        if_none_match (str | None): Entity tags of the symbol held by the client.
 
     Returns:
-        SymbologySymbolPublic: The symbol with the specified reference data UUID.
+        Response: The symbol with the specified reference data UUID, serialized as a SymbologySymbolPublic, or 304
+            if not modified.
     """
+    sequence = await get_change_sequence_async(session)
+    etag = make_etag(sequence)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    await cache.catch_up(session, sequence)
+    key = (ref_data_uuid, symbology)
+    content = cache.get(key)
+
+    if content is None:
+        statement = build_symbols_by_ref_data_uuid_statement(
+            ref_data_uuid=ref_data_uuid, symbology=symbology
+        )
 
-    statement = select(SymbologySymbolDb).where(
-        SymbologySymbolDb.ref_data_uuid == ref_data_uuid
-    )
-
-    if symbology:
-        # filter by symbology if provided
-        statement = statement.where(SymbologySymbolDb.symbology == symbology)
+        results = await session.exec(statement)
+        all_symbols = results.all()
 
-    results = session.exec(statement)
-    all_symbols = results.all()
+        # given we query by ref_data_uuid, we should only have one result
+        public_dict = next(iter_symbol_rows_as_public_dicts(all_symbols), None)
+        if public_dict is None:
+            raise HTTPException(
+                status_code=HTTP_404_NOT_FOUND,
+                detail=f"No symbol found for ref_data_uuid {ref_data_uuid}",
+            )
 
-    # convert to public version so the output is consistent between endpoints
-    all_symbols_public = convert_list_of_db_objects_to_public_objects(all_symbols)
+        content = dump_json(public_dict)
+        cache.put(key, content, sequence=sequence)
 
-    # given we query by ref_data_uuid, we should only have one result
-    return all_symbols_public[0]
+    return Response(
+        content=content,
+        media_type=JSON_MEDIA_TYPE,
+        headers={ETAG_HEADER: etag},
+    )
 
 
-@router.post("/", status_code=HTTP_201_CREATED)
+@router.post(
+    "/", status_code=HTTP_201_CREATED, response_model=list[SymbologySymbolPublic]
+)
 async def create_symbol(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
+    resolver: SymbolResolver = Depends(get_symbol_resolver),
+    broadcaster: ChangeBroadcaster = Depends(get_change_broadcaster),
+    cache: SymbolResponseCache = Depends(get_symbol_response_cache),
     symbols: list[SymbologySymbolCreate],
-    response: Response,
-) -> list[SymbologySymbolPublic]:
+) -> Response:
     """
     Create new symbols in the database.
 
     This endpoint accepts a list of SymbologySymbolCreate objects, generates unique ref_data_uuid for each symbol,
-    and inserts them into the database. It returns the created symbols as a list of SymbologySymbolPublic objects.
+    and inserts them into the database. It returns the outcome of each item, in input order, as a list of
+    SymbologySymbolPublic objects: either the ref_data_uuid assigned and a success message, or an error.
+
+    Rows are inserted in chunks with Core `executemany` statements rather than as ORM objects, so large symbol
+    masters can be loaded through this endpoint, see `scripts/benchmark_symbols_ingestion.py`.
 
     Args:
-        session (Session): The database session dependency.
+        session (AsyncSession): The async database session dependency.
+        resolver (SymbolResolver): The in-memory symbol resolver, updated with the created symbols.
+        broadcaster (ChangeBroadcaster): The change broadcaster, notified of the created symbols.
+        cache (SymbolResponseCache): The response cache, invalidated for the ref_data_uuids symbols are created for.
         symbols (list[SymbologySymbolCreate]): A list of symbols to be created.
-        response (Response): The response object to set the status code.
 
     Returns:
-        list[SymbologySymbolPublic]: A list of created symbols with their ref_data_uuid and a success message.
+        Response: The outcome of each item, with status 201 if all items succeeded, 207 if only some of them did,
+            or 400 if none did.
     """
+    # fetch all symbols of the request at once, instead of querying database item by item. The database, not the
+    # resolver, is the source of truth here, as other workers may have created symbols this process does not know of
+    symbols_to_query_per_item = get_symbols_to_query_per_item(symbols)
+    candidates = await fetch_symbol_candidates_async(
+        session=session,
+        keys=(
+            (symbol_to_query.symbology, symbol_to_query.symbol)
+            for symbols_to_query in symbols_to_query_per_item
+            for symbol_to_query in symbols_to_query
+        ),
+    )
 
-    # db objects list
-    db_objects: list[SymbologySymbolDb] = []
-    outputs: list[SymbologySymbolPublic] = []
-
-    for symbol in symbols:
-        # unpack symbology_maps object
-        symbology_maps = symbol.symbology_map
+    plan = plan_symbols_creation(
+        symbols=symbols,
+        symbols_to_query_per_item=symbols_to_query_per_item,
+        candidates=candidates,
+    )
 
-        ref_data_uuids = await lookup_ref_data_uuid_given_symbology_maps(
-            session=session, symbology_maps=symbology_maps
+    if plan.rows:
+        await insert_symbol_rows_async(session=session, rows=plan.rows)
+        await record_changes_async(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=plan.rows,
         )
+        await session.commit()
 
-        if len(ref_data_uuids) == 1:
-            # Only one unique ref_data_uuid found, use it
-            ref_data_uuid, symbologies_already_in_database = next(
-                iter(ref_data_uuids.items())
-            )
+        resolver.add(plan.created_symbols)
+        cache.invalidate(row["ref_data_uuid"] for row in plan.rows)
+        broadcaster.notify()
+
+    # handle status based on ref_data_uuids / message / error
+    status_code = HTTP_201_CREATED
+    if all(output["error"] is not None for output in plan.outputs):
+        status_code = HTTP_400_BAD_REQUEST
+    elif any(output["error"] is not None for output in plan.outputs):
+        status_code = HTTP_207_MULTI_STATUS
+
+    return Response(
+        content=dump_json(plan.outputs),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.post("/resolve", response_model=list[SymbolResolveResult])
+async def resolve_symbols(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    resolver: SymbolResolver = Depends(get_symbol_resolver),
+    request: SymbolsResolveRequest,
+) -> Response:
+    """
+    Resolve many (symbology, symbol, as_of) keys to reference data UUIDs at once.
+
+    Keys are matched against symbol validity intervals of the in-memory resolver, grouped by (symbology, symbol), the
+    times of each group being bisected at once with `numpy.searchsorted`. The resolver is caught up with the symbols committed by other workers and scripts first, and
+    pairs it does not know are fetched from the database in chunks.
+
+    Results are built as plain dicts shaped like `SymbolResolveResult` and serialized at once, rather than validated
+    as one model per key, as requests hold up to hundreds of thousands of keys.
 
-            if symbology_maps.keys() <= symbologies_already_in_database:
-                # All symbologies are already in the database, raise an error
-                outputs.append(
-                    SymbologySymbolPublic(
-                        **symbol.model_dump(),
-                        ref_data_uuid=ref_data_uuid,
-                        error=(
-                            "All symbologies provided for this ref_data_uuid are already in the database. This "
-                            "request type can only be used to define new symbologies to an existing ref_data_uuid / "
-                            "define new symbol with new ref_data_uuid. Use other method to change existing "
-                            "symbologies."
-                        ),
-                    )
-                )
-
-            # filter out symbologies that are already in the database
-            symbology_maps = {
-                symbology_name: symbology_values
-                for symbology_name, symbology_values in symbology_maps.items()
-                if symbology_name not in symbologies_already_in_database
-            }
-
-        elif len(ref_data_uuids) > 1:
-            # Multiple unique ref_data_uuids found, raise an error
-            outputs.append(
-                SymbologySymbolPublic(
-                    **symbol.model_dump(),
-                    error=(
-                        "Multiple ref_data_uuids have been found for symbols provided, cannot determine which one "
-                        "to use. Please verify the request provided."
-                    ),
-                )
+    Args:
+        session (AsyncSession): The async database session dependency.
+        resolver (SymbolResolver): The in-memory symbol resolver.
+        request (SymbolsResolveRequest): The keys to resolve, as a list or as columnar arrays.
+
+    Returns:
+        Response: One result per key, in input order, flagged as found, not found or ambiguous.
+    """
+    keys = request.to_tuples()
+
+    # catches the resolver up with symbols committed by other workers and scripts, including new intervals of pairs
+    # it already knows, and adds the pairs it does not know yet
+    await fetch_symbol_candidates_async(
+        session=session,
+        keys={(symbology, symbol) for symbology, symbol, _ in keys},
+        resolver=resolver,
+    )
+
+    not_found = {
+        "status": SymbolResolveStatus.NOT_FOUND,
+        "ref_data_uuid": None,
+        "candidates": None,
+    }
+    results: list[dict[str, Any]] = []
+    for ref_data_uuids in resolver.resolve_many(keys):
+        if not ref_data_uuids:
+            results.append(not_found)
+        elif len(ref_data_uuids) == 1:
+            results.append(
+                {
+                    "status": SymbolResolveStatus.FOUND,
+                    "ref_data_uuid": ref_data_uuids[0],
+                    "candidates": None,
+                }
             )
         else:
-            # generate new unique ref_data_uuid to each symbol
-            ref_data_uuid = generate_ref_data_uuid()
-
-        for symbology_name, symbology_values in symbology_maps.items():
-            # TODO <MFido> [27/03/2025] we should instead iterate over sorted symbology values by start_time
-            for symbol_spec_entry in symbology_values:
-                db_object = SymbologySymbolDb(
-                    **symbol_spec_entry.model_dump(),
-                    symbology=symbology_name,
-                    ref_data_uuid=ref_data_uuid,
-                )
-
-                session.add(db_object)
-                db_objects.append(db_object)
-
-    # we commit all transactions
-    session.commit()
-
-    # then we should refresh all object to get updated ref_data_uuid
-    for symbol_create, db_object in zip(symbols, db_objects):
-        outputs.append(
-            SymbologySymbolPublic(
-                **symbol_create.model_dump(),
-                ref_data_uuid=db_object.ref_data_uuid,
-                message="Symbol created successfully",
+            results.append(
+                {
+                    "status": SymbolResolveStatus.AMBIGUOUS,
+                    "ref_data_uuid": None,
+                    "candidates": ref_data_uuids,
+                }
             )
-        )
-
-    # handle status based on ref_data_uuids / message / error
-    if all([x.error is not None for x in outputs]):
-        response.status_code = HTTP_400_BAD_REQUEST
-    elif any([x.error is not None for x in outputs]):
-        response.status_code = HTTP_207_MULTI_STATUS
 
-    return outputs
+    return Response(content=dump_json(results), media_type=JSON_MEDIA_TYPE)
 
 
 @router.put("/")
 async def change_symbol_history(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     symbols: list[SymbologySymbolCreate],
     response: Response,
 ) -> list[SymbologySymbolPublic]:
@@ -211,7 +490,7 @@ async def change_symbol_history(
     Update an existing corporate action in the database.
 
     Args:
-        session (Session): The database session dependency.
+        session (AsyncSession): The async database session dependency.
         corp_action (CorpActionCreate): The corporate action to be updated.
         response (Response): The response object to set the status code.
 
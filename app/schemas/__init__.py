@@ -5,6 +5,10 @@ from .symbols import (
     SymbologyMaps,
     SymbolsToQuery,
     SymbologySymbolCreate,
+    SymbolToResolve,
+    SymbolsResolveRequest,
+    SymbolResolveStatus,
+    SymbolResolveResult,
 )
 
 __all__ = [
@@ -14,4 +18,8 @@ __all__ = [
     "SymbologySymbolSpec",
     "SymbologyMaps",
     "SymbolsToQuery",
+    "SymbolToResolve",
+    "SymbolsResolveRequest",
+    "SymbolResolveStatus",
+    "SymbolResolveResult",
 ]
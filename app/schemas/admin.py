@@ -0,0 +1,73 @@
+from pydantic import AwareDatetime, BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """Counters of an in-memory cache of this worker, since it started."""
+
+    entries: int = Field(description="Number of entries cached.")
+    max_entries: int = Field(
+        description="Number of entries after which the least recently used one is evicted."
+    )
+    hits: int = Field(description="Lookups answered from the cache.")
+    misses: int = Field(description="Lookups not answered from the cache.")
+    evictions: int = Field(description="Entries evicted to make room for new ones.")
+    expirations: int = Field(
+        description="Entries dropped as older than their time to live."
+    )
+    invalidations: int = Field(
+        description="Entries dropped as their data has been written."
+    )
+
+
+class SlowQueryStats(BaseModel):
+    """Executions of a statement by this worker, whatever their parameters, since the slow query log was reset."""
+
+    fingerprint: str = Field(description="Short hash of the normalized statement.")
+    statement: str = Field(
+        description="Statement with literals and parameters replaced with `?`."
+    )
+    calls: int = Field(description="Executions of the statement.")
+    slow_calls: int = Field(description="Executions slower than the threshold.")
+    total_seconds: float = Field(
+        description="Time spent executing the statement, over all executions."
+    )
+    mean_seconds: float = Field(description="Mean time of an execution.")
+    max_seconds: float = Field(description="Time of the slowest execution.")
+    rows: int = Field(
+        description="Rows affected, as reported by the driver, over all executions."
+    )
+    routes: dict[str, int] = Field(
+        description="Executions by route template of the requests executing the statement."
+    )
+    last_seen: AwareDatetime = Field(description="Time of the last execution.")
+
+
+class SlowQueries(BaseModel):
+    """Statements most expensive in total, by fingerprint."""
+
+    since: AwareDatetime = Field(
+        description="Time statements have been accounted since."
+    )
+    threshold_seconds: float = Field(
+        description="Executions taking at least this long are logged."
+    )
+    statements: list[SlowQueryStats] = Field(
+        description="Statements by total time, most expensive first."
+    )
+
+
+class ProfileInfo(BaseModel):
+    """A profile of a request, taken as it carried the profiling token."""
+
+    profile_id: str = Field(
+        description="Id of the profile, to download it from `/admin/profiles/{profile_id}`."
+    )
+    method: str = Field(description="HTTP method of the request.")
+    path: str = Field(description="Path of the request.")
+    route: str = Field(description="Route template the request matched.")
+    status: int = Field(description="HTTP status of the response.")
+    duration_seconds: float = Field(
+        description="Time from the start of the request to the end of its response, profiler overhead included."
+    )
+    created_at: AwareDatetime = Field(description="Time the request started.")
+    size: int = Field(description="Size of the pstats file, in bytes.")
@@ -0,0 +1,59 @@
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class ChangeEntity(StrEnum):
+    SYMBOL = "SYMBOL"
+    CORP_ACTION = "CORP_ACTION"
+
+
+class ChangeOperation(StrEnum):
+    CREATE = "CREATE"
+
+
+class ChangeLogDb(SQLModel, table=True):
+    """Append-only log of changes, written in the same transaction as the rows changed."""
+
+    __table_args__ = (
+        # changes of one entity after a given sequence, read in order
+        Index("ix_changelogdb_entity_sequence", "entity", "sequence"),
+    )
+
+    sequence: int | None = Field(
+        default=None,
+        primary_key=True,
+        description="Position of the change in the log, increasing with commit order.",
+    )
+    entity: ChangeEntity = Field(description="Type of the row changed.")
+    operation: ChangeOperation = Field(description="Change made to the row.")
+    ref_data_uuid: str = Field(description="Reference data UUID of the row changed.")
+    payload: str = Field(description="Row changed, as a JSON object.")
+
+
+class ChangePublic(BaseModel):
+    """Public representation of a change."""
+
+    sequence: int = Field(description="Position of the change in the log.")
+    entity: ChangeEntity = Field(description="Type of the row changed.")
+    operation: ChangeOperation = Field(description="Change made to the row.")
+    ref_data_uuid: str = Field(description="Reference data UUID of the row changed.")
+    payload: dict[str, Any] = Field(
+        description="Row changed, shaped like a symbol database row or a corporate action."
+    )
+
+
+class ChangesPage(BaseModel):
+    """Page of changes after a given sequence."""
+
+    changes: list[ChangePublic] = Field(description="Changes, in log order.")
+    next_since: int = Field(
+        description="Sequence to request the following changes with, i.e. of the last change returned, or the "
+        "`since` requested if there is none."
+    )
+    has_more: bool = Field(
+        description="Whether more changes are available right away after `next_since`."
+    )
@@ -2,7 +2,7 @@ from enum import StrEnum
 from typing import Self
 
 from pydantic import model_validator, NaiveDatetime
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index
 from sqlmodel import SQLModel, Field
 
 from app.constants import HIGHEST_DATETIME, LOWEST_DATETIME
@@ -44,7 +44,14 @@ class CorpAction(SQLModel):
 
 
 class CorpActionDb(CorpAction, table=True):
-    pass
+    __table_args__ = (
+        # calendar queries, i.e. corporate actions of all securities effective in a window, optionally of one type
+        Index(
+            "ix_corpactiondb_effective_time_action_type",
+            "effective_time",
+            "action_type",
+        ),
+    )
 
 
 class CorpActionCreate(CorpAction):
@@ -68,6 +75,13 @@ class CorpActionCreate(CorpAction):
             )
         return self
 
+    @model_validator(mode="after")
+    def check_multiplicative_adjustment_not_zero(self) -> Self:
+        # adjustments are composed and inverted, see app/internal/adjustment_curves.py
+        if self.multiplicative_adjustment == 0:
+            raise ValueError("Multiplicative adjustment should not be zero.")
+        return self
+
 
 class CorpActionPublic(CorpAction):
     """CorpAction public model. To be used for returning corp action to the client."""
@@ -79,3 +93,87 @@ class CorpActionPublic(CorpAction):
     error: str | None = Field(
         None, description="Error message if any issue occurred with the corp action."
     )
+
+
+class CorpActionBatchResult(SQLModel):
+    """Outcome of one item of a batch creation request."""
+
+    created: list[CorpActionPublic] = Field(
+        default_factory=list,
+        description="Corporate actions created for this item, one per ref_data_uuid the symbol resolved to.",
+    )
+    error: str | None = Field(
+        None, description="Error message if the item has been rejected."
+    )
+
+
+class AdjustmentFactor(SQLModel):
+    """Adjustment of a price observed at `start` to the basis of `end`: `price * multiplicative + additive`."""
+
+    ref_data_uuid: str = Field(description="Reference data UUID of the security.")
+    start: NaiveDatetime = Field(description="Time the price was observed at.")
+    end: NaiveDatetime = Field(
+        description="Time of the basis the price is adjusted to."
+    )
+    multiplicative: float = Field(description="Composed multiplicative adjustment.")
+    additive: float = Field(description="Composed additive adjustment.")
+    corp_action_count: int = Field(
+        description="Number of corporate actions effective after `start` and up to `end` included."
+    )
+
+
+class AdjustmentCurveBreakpoint(SQLModel):
+    """Breakpoint of a cumulative adjustment curve."""
+
+    effective_time: NaiveDatetime = Field(
+        description="Effective time of the corporate action."
+    )
+    multiplicative: float = Field(
+        description="Multiplicative adjustment of the corporate action."
+    )
+    additive: float = Field(description="Additive adjustment of the corporate action.")
+    cumulative_multiplicative: float = Field(
+        description="Multiplicative adjustment of all corporate actions up to this one included."
+    )
+    cumulative_additive: float = Field(
+        description="Additive adjustment of all corporate actions up to this one included."
+    )
+
+
+class AdjustmentCurvePublic(SQLModel):
+    """Cumulative adjustment curve of a security, breakpoints sorted by effective time."""
+
+    ref_data_uuid: str = Field(description="Reference data UUID of the security.")
+    breakpoints: list[AdjustmentCurveBreakpoint] = Field(
+        description="Breakpoints of the curve."
+    )
+
+
+class PriceSeries(SQLModel):
+    """Price series of a security, given as columns, to be adjusted for corporate actions."""
+
+    ref_data_uuid: str = Field(description="Reference data UUID of the security.")
+    timestamps: list[int] = Field(
+        description="Times the prices were observed at, in microseconds since 1970-01-01, in any order."
+    )
+    prices: list[float] = Field(description="Prices, one per timestamp.")
+    end: NaiveDatetime | None = Field(
+        None,
+        description="Time of the basis to adjust to, defaults to after all corporate actions.",
+    )
+
+    @model_validator(mode="after")
+    def check_columns_length(self) -> Self:
+        if len(self.timestamps) != len(self.prices):
+            raise ValueError("Expected as many prices as timestamps.")
+        return self
+
+
+class AdjustedPriceSeries(SQLModel):
+    """Price series of a security, adjusted for corporate actions."""
+
+    ref_data_uuid: str = Field(description="Reference data UUID of the security.")
+    end: NaiveDatetime = Field(
+        description="Time of the basis the prices are adjusted to."
+    )
+    prices: list[float] = Field(description="Adjusted prices, in input order.")
@@ -0,0 +1,17 @@
+import datetime
+
+from pydantic import BaseModel, Field
+
+
+class SnapshotInfo(BaseModel):
+    """Description of a point-in-time universe snapshot file."""
+
+    as_of: datetime.date = Field(
+        description="Date the snapshot holds the symbols valid at (from its start)."
+    )
+    row_count: int = Field(description="Number of symbols in the snapshot.")
+    change_sequence: int = Field(
+        description="Global change sequence the snapshot was generated at, it is regenerated once a symbol changed "
+        "after it."
+    )
+    size: int = Field(description="Size of the snapshot file, in bytes.")
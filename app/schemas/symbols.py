@@ -1,7 +1,8 @@
-from typing import TypeAlias
+from enum import StrEnum
+from typing import Self, TypeAlias
 
 from pydantic import NaiveDatetime, model_validator, BaseModel
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index
 from sqlmodel import SQLModel, Field
 
 from app.constants import LOWEST_DATETIME, HIGHEST_DATETIME
@@ -35,6 +36,25 @@ class SymbologySymbolSpec(SQLModel):
 
 
 class SymbologySymbolDb(SymbologySymbolSpec, table=True):
+    __table_args__ = (
+        # covers symbol resolution, i.e. (symbology, symbol) pair valid at a given time, without reading the table
+        Index(
+            "ix_symbologysymboldb_symbology_symbol_time",
+            "symbology",
+            "symbol",
+            "start_time",
+            "end_time",
+            "ref_data_uuid",
+        ),
+        # used to retrieve all symbols of a security, ordered as expected when grouping them into public objects
+        Index(
+            "ix_symbologysymboldb_ref_data_uuid",
+            "ref_data_uuid",
+            "symbology",
+            "start_time",
+        ),
+    )
+
     ref_data_uuid: str | None = Field(
         default_factory=generate_ref_data_uuid,
         primary_key=True,
@@ -58,8 +78,11 @@ class SymbologySymbolCreate(SQLModel):
 class SymbologySymbolPublic(SymbologySymbolCreate):
     """Public representation of the Symbology Symbol."""
 
-    ref_data_uuid: str = Field(
-        description="Reference data UUID that has been assigned to a security."
+    ref_data_uuid: str | None = Field(
+        description=(
+            "Reference data UUID that has been assigned to a security, null if it could not be determined for an "
+            "item of a creation request."
+        )
     )
     message: str | None = Field(
         None, description="Message related to the new symbol creation."
@@ -76,3 +99,64 @@ class SymbolsToQuery(BaseModel):
     symbol: str
     start_time: NaiveDatetime
     end_time: NaiveDatetime
+
+
+class SymbolToResolve(BaseModel):
+    """Single point-in-time lookup key."""
+
+    symbology: str = Field(description="Symbology name")
+    symbol: str = Field(description="Symbol identifier")
+    as_of: NaiveDatetime = Field(description="Point in time the symbol is resolved at.")
+
+
+class SymbolsResolveRequest(BaseModel):
+    """Point-in-time lookup keys, either as a list of keys, or as columnar arrays of equal length."""
+
+    keys: list[SymbolToResolve] | None = Field(
+        None, description="Lookup keys, mutually exclusive with columnar arrays."
+    )
+    symbology: list[str] | None = Field(None, description="Symbology of each key.")
+    symbol: list[str] | None = Field(None, description="Symbol of each key.")
+    as_of: list[NaiveDatetime] | None = Field(
+        None, description="Point in time of each key."
+    )
+
+    @model_validator(mode="after")
+    def check_keys_or_columns(self) -> Self:
+        columns = (self.symbology, self.symbol, self.as_of)
+        if self.keys is not None:
+            if any(column is not None for column in columns):
+                raise ValueError("Expected keys or columnar arrays but not both.")
+        elif any(column is None for column in columns):
+            raise ValueError(
+                "Expected keys, or all of symbology, symbol and as_of arrays."
+            )
+        elif not len(self.symbology) == len(self.symbol) == len(self.as_of):
+            raise ValueError(
+                "Columnar arrays symbology, symbol and as_of should have equal length."
+            )
+        return self
+
+    def to_tuples(self) -> list[tuple[str, str, NaiveDatetime]]:
+        """Lookup keys as (symbology, symbol, as_of) tuples, in input order."""
+        if self.keys is not None:
+            return [(key.symbology, key.symbol, key.as_of) for key in self.keys]
+        return list(zip(self.symbology, self.symbol, self.as_of))
+
+
+class SymbolResolveStatus(StrEnum):
+    FOUND = "FOUND"
+    NOT_FOUND = "NOT_FOUND"
+    AMBIGUOUS = "AMBIGUOUS"
+
+
+class SymbolResolveResult(BaseModel):
+    """Result of a single point-in-time lookup."""
+
+    status: SymbolResolveStatus = Field(description="Outcome of the lookup.")
+    ref_data_uuid: str | None = Field(
+        None, description="Reference data UUID, only set if exactly one was found."
+    )
+    candidates: list[str] | None = Field(
+        None, description="All reference data UUIDs found, only set if ambiguous."
+    )
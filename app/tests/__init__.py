@@ -1,3 +1,4 @@
 from typing import Final
 
 TEST_SYMBOLOGY: Final[str] = "TEST_SYMBOLOGY"
+ADMIN_TOKEN: Final[str] = "admin-token"
@@ -1,26 +1,43 @@
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, StaticPool
+from sqlalchemy import create_engine, NullPool, StaticPool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from . import TEST_SYMBOLOGY
+from . import ADMIN_TOKEN, TEST_SYMBOLOGY
+from ..config import get_settings
 from ..main import app
-from ..dependencies import get_session
+from ..dependencies import (
+    get_adjustment_curves,
+    get_async_engine,
+    get_async_session,
+    get_session,
+    get_symbol_resolver,
+    get_symbol_response_cache,
+    service_metrics,
+)
+from ..internal.adjustment_curves import AdjustmentCurveCache
+from ..internal.response_cache import SymbolResponseCache
+from ..internal.symbol_resolver import SymbolResolver
 
 
 @pytest.fixture(name="session")
-def session_fixture():
+def session_fixture(tmp_path: Path):
     """
-    Pytest fixture to create an in-memory SQLite database session.
+    Pytest fixture to create a temporary SQLite database session.
 
-    This fixture sets up an in-memory SQLite database using SQLAlchemy and SQLModel,
-    and provides a session for use in tests.
+    This fixture sets up a SQLite database in a temporary file using SQLAlchemy and SQLModel,
+    and provides a session for use in tests. A file is used rather than an in-memory database,
+    so the async engine can connect to the same database.
 
     Yields:
-        Session: A SQLModel session connected to the in-memory SQLite database.
+        Session: A SQLModel session connected to the temporary SQLite database.
     """
     engine = create_engine(
-        "sqlite://",
+        f"sqlite:///{tmp_path / 'database.db'}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         echo=True,
@@ -30,16 +47,38 @@ def session_fixture():
         yield session
 
 
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(session: Session) -> AsyncEngine:
+    """
+    Pytest fixture to create an async engine connected to the database of the session fixture.
+
+    Connections are not pooled, as the TestClient runs each request in its own event loop,
+    and aiosqlite connections cannot be shared between event loops.
+
+    Returns:
+        AsyncEngine: An async engine connected to the temporary SQLite database.
+    """
+    return create_async_engine(
+        session.get_bind().url.set(drivername="sqlite+aiosqlite"),
+        poolclass=NullPool,
+        echo=True,
+    )
+
+
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(session: Session, async_engine: AsyncEngine):
     """
     Pytest fixture to create a FastAPI TestClient with a database session override.
 
     This fixture sets up a FastAPI TestClient and overrides the `get_session` dependency
-    to use the provided session fixture.
+    to use the provided session fixture, the `get_async_session` and `get_async_engine` dependencies
+    to use the async engine fixture, the `get_symbol_resolver` dependency to use a resolver
+    loaded from this session, and the `get_adjustment_curves` and `get_symbol_response_cache` dependencies
+    to use empty caches.
 
     Args:
         session (Session): The SQLModel session provided by the session_fixture.
+        async_engine (AsyncEngine): The async engine provided by the async_engine_fixture.
 
     Yields:
         TestClient: A FastAPI TestClient with the session dependency overridden.
@@ -48,13 +87,52 @@ def client_fixture(session: Session):
     def get_session_override():
         return session
 
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
+    # fresh resolver, so symbols created by other tests are not visible
+    resolver = SymbolResolver()
+    resolver.load(session)
+
+    def get_symbol_resolver_override():
+        return resolver
+
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_async_engine] = lambda: async_engine
+    app.dependency_overrides[get_symbol_resolver] = get_symbol_resolver_override
+
+    # fresh cache, so curves of other test databases are not visible
+    adjustment_curves = AdjustmentCurveCache(max_curves=100)
+    app.dependency_overrides[get_adjustment_curves] = lambda: adjustment_curves
+    symbol_response_cache = SymbolResponseCache(max_entries=100, ttl_seconds=60.0)
+    app.dependency_overrides[get_symbol_response_cache] = lambda: symbol_response_cache
 
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(name="metrics")
+def metrics_fixture(session: Session, async_engine: AsyncEngine):
+    """
+    Pytest fixture instrumenting the engines of the test database with the metrics of the application.
+
+    Metrics are those recorded by the middleware, and by the statement observers, e.g. the slow query log, so tests
+    compare them before and after their requests.
+
+    Yields:
+        ServiceMetrics: The metrics of the application.
+    """
+    engines = (session.get_bind(), async_engine.sync_engine)
+    for engine in engines:
+        service_metrics.instrument_engine(engine)
+    yield service_metrics
+    for engine in engines:
+        service_metrics.uninstrument_engine(engine)
+
+
 @pytest.fixture
 def new_symbol_ref_data_uuid(client: TestClient) -> str:
     spec = [
@@ -71,3 +149,15 @@ def new_symbol_ref_data_uuid(client: TestClient) -> str:
 
     response = client.post("/symbols/", json=spec)
     return response.json()[0]["ref_data_uuid"]
+
+
+@pytest.fixture(name="admin_headers")
+def admin_headers_fixture(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """
+    Pytest fixture setting the admin token of the application, which the admin endpoints require.
+
+    Returns:
+        dict[str, str]: The headers authorizing a request to the admin endpoints.
+    """
+    monkeypatch.setattr(get_settings(), "admin_token", ADMIN_TOKEN)
+    return {"Authorization": f"Bearer {ADMIN_TOKEN}"}
@@ -0,0 +1,194 @@
+import datetime
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.internal.adjustment_curves import (
+    AdjustmentBreakpoint,
+    AdjustmentCurve,
+    AdjustmentCurveCache,
+)
+from app.internal.change_log import record_changes
+from app.internal.snapshots import datetime_to_epoch_us
+from app.schemas.changes import ChangeEntity, ChangeOperation
+from app.schemas.corp_actions import CorpActionDb, CorpActionsTypes
+
+
+def day(n: int) -> datetime.datetime:
+    return datetime.datetime(2025, 1, 1) + datetime.timedelta(days=n)
+
+
+def add_corp_action(session: Session, ref_data_uuid: str, n: int) -> None:
+    corp_action = CorpActionDb(
+        ref_data_uuid=ref_data_uuid,
+        effective_time=day(n),
+        action_type=CorpActionsTypes.STOCK_SPLIT,
+        multiplicative_adjustment=0.5,
+    )
+    session.add(corp_action)
+    record_changes(
+        session=session,
+        entity=ChangeEntity.CORP_ACTION,
+        operation=ChangeOperation.CREATE,
+        rows=[corp_action.model_dump()],
+    )
+    session.commit()
+
+
+def capture_statements(session: Session) -> list[str]:
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", capture)
+    return statements
+
+
+def apply_one_by_one(
+    breakpoints: list[AdjustmentBreakpoint],
+    price: float,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> float:
+    for breakpoint in sorted(breakpoints):
+        if start < breakpoint.effective_time <= end:
+            price = price * breakpoint.multiplicative + breakpoint.additive
+    return price
+
+
+def test_factor_matches_adjustments_applied_one_by_one() -> None:
+    generator = random.Random(42)
+    breakpoints = [
+        AdjustmentBreakpoint(
+            effective_time=day(n),
+            multiplicative=generator.choice([0.5, 1.0, 2.0, 0.1]),
+            additive=generator.choice([0.0, -0.25, 1.5]),
+        )
+        for n in generator.sample(range(100), 30)
+    ]
+    curve = AdjustmentCurve(breakpoints)
+
+    for _ in range(200):
+        start, end = sorted(day(generator.randrange(-5, 105)) for _ in range(2))
+        adjustment = curve.factor(start, end)
+        assert 100 * adjustment.multiplicative + adjustment.additive == pytest.approx(
+            apply_one_by_one(breakpoints, 100, start, end)
+        )
+
+
+def test_window_bounds() -> None:
+    curve = AdjustmentCurve(
+        [
+            AdjustmentBreakpoint(day(1), multiplicative=0.5, additive=0.0),
+            AdjustmentBreakpoint(day(2), multiplicative=1.0, additive=-1.0),
+        ]
+    )
+
+    # prices observed at the effective time are already on the new basis
+    assert curve.factor(day(1), day(2)) == (1.0, -1.0)
+    assert curve.factor(day(0), day(1)) == (0.5, 0.0)
+    assert curve.factor(day(0), day(2)) == (0.5, -1.0)
+    assert curve.factor(day(3), day(4)) == (1.0, 0.0)
+
+
+def test_with_breakpoints_inserts_in_order_and_replaces_existing() -> None:
+    curve = AdjustmentCurve([AdjustmentBreakpoint(day(2), 0.5, 0.0)])
+
+    updated = curve.with_breakpoints(
+        [
+            AdjustmentBreakpoint(day(1), 0.25, 0.0),
+            AdjustmentBreakpoint(day(2), 0.5, 0.0),
+        ]
+    )
+
+    assert len(curve) == 1, "Curves should not be updated in place."
+    assert updated.effective_times == (day(1), day(2))
+    assert updated.cumulative_multiplicative == (1.0, 0.25, 0.125)
+
+
+def test_adjust_prices_matches_factor() -> None:
+    generator = random.Random(7)
+    curve = AdjustmentCurve(
+        AdjustmentBreakpoint(
+            effective_time=day(n),
+            multiplicative=generator.choice([0.5, 2.0, 0.1]),
+            additive=generator.choice([0.0, -0.25]),
+        )
+        for n in generator.sample(range(100), 20)
+    )
+    # unsorted, including prices observed at effective times
+    times = [day(generator.randrange(-5, 90)) for _ in range(500)]
+    prices = [generator.uniform(1, 100) for _ in times]
+    end = day(90)
+
+    adjusted = curve.adjust_prices(
+        np.array([datetime_to_epoch_us(time) for time in times], dtype=np.int64),
+        np.array(prices),
+        end,
+    )
+
+    expected = [
+        price * curve.factor(time, end).multiplicative
+        + curve.factor(time, end).additive
+        for time, price in zip(times, prices)
+    ]
+    assert adjusted.tolist() == pytest.approx(expected)
+
+
+def test_adjust_prices_without_breakpoints() -> None:
+    prices = np.array([1.0, 2.0])
+    adjusted = AdjustmentCurve([]).adjust_prices(
+        np.array([0, 1], dtype=np.int64), prices, day(0)
+    )
+    assert adjusted.tolist() == [1.0, 2.0]
+    assert adjusted is not prices
+
+
+def test_cache_only_reads_change_log_once_it_grew(session: Session) -> None:
+    cache = AdjustmentCurveCache(max_curves=10)
+    add_corp_action(session, "ref-1", 0)
+    assert cache.get(session, "ref-1").effective_times == (day(0),)
+
+    statements = capture_statements(session)
+    assert cache.get(session, "ref-1").effective_times == (day(0),)
+    assert len(statements) == 1, (
+        f"Should only read the change sequence, got {statements}."
+    )
+    assert "payload" not in statements[0]
+
+    add_corp_action(session, "ref-1", 1)
+    statements.clear()
+    assert cache.get(session, "ref-1").effective_times == (day(0), day(1))
+    assert len(statements) == 2, (
+        f"Should read the change sequence, then the changes, got {statements}."
+    )
+
+
+def test_cache_evicts_least_recently_used_curve(session: Session) -> None:
+    cache = AdjustmentCurveCache(max_curves=2)
+    for ref_data_uuid in ("ref-1", "ref-2", "ref-3"):
+        add_corp_action(session, ref_data_uuid, 0)
+
+    cache.get(session, "ref-1")
+    cache.get(session, "ref-2")
+    cache.get(session, "ref-1")
+    cache.get(session, "ref-3")
+    assert len(cache) == 2
+
+    # ref-2 was evicted, changes made to it since are read with its curve
+    add_corp_action(session, "ref-2", 1)
+    statements = capture_statements(session)
+    assert cache.get(session, "ref-2").effective_times == (day(0), day(1))
+    assert len(statements) == 3, (
+        f"Should read the change sequence, the changes and the curve, got {statements}."
+    )
+
+    statements.clear()
+    cache.get(session, "ref-2")
+    assert len(statements) == 1, (
+        f"Should only read the change sequence, got {statements}."
+    )
@@ -0,0 +1,80 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.config import Settings
+from app.db import create_async_engine_from_settings, create_engine_from_settings
+
+
+@pytest.fixture(name="settings")
+def settings_fixture(tmp_path: Path) -> Settings:
+    return Settings(
+        database_url=f"sqlite:///{tmp_path / 'database.db'}",
+        sqlite_mmap_size=1024 * 1024,
+        sqlite_cache_size=-2048,
+        sqlite_busy_timeout=1234,
+    )
+
+
+EXPECTED_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": 1,  # NORMAL
+    "mmap_size": 1024 * 1024,
+    "cache_size": -2048,
+    "busy_timeout": 1234,
+}
+
+
+class TestSettings:
+    def test_settings_read_from_environment(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("SYMBOL_META_DATABASE_URL", "sqlite:////data/symbols.db")
+        monkeypatch.setenv("SYMBOL_META_DATABASE_POOL_SIZE", "20")
+        monkeypatch.setenv("SYMBOL_META_SQLITE_SYNCHRONOUS", "FULL")
+
+        settings = Settings()
+
+        assert settings.database_url == "sqlite:////data/symbols.db"
+        assert settings.database_pool_size == 20
+        assert settings.sqlite_synchronous == "FULL"
+        assert settings.database_echo is False
+
+
+class TestEngines:
+    def test_sqlite_pragmas_applied_on_connect(self, settings: Settings) -> None:
+        engine = create_engine_from_settings(settings)
+
+        with engine.connect() as connection:
+            pragmas = {
+                name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in EXPECTED_PRAGMAS
+            }
+
+        assert pragmas == EXPECTED_PRAGMAS
+        assert engine.pool.size() == settings.database_pool_size
+
+    def test_sqlite_pragmas_applied_on_connect_of_async_engine(
+        self, settings: Settings
+    ) -> None:
+        async_engine = create_async_engine_from_settings(settings)
+
+        async def read_pragmas() -> dict:
+            async with async_engine.connect() as connection:
+                pragmas = {
+                    name: (await connection.execute(text(f"PRAGMA {name}"))).scalar()
+                    for name in EXPECTED_PRAGMAS
+                }
+            await async_engine.dispose()
+            return pragmas
+
+        assert async_engine.url.drivername == "sqlite+aiosqlite"
+        assert asyncio.run(read_pragmas()) == EXPECTED_PRAGMAS
+
+    def test_in_memory_database_without_pool_options(self) -> None:
+        engine = create_engine_from_settings(Settings(database_url="sqlite://"))
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
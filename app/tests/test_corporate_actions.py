@@ -1,14 +1,30 @@
 import datetime
+import io
+import json
 
+import pytest
+
+from sqlalchemy import event
 from starlette.status import (
+    HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
     HTTP_201_CREATED,
+    HTTP_207_MULTI_STATUS,
     HTTP_422_UNPROCESSABLE_ENTITY,
     HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
 )
+from sqlmodel import Session
 from starlette.testclient import TestClient
 
 from app.constants import LOWEST_DATETIME
+from app.internal.change_log import record_changes
+from app.internal.formats import ARROW_STREAM_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from app.internal.pagination import NEXT_CURSOR_HEADER
+from app.internal.snapshots import datetime_to_epoch_us
+from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation
+from app.tests import TEST_SYMBOLOGY
 
 
 def test_get_all_corp_actions_returns_empty_list(client: TestClient) -> None:
@@ -17,6 +33,30 @@ def test_get_all_corp_actions_returns_empty_list(client: TestClient) -> None:
     assert response.json() == []
 
 
+def test_get_all_corp_actions_not_modified(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    etag = client.get("/corpActions/").headers["ETag"]
+
+    response = client.get("/corpActions/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    client.post(
+        "/corpActions/",
+        json={
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "DIVIDEND",
+            "effective_time": datetime.datetime(2025, 1, 1).isoformat(),
+        },
+    )
+
+    response = client.get("/corpActions/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 1
+
+
 def test_create_corp_action_given_ref_data_uuid(
     client: TestClient, new_symbol_ref_data_uuid: str
 ) -> None:
@@ -35,6 +75,57 @@ def test_create_corp_action_given_ref_data_uuid(
     assert response.json()[0]["effective_time"] == corp_action["effective_time"]
 
 
+def test_create_corp_action_given_symbology_and_symbol(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    corp_action = {
+        "symbology": TEST_SYMBOLOGY,
+        "symbol": "EURUSD",
+        "action_type": "DIVIDEND",
+        "effective_time": datetime.datetime.now().isoformat(),
+        "additive_adjustment": -0.5,
+    }
+
+    response = client.post("/corpActions/", json=corp_action)
+    assert response.status_code == HTTP_201_CREATED
+    assert response.json()[0]["ref_data_uuid"] == new_symbol_ref_data_uuid
+
+
+def test_create_corp_action_given_symbol_created_by_another_worker(
+    client: TestClient, session: Session
+) -> None:
+    # symbol committed directly to the database is unknown to the in-memory resolver
+    session.add(
+        SymbologySymbolDb(
+            symbol="GBPUSD", symbology=TEST_SYMBOLOGY, ref_data_uuid="ref-other-worker"
+        )
+    )
+    session.commit()
+
+    corp_action = {
+        "symbology": TEST_SYMBOLOGY,
+        "symbol": "GBPUSD",
+        "action_type": "DIVIDEND",
+        "effective_time": datetime.datetime.now().isoformat(),
+    }
+
+    response = client.post("/corpActions/", json=corp_action)
+    assert response.status_code == HTTP_201_CREATED
+    assert response.json()[0]["ref_data_uuid"] == "ref-other-worker"
+
+
+def test_create_corp_action_given_unknown_symbol(client: TestClient) -> None:
+    corp_action = {
+        "symbology": TEST_SYMBOLOGY,
+        "symbol": "DOES_NOT_EXIST",
+        "action_type": "DIVIDEND",
+        "effective_time": datetime.datetime.now().isoformat(),
+    }
+
+    response = client.post("/corpActions/", json=corp_action)
+    assert response.json()[0]["error"]
+
+
 def test_create_corp_action_with_invalid_date(
     client: TestClient, new_symbol_ref_data_uuid: str
 ) -> None:
@@ -62,3 +153,613 @@ def test_create_corp_action_on_ref_data_uuid_that_does_not_exist(
     response = client.post("/corpActions/", json=corp_action)
     assert response.status_code == HTTP_404_NOT_FOUND
     assert response.json()[0]["error"]
+
+
+def test_get_all_corp_actions_in_pages(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    for day in range(1, 6):
+        corp_action = {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "DIVIDEND" if day % 2 else "STOCK_SPLIT",
+            "effective_time": datetime.datetime(2025, 1, day).isoformat(),
+        }
+        client.post("/corpActions/", json=corp_action)
+
+    response = client.get("/corpActions/", params={"limit": 3})
+    assert response.status_code == HTTP_200_OK
+    assert len(response.json()) == 3
+
+    response = client.get(
+        "/corpActions/",
+        params={"limit": 3, "cursor": response.headers[NEXT_CURSOR_HEADER]},
+    )
+    assert [x["effective_time"] for x in response.json()] == [
+        "2025-01-04T00:00:00",
+        "2025-01-05T00:00:00",
+    ]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+    response = client.get(
+        "/corpActions/",
+        params={
+            "action_type": "DIVIDEND",
+            "effective_from": "2025-01-02T00:00:00",
+            "effective_to": "2025-01-04T00:00:00",
+        },
+    )
+    assert [x["effective_time"] for x in response.json()] == ["2025-01-03T00:00:00"]
+
+
+def test_export_corp_actions(client: TestClient, new_symbol_ref_data_uuid: str) -> None:
+    for day in range(1, 4):
+        corp_action = {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "DIVIDEND",
+            "effective_time": datetime.datetime(2025, 1, day).isoformat(),
+        }
+        client.post("/corpActions/", json=corp_action)
+
+    response = client.get("/corpActions/export")
+    assert response.status_code == HTTP_200_OK
+
+    lines = [json.loads(line) for line in response.iter_lines()]
+    assert [x["effective_time"] for x in lines] == [
+        "2025-01-01T00:00:00",
+        "2025-01-02T00:00:00",
+        "2025-01-03T00:00:00",
+    ]
+
+
+def test_get_all_corp_actions_as_arrow(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    pa = pytest.importorskip("pyarrow")
+    for day, action_type in ((1, "DIVIDEND"), (2, "STOCK_SPLIT"), (3, "DIVIDEND")):
+        corp_action = {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": action_type,
+            "effective_time": datetime.datetime(2025, 1, day).isoformat(),
+            "multiplicative_adjustment": 0.5,
+        }
+        client.post("/corpActions/", json=corp_action)
+
+    headers = {"Accept": ARROW_STREAM_MEDIA_TYPE}
+    response = client.get("/corpActions/", params={"limit": 2}, headers=headers)
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    assert NEXT_CURSOR_HEADER in response.headers
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("action_type").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.column("action_type").to_pylist() == ["DIVIDEND", "STOCK_SPLIT"]
+    assert table.column("effective_time").to_pylist() == [
+        datetime.datetime(2025, 1, 1),
+        datetime.datetime(2025, 1, 2),
+    ]
+    assert table.column("multiplicative_adjustment").to_pylist() == [0.5, 0.5]
+
+
+def test_export_corp_actions_as_arrow_and_msgpack(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    pa = pytest.importorskip("pyarrow")
+    msgpack = pytest.importorskip("msgpack")
+    for day in range(1, 4):
+        corp_action = {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "DIVIDEND",
+            "effective_time": datetime.datetime(2025, 1, day).isoformat(),
+        }
+        client.post("/corpActions/", json=corp_action)
+
+    response = client.get(
+        "/corpActions/export", headers={"Accept": ARROW_STREAM_MEDIA_TYPE}
+    )
+    assert response.status_code == HTTP_200_OK
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("ref_data_uuid").to_pylist() == [new_symbol_ref_data_uuid] * 3
+
+    response = client.get("/corpActions/export", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    documents = list(msgpack.Unpacker(io.BytesIO(response.content)))
+    lines = [
+        json.loads(line) for line in client.get("/corpActions/export").iter_lines()
+    ]
+    assert documents == lines
+
+
+def test_create_corp_actions_batch(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    effective_time = datetime.datetime(2025, 1, 1).isoformat()
+    corp_actions = [
+        {
+            "symbology": TEST_SYMBOLOGY,
+            "symbol": "EURUSD",
+            "action_type": "DIVIDEND",
+            "effective_time": effective_time,
+            "additive_adjustment": -0.5,
+        },
+        {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "STOCK_SPLIT",
+            "effective_time": datetime.datetime(2025, 1, 2).isoformat(),
+            "multiplicative_adjustment": 0.5,
+        },
+        {
+            "symbology": TEST_SYMBOLOGY,
+            "symbol": "DOES_NOT_EXIST",
+            "action_type": "DIVIDEND",
+            "effective_time": effective_time,
+        },
+        {
+            # same security and effective time as the first item
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "DIVIDEND",
+            "effective_time": effective_time,
+        },
+    ]
+
+    response = client.post("/corpActions/batch", json=corp_actions)
+    assert response.status_code == HTTP_207_MULTI_STATUS
+
+    first, second, unknown, duplicate = response.json()
+    assert first["error"] is None
+    assert [x["ref_data_uuid"] for x in first["created"]] == [new_symbol_ref_data_uuid]
+    assert first["created"][0]["additive_adjustment"] == -0.5
+    assert first["created"][0]["effective_time"] == effective_time
+    assert second["created"][0]["multiplicative_adjustment"] == 0.5
+    assert unknown["created"] == [] and unknown["error"].startswith("No symbol found")
+    assert duplicate["created"] == [] and "already exists" in duplicate["error"]
+
+    response = client.get("/corpActions/")
+    assert len(response.json()) == 2
+
+    response = client.post("/corpActions/batch", json=corp_actions[:2])
+    assert response.status_code == HTTP_400_BAD_REQUEST, (
+        "Corporate actions already in the database should be rejected."
+    )
+
+
+def test_create_corp_actions_batch_uses_constant_number_of_queries(
+    client: TestClient, session: Session
+) -> None:
+    # symbols committed directly to the database are unknown to the in-memory resolver
+    session.add_all(
+        SymbologySymbolDb(
+            symbol=f"SYMBOL_{i}", symbology=TEST_SYMBOLOGY, ref_data_uuid=f"ref-{i}"
+        )
+        for i in range(200)
+    )
+    session.commit()
+
+    corp_actions = [
+        {
+            "symbology": TEST_SYMBOLOGY,
+            "symbol": f"SYMBOL_{i}",
+            "action_type": "DIVIDEND",
+            "effective_time": datetime.datetime(2025, 1, 1).isoformat(),
+        }
+        for i in range(200)
+    ] + [
+        {
+            "ref_data_uuid": f"ref-{i}",
+            "action_type": "DIVIDEND",
+            "effective_time": datetime.datetime(2025, 1, 2).isoformat(),
+        }
+        for i in range(200)
+    ]
+
+    statements: list[str] = []
+
+    def count_statements(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", count_statements)
+    try:
+        response = client.post("/corpActions/batch", json=corp_actions)
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", count_statements)
+
+    assert response.status_code == HTTP_201_CREATED
+    assert len(statements) == 7, (
+        "Should catch the resolver up, resolve symbols, check ref_data_uuids, check existing corporate actions, "
+        "insert in bulk, append to the change log and read its last sequence, got "
+        f"{statements}."
+    )
+
+
+def test_create_corp_actions_batch_given_symbol_known_to_resolver_written_by_another_worker(
+    client: TestClient, session: Session, new_symbol_ref_data_uuid: str
+) -> None:
+    corp_action = {
+        "symbology": TEST_SYMBOLOGY,
+        "symbol": "EURUSD",
+        "action_type": "DIVIDEND",
+        "effective_time": datetime.datetime(2025, 1, 1).isoformat(),
+    }
+    response = client.post("/corpActions/batch", json=[corp_action])
+    assert [x["ref_data_uuid"] for x in response.json()[0]["created"]] == [
+        new_symbol_ref_data_uuid
+    ]
+
+    # a pair the resolver of this worker already knows, written without going through this worker
+    row = SymbologySymbolDb(
+        symbol="EURUSD", symbology=TEST_SYMBOLOGY, ref_data_uuid="ref-other-worker"
+    )
+    session.add(row)
+    record_changes(
+        session=session,
+        entity=ChangeEntity.SYMBOL,
+        operation=ChangeOperation.CREATE,
+        rows=[row.model_dump()],
+    )
+    session.commit()
+
+    corp_action["effective_time"] = datetime.datetime(2025, 1, 2).isoformat()
+    response = client.post("/corpActions/batch", json=[corp_action])
+    assert sorted(x["ref_data_uuid"] for x in response.json()[0]["created"]) == sorted(
+        [new_symbol_ref_data_uuid, "ref-other-worker"]
+    )
+
+
+def test_get_corp_action_changes(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    response = client.get("/corpActions/changes")
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == {"changes": [], "next_since": 0, "has_more": False}, (
+        "Symbol creation should not be reported as a corporate action change."
+    )
+
+    client.post(
+        "/corpActions/batch",
+        json=[
+            {
+                "ref_data_uuid": new_symbol_ref_data_uuid,
+                "action_type": "DIVIDEND",
+                "effective_time": datetime.datetime(2025, 1, day).isoformat(),
+            }
+            for day in (1, 2)
+        ],
+    )
+
+    response = client.get("/corpActions/changes", params={"limit": 1})
+    page = response.json()
+    assert page["has_more"]
+    ((change,),) = [page["changes"]]
+    assert change["entity"] == "CORP_ACTION"
+    assert change["operation"] == "CREATE"
+    assert change["ref_data_uuid"] == new_symbol_ref_data_uuid
+    assert change["payload"]["effective_time"] == "2025-01-01T00:00:00"
+
+    response = client.get("/corpActions/changes", params={"since": page["next_since"]})
+    page = response.json()
+    assert not page["has_more"]
+    assert [change["payload"]["effective_time"] for change in page["changes"]] == [
+        "2025-01-02T00:00:00"
+    ]
+
+
+def test_get_adjustment_factor(
+    client: TestClient, session: Session, new_symbol_ref_data_uuid: str
+) -> None:
+    def post_corp_action(effective_time: datetime.datetime, **adjustments) -> None:
+        response = client.post(
+            "/corpActions/batch",
+            json=[
+                {
+                    "ref_data_uuid": new_symbol_ref_data_uuid,
+                    "action_type": "STOCK_SPLIT",
+                    "effective_time": effective_time.isoformat(),
+                    **adjustments,
+                }
+            ],
+        )
+        assert response.status_code == HTTP_201_CREATED
+
+    post_corp_action(datetime.datetime(2025, 1, 1), multiplicative_adjustment=0.5)
+
+    url = f"/corpActions/{new_symbol_ref_data_uuid}/adjustment"
+    response = client.get(url, params={"start": "2024-06-01T00:00:00"})
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["multiplicative"] == 0.5
+    assert response.json()["additive"] == 0.0
+    assert response.json()["corp_action_count"] == 1
+
+    # the cached curve is updated from the change log
+    post_corp_action(datetime.datetime(2025, 3, 1), additive_adjustment=-1.0)
+    post_corp_action(datetime.datetime(2024, 1, 1), multiplicative_adjustment=0.1)
+
+    response = client.get(url, params={"start": "2024-06-01T00:00:00"})
+    assert response.json()["multiplicative"] == 0.5
+    assert response.json()["additive"] == -1.0
+    assert response.json()["corp_action_count"] == 2
+
+    response = client.get(
+        url, params={"start": "2023-01-01T00:00:00", "end": "2025-01-01T00:00:00"}
+    )
+    assert response.json()["multiplicative"] == pytest.approx(0.05)
+    assert response.json()["corp_action_count"] == 2
+
+    response = client.get(f"/corpActions/{new_symbol_ref_data_uuid}/adjustmentCurve")
+    assert [
+        (breakpoint["effective_time"], breakpoint["cumulative_multiplicative"])
+        for breakpoint in response.json()["breakpoints"]
+    ] == [
+        ("2024-01-01T00:00:00", 0.1),
+        ("2025-01-01T00:00:00", pytest.approx(0.05)),
+        ("2025-03-01T00:00:00", pytest.approx(0.05)),
+    ]
+
+
+def test_get_adjustment_factor_with_invalid_window(client: TestClient) -> None:
+    response = client.get(
+        "/corpActions/ref-1/adjustment",
+        params={"start": "2025-01-02T00:00:00", "end": "2025-01-01T00:00:00"},
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+def test_create_corp_action_with_zero_multiplicative_adjustment(
+    client: TestClient, new_symbol_ref_data_uuid: str
+) -> None:
+    response = client.post(
+        "/corpActions/",
+        json={
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "action_type": "STOCK_SPLIT",
+            "effective_time": datetime.datetime(2025, 1, 1).isoformat(),
+            "multiplicative_adjustment": 0,
+        },
+    )
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_adjust_price_series(client: TestClient, new_symbol_ref_data_uuid: str) -> None:
+    response = client.post(
+        "/corpActions/batch",
+        json=[
+            {
+                "ref_data_uuid": new_symbol_ref_data_uuid,
+                "action_type": action_type,
+                "effective_time": effective_time.isoformat(),
+                **adjustments,
+            }
+            for action_type, effective_time, adjustments in (
+                (
+                    "STOCK_SPLIT",
+                    datetime.datetime(2025, 1, 1),
+                    {"multiplicative_adjustment": 0.5},
+                ),
+                (
+                    "DIVIDEND",
+                    datetime.datetime(2025, 3, 1),
+                    {"additive_adjustment": -1.0},
+                ),
+            )
+        ],
+    )
+    assert response.status_code == HTTP_201_CREATED
+
+    timestamps = [
+        datetime_to_epoch_us(datetime.datetime(*date))
+        for date in ((2025, 4, 1), (2024, 12, 1), (2025, 1, 1), (2025, 2, 1))
+    ]
+    response = client.post(
+        "/corpActions/adjust",
+        json=[
+            {
+                "ref_data_uuid": new_symbol_ref_data_uuid,
+                "timestamps": timestamps,
+                "prices": [10.0, 10.0, 10.0, 10.0],
+            },
+            {
+                "ref_data_uuid": new_symbol_ref_data_uuid,
+                "timestamps": timestamps[1:],
+                "prices": [10.0, 10.0, 10.0],
+                "end": "2025-02-01T00:00:00",
+            },
+            {"ref_data_uuid": "unknown", "timestamps": [0], "prices": [10.0]},
+        ],
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == [
+        {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "end": "2099-12-31T00:00:00",
+            "prices": [10.0, 4.0, 9.0, 9.0],
+        },
+        {
+            "ref_data_uuid": new_symbol_ref_data_uuid,
+            "end": "2025-02-01T00:00:00",
+            "prices": [5.0, 10.0, 10.0],
+        },
+        {"ref_data_uuid": "unknown", "end": "2099-12-31T00:00:00", "prices": [10.0]},
+    ]
+
+
+@pytest.mark.parametrize(
+    "series, status_code",
+    [
+        (
+            {"ref_data_uuid": "ref-1", "timestamps": [0, 1], "prices": [1.0]},
+            HTTP_422_UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {"ref_data_uuid": "ref-1", "timestamps": [2**63], "prices": [1.0]},
+            HTTP_400_BAD_REQUEST,
+        ),
+        (
+            {
+                "ref_data_uuid": "ref-1",
+                "timestamps": [datetime_to_epoch_us(datetime.datetime(2025, 1, 2))],
+                "prices": [1.0],
+                "end": "2025-01-01T00:00:00",
+            },
+            HTTP_400_BAD_REQUEST,
+        ),
+    ],
+)
+def test_adjust_price_series_with_invalid_series(
+    client: TestClient, series: dict, status_code: int
+) -> None:
+    response = client.post("/corpActions/adjust", json=[series])
+    assert response.status_code == status_code
+
+
+@pytest.fixture(name="corp_actions_of_two_securities")
+def corp_actions_of_two_securities_fixture(
+    client: TestClient, session: Session
+) -> tuple[str, str]:
+    """Two securities, the symbol EURUSD being reassigned from the first to the second on 2025-03-01."""
+    session.add_all(
+        [
+            SymbologySymbolDb(
+                ref_data_uuid="ref-1",
+                symbology=TEST_SYMBOLOGY,
+                symbol="EURUSD",
+                start_time=datetime.datetime(2024, 1, 1),
+                end_time=datetime.datetime(2025, 3, 1),
+            ),
+            SymbologySymbolDb(
+                ref_data_uuid="ref-2",
+                symbology=TEST_SYMBOLOGY,
+                symbol="EURUSD",
+                start_time=datetime.datetime(2025, 3, 1, 0, 0, 1),
+            ),
+        ]
+    )
+    session.commit()
+
+    response = client.post(
+        "/corpActions/batch",
+        json=[
+            {
+                "ref_data_uuid": ref_data_uuid,
+                "action_type": action_type,
+                "effective_time": datetime.datetime(*date).isoformat(),
+            }
+            for ref_data_uuid, action_type, date in (
+                ("ref-1", "STOCK_SPLIT", (2025, 1, 6)),
+                ("ref-1", "DIVIDEND", (2025, 1, 7)),
+                # after the symbol has been reassigned
+                ("ref-1", "DIVIDEND", (2025, 6, 1)),
+                ("ref-2", "STOCK_SPLIT", (2025, 1, 6)),
+                ("ref-2", "STOCK_SPLIT", (2025, 6, 2)),
+            )
+        ],
+    )
+    assert response.status_code == HTTP_201_CREATED
+    return "ref-1", "ref-2"
+
+
+def effective_keys(response) -> list[tuple[str, str, str]]:
+    return [
+        (
+            corp_action["ref_data_uuid"],
+            corp_action["effective_time"][:10],
+            corp_action["action_type"],
+        )
+        for corp_action in response.json()
+    ]
+
+
+def test_get_corp_actions_by_ref_data_uuid(
+    client: TestClient, corp_actions_of_two_securities: tuple[str, str]
+) -> None:
+    response = client.get("/corpActions/ref-1")
+    assert response.status_code == HTTP_200_OK
+    assert effective_keys(response) == [
+        ("ref-1", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-1", "2025-01-07", "DIVIDEND"),
+        ("ref-1", "2025-06-01", "DIVIDEND"),
+    ]
+
+    response = client.get(
+        "/corpActions/ref-1",
+        params={"action_type": "DIVIDEND", "effective_to": "2025-03-01T00:00:00"},
+    )
+    assert effective_keys(response) == [("ref-1", "2025-01-07", "DIVIDEND")]
+
+    response = client.get("/corpActions/unknown")
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == []
+
+
+def test_get_corp_actions_by_symbol(
+    client: TestClient, corp_actions_of_two_securities: tuple[str, str]
+) -> None:
+    response = client.get(
+        "/corpActions/bySymbol",
+        params={"symbology": TEST_SYMBOLOGY, "symbol": "EURUSD"},
+    )
+    assert response.status_code == HTTP_200_OK
+    # corporate actions of each security while it had the symbol
+    assert effective_keys(response) == [
+        ("ref-1", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-1", "2025-01-07", "DIVIDEND"),
+        ("ref-2", "2025-06-02", "STOCK_SPLIT"),
+    ]
+
+    response = client.get(
+        "/corpActions/bySymbol",
+        params={
+            "symbology": TEST_SYMBOLOGY,
+            "symbol": "EURUSD",
+            "action_type": "STOCK_SPLIT",
+        },
+    )
+    assert effective_keys(response) == [
+        ("ref-1", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-2", "2025-06-02", "STOCK_SPLIT"),
+    ]
+
+
+def test_get_corp_actions_calendar(
+    client: TestClient, corp_actions_of_two_securities: tuple[str, str]
+) -> None:
+    window = {
+        "effective_from": "2025-01-06T00:00:00",
+        "effective_to": "2025-01-12T23:59:59",
+    }
+    response = client.get("/corpActions/calendar", params=window)
+    assert response.status_code == HTTP_200_OK
+    assert effective_keys(response) == [
+        ("ref-1", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-2", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-1", "2025-01-07", "DIVIDEND"),
+    ]
+
+    response = client.get(
+        "/corpActions/calendar", params={**window, "action_type": "STOCK_SPLIT"}
+    )
+    assert effective_keys(response) == [
+        ("ref-1", "2025-01-06", "STOCK_SPLIT"),
+        ("ref-2", "2025-01-06", "STOCK_SPLIT"),
+    ]
+
+    response = client.get(
+        "/corpActions/calendar",
+        headers={"If-None-Match": response.headers["ETag"]},
+        params=window,
+    )
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+
+def test_get_corp_actions_calendar_requires_valid_window(client: TestClient) -> None:
+    response = client.get(
+        "/corpActions/calendar", params={"effective_from": "2025-01-06T00:00:00"}
+    )
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.get(
+        "/corpActions/calendar",
+        params={
+            "effective_from": "2025-01-06T00:00:00",
+            "effective_to": "2025-01-05T00:00:00",
+        },
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
@@ -0,0 +1,319 @@
+import asyncio
+import datetime
+import json
+import threading
+import time
+
+import httpx
+from starlette.status import HTTP_200_OK
+from starlette.testclient import TestClient
+
+from app.config import Settings, get_settings
+from app.dependencies import get_change_broadcaster
+from app.internal.change_log import record_changes
+from app.internal.change_broadcaster import (
+    SSE_MEDIA_TYPE,
+    ChangeBroadcaster,
+    ChangeSubscription,
+)
+from app.main import app
+from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation
+from app.tests import TEST_SYMBOLOGY
+
+
+def make_change(sequence: int, symbology: str | None = TEST_SYMBOLOGY) -> dict:
+    if symbology is None:
+        entity = ChangeEntity.CORP_ACTION
+        payload = {"ref_data_uuid": f"ref-{sequence}", "action_type": "DIVIDEND"}
+    else:
+        entity = ChangeEntity.SYMBOL
+        payload = {
+            "ref_data_uuid": f"ref-{sequence}",
+            "symbology": symbology,
+            "symbol": f"SYMBOL_{sequence}",
+            "start_time": datetime.datetime(2025, 1, 1),
+        }
+    return {
+        "sequence": sequence,
+        "entity": entity,
+        "operation": ChangeOperation.CREATE,
+        "ref_data_uuid": f"ref-{sequence}",
+        "payload": payload,
+    }
+
+
+def parse_events(stream: str) -> list[dict[str, str]]:
+    events = []
+    for block in stream.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append(fields)
+    return events
+
+
+async def collect_events(
+    subscription: ChangeSubscription, count: int
+) -> list[dict[str, str]]:
+    events: list[dict[str, str]] = []
+    async for event in subscription.iter_events(keepalive_seconds=5):
+        events.extend(parse_events(event.decode()))
+        if len(events) == count:
+            break
+    return events
+
+
+def test_subscription_filters() -> None:
+    async def scenario() -> None:
+        loop = asyncio.get_running_loop()
+        by_symbology = ChangeSubscription(
+            loop=loop, max_pending=10, symbologies=[TEST_SYMBOLOGY]
+        )
+        by_ref_data_uuid = ChangeSubscription(
+            loop=loop, max_pending=10, ref_data_uuids=["ref-2", "ref-3"]
+        )
+        by_entity = ChangeSubscription(
+            loop=loop, max_pending=10, entities=[ChangeEntity.CORP_ACTION]
+        )
+
+        changes = [make_change(1), make_change(2, "OTHER"), make_change(3, None)]
+        assert [by_symbology.matches(change) for change in changes] == [
+            True,
+            False,
+            False,
+        ]
+        assert [by_ref_data_uuid.matches(change) for change in changes] == [
+            False,
+            True,
+            True,
+        ]
+        assert [by_entity.matches(change) for change in changes] == [
+            False,
+            False,
+            True,
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_another_thread() -> None:
+    broadcaster = ChangeBroadcaster()
+
+    async def scenario() -> list[dict[str, str]]:
+        subscription = ChangeSubscription(
+            loop=asyncio.get_running_loop(),
+            max_pending=10,
+            symbologies=[TEST_SYMBOLOGY],
+        )
+        broadcaster.subscribe(subscription)
+
+        # as sync endpoints do, from the thread pool
+        publisher = threading.Thread(
+            target=broadcaster.publish,
+            args=([make_change(1), make_change(2, "OTHER"), make_change(3)],),
+        )
+        publisher.start()
+        publisher.join()
+
+        return await asyncio.wait_for(collect_events(subscription, 2), timeout=5)
+
+    events = asyncio.run(scenario())
+
+    assert [event["id"] for event in events] == ["1", "3"]
+    assert {event["event"] for event in events} == {"change"}
+    assert json.loads(events[0]["data"])["payload"] == {
+        "ref_data_uuid": "ref-1",
+        "symbology": TEST_SYMBOLOGY,
+        "symbol": "SYMBOL_1",
+        "start_time": "2025-01-01T00:00:00",
+    }
+
+
+def test_slow_subscriber_overflows_without_blocking_publisher() -> None:
+    broadcaster = ChangeBroadcaster()
+
+    async def scenario() -> list[dict[str, str]]:
+        subscription = ChangeSubscription(
+            loop=asyncio.get_running_loop(), max_pending=2
+        )
+        broadcaster.subscribe(subscription)
+
+        # nobody reads the subscription while changes are published
+        for sequence in range(1, 6):
+            broadcaster.publish([make_change(sequence)])
+        await asyncio.sleep(0)
+
+        return [
+            event
+            async for chunk in subscription.iter_events(keepalive_seconds=5)
+            for event in parse_events(chunk.decode())
+        ]
+
+    events = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert [event.get("id") for event in events] == ["1", "2", None]
+    assert events[-1]["event"] == "overflow"
+    assert json.loads(events[-1]["data"]) == {"next_since": 2}, (
+        "Should tell the subscriber where to catch up from, then end the stream."
+    )
+
+
+def test_overflow_before_any_change_sent() -> None:
+    broadcaster = ChangeBroadcaster()
+    # fanned out before the subscription
+    broadcaster.publish([make_change(1)])
+
+    async def scenario() -> list[dict[str, str]]:
+        subscription = ChangeSubscription(
+            loop=asyncio.get_running_loop(), max_pending=0
+        )
+        broadcaster.subscribe(subscription)
+        broadcaster.publish([make_change(1), make_change(2)])
+        await asyncio.sleep(0)
+
+        return [
+            event
+            async for chunk in subscription.iter_events(keepalive_seconds=5)
+            for event in parse_events(chunk.decode())
+        ]
+
+    events = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert [event["event"] for event in events] == ["overflow"]
+    assert json.loads(events[0]["data"]) == {"next_since": 1}, (
+        "Should catch up from the end of the log when subscribed."
+    )
+
+
+def test_follow_from_end_of_log_after_last_subscriber_left(
+    async_engine, session
+) -> None:
+    broadcaster = ChangeBroadcaster()
+
+    def commit_symbol(symbol: str) -> dict:
+        # committed without going through the broadcaster
+        row = SymbologySymbolDb(
+            ref_data_uuid=f"ref-{symbol}", symbology=TEST_SYMBOLOGY, symbol=symbol
+        )
+        session.add(row)
+        (change,) = record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=[row.model_dump()],
+        )
+        session.commit()
+        return change
+
+    async def scenario() -> tuple[dict, list[dict[str, str]]]:
+        loop = asyncio.get_running_loop()
+        first = ChangeSubscription(loop=loop, max_pending=10)
+        await broadcaster.follow(async_engine, poll_seconds=0.01)
+        broadcaster.subscribe(first)
+        broadcaster.unsubscribe(first)
+        # the log is no longer read once the last subscriber left
+        await asyncio.sleep(0.1)
+
+        commit_symbol("EURUSD")
+
+        second = ChangeSubscription(loop=loop, max_pending=10)
+        await broadcaster.follow(async_engine, poll_seconds=0.01)
+        broadcaster.subscribe(second)
+        change = commit_symbol("GBPUSD")
+        broadcaster.notify()
+        events = await collect_events(second, 1)
+        broadcaster.unsubscribe(second)
+        await asyncio.sleep(0.1)
+        return change, events
+
+    change, events = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert [event["id"] for event in events] == [str(change["sequence"])], (
+        "Should not send changes committed while nobody was subscribed."
+    )
+
+
+def test_stream_changes_committed_by_endpoints(client: TestClient) -> None:
+    broadcaster = ChangeBroadcaster()
+    app.dependency_overrides[get_change_broadcaster] = lambda: broadcaster
+    app.dependency_overrides[get_settings] = lambda: Settings(events_max_pending=1)
+
+    responses: list[httpx.Response] = []
+    subscriber = threading.Thread(
+        target=lambda: responses.append(
+            client.get("/events/", params={"symbology": TEST_SYMBOLOGY})
+        )
+    )
+    subscriber.start()
+
+    deadline = time.monotonic() + 5
+    while broadcaster.subscription_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = client.post(
+        "/symbols/",
+        json=[
+            {"symbology_map": {"OTHER": [{"symbol": "FILTERED_OUT"}]}},
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}},
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "GBPUSD"}]}},
+        ],
+    )
+    ref_data_uuid = response.json()[1]["ref_data_uuid"]
+
+    # the subscriber can only hold one change, so the stream ends with an overflow
+    subscriber.join(timeout=5)
+    (response,) = responses
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"].startswith(SSE_MEDIA_TYPE)
+
+    change, overflow = parse_events(response.text)
+    assert change["event"] == "change"
+    assert json.loads(change["data"])["ref_data_uuid"] == ref_data_uuid
+    assert json.loads(change["data"])["payload"]["symbol"] == "EURUSD"
+    assert overflow["event"] == "overflow"
+    assert json.loads(overflow["data"]) == {"next_since": int(change["id"])}
+
+    assert broadcaster.subscription_count == 0
+
+
+def test_stream_changes_committed_by_another_worker(
+    client: TestClient, session
+) -> None:
+    broadcaster = ChangeBroadcaster()
+    app.dependency_overrides[get_change_broadcaster] = lambda: broadcaster
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        events_max_pending=1, events_poll_seconds=0.05
+    )
+
+    responses: list[httpx.Response] = []
+    subscriber = threading.Thread(
+        target=lambda: responses.append(client.get("/events/"))
+    )
+    subscriber.start()
+
+    deadline = time.monotonic() + 5
+    while broadcaster.subscription_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # committed without going through this worker, e.g. by scripts/import_symbols.py, so nobody notifies it
+    rows = [
+        SymbologySymbolDb(
+            ref_data_uuid=f"ref-{symbol}", symbology=TEST_SYMBOLOGY, symbol=symbol
+        )
+        for symbol in ("EURUSD", "GBPUSD")
+    ]
+    session.add_all(rows)
+    (change, _) = record_changes(
+        session=session,
+        entity=ChangeEntity.SYMBOL,
+        operation=ChangeOperation.CREATE,
+        rows=[row.model_dump() for row in rows],
+    )
+    session.commit()
+
+    # the subscriber can only hold one change, so the stream ends with an overflow
+    subscriber.join(timeout=5)
+    (response,) = responses
+    event, overflow = parse_events(response.text)
+    assert event["id"] == str(change["sequence"])
+    assert json.loads(event["data"])["ref_data_uuid"] == "ref-EURUSD"
+    assert json.loads(overflow["data"]) == {"next_since": change["sequence"]}
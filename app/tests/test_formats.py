@@ -0,0 +1,158 @@
+import datetime
+
+import pytest
+from fastapi import HTTPException
+from starlette.status import HTTP_406_NOT_ACCEPTABLE
+
+from app.internal import formats
+from app.internal.formats import (
+    ARROW_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    ResponseFormat,
+    build_symbols_arrow_schema,
+    dump_arrow,
+    iter_arrow_stream,
+    iter_msgpack,
+    make_representation_etag,
+    negotiate_response_format,
+)
+from app.internal.streaming import NDJSON_MEDIA_TYPE
+
+pa = pytest.importorskip("pyarrow")
+msgpack = pytest.importorskip("msgpack")
+
+SYMBOL_ROWS = [
+    (
+        "ref-1",
+        "BLOOMBERG",
+        "AAPL US",
+        "XNAS",
+        datetime.datetime(2025, 1, 1),
+        datetime.datetime(2025, 6, 1),
+    ),
+    (
+        "ref-1",
+        "REUTERS",
+        "AAPL.O",
+        None,
+        datetime.datetime(2025, 1, 1, 9, 30, 0, 1),
+        datetime.datetime(2025, 6, 1),
+    ),
+    (
+        "ref-2",
+        "BLOOMBERG",
+        "MSFT US",
+        "XNAS",
+        datetime.datetime(2025, 1, 1),
+        datetime.datetime(2025, 6, 1),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, ResponseFormat.JSON),
+        ("*/*", ResponseFormat.JSON),
+        ("application/json", ResponseFormat.JSON),
+        ("text/html, application/*;q=0.9", ResponseFormat.JSON),
+        (ARROW_STREAM_MEDIA_TYPE, ResponseFormat.ARROW),
+        ("application/x-msgpack", ResponseFormat.MSGPACK),
+        (
+            f"{ARROW_STREAM_MEDIA_TYPE};q=0.5, {MSGPACK_MEDIA_TYPE}",
+            ResponseFormat.MSGPACK,
+        ),
+        (f"application/json;q=0.1, {ARROW_STREAM_MEDIA_TYPE}", ResponseFormat.ARROW),
+        (f"{ARROW_STREAM_MEDIA_TYPE};q=0, */*", ResponseFormat.JSON),
+    ],
+)
+def test_negotiate_response_format(
+    accept: str | None, expected: ResponseFormat
+) -> None:
+    assert negotiate_response_format(accept) is expected
+
+
+def test_negotiate_export_format_with_ndjson() -> None:
+    assert (
+        negotiate_response_format(NDJSON_MEDIA_TYPE, json_media_type=NDJSON_MEDIA_TYPE)
+        is ResponseFormat.JSON
+    )
+
+
+def test_negotiate_unsupported_media_type() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        negotiate_response_format("text/csv")
+
+    assert exc_info.value.status_code == HTTP_406_NOT_ACCEPTABLE
+    assert ARROW_STREAM_MEDIA_TYPE in exc_info.value.detail
+
+
+def test_negotiate_format_without_its_dependency(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(
+        formats._FORMAT_MODULES, ResponseFormat.ARROW, "not_installed_module"
+    )
+
+    assert (
+        negotiate_response_format(f"{ARROW_STREAM_MEDIA_TYPE}, */*;q=0.1")
+        is ResponseFormat.JSON
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        negotiate_response_format(ARROW_STREAM_MEDIA_TYPE)
+    assert exc_info.value.status_code == HTTP_406_NOT_ACCEPTABLE
+    assert ARROW_STREAM_MEDIA_TYPE not in exc_info.value.detail
+
+
+def test_representation_etags_differ_by_format() -> None:
+    etags = {
+        make_representation_etag(7, response_format)
+        for response_format in ResponseFormat
+    }
+
+    assert make_representation_etag(7, ResponseFormat.JSON) == '"7"'
+    assert len(etags) == len(ResponseFormat)
+
+
+def test_dump_arrow_roundtrip() -> None:
+    table = pa.ipc.open_stream(
+        dump_arrow(build_symbols_arrow_schema(), SYMBOL_ROWS)
+    ).read_all()
+
+    assert table.schema == build_symbols_arrow_schema()
+    assert pa.types.is_dictionary(table.schema.field("symbology").type)
+    assert table.schema.field("start_time").type == pa.timestamp("us")
+    assert [tuple(row.values()) for row in table.to_pylist()] == SYMBOL_ROWS
+
+
+def test_dump_arrow_empty() -> None:
+    table = pa.ipc.open_stream(dump_arrow(build_symbols_arrow_schema(), [])).read_all()
+
+    assert table.num_rows == 0
+    assert table.schema == build_symbols_arrow_schema()
+
+
+def test_arrow_stream_batches_with_their_own_dictionaries() -> None:
+    batches = [SYMBOL_ROWS[:1], SYMBOL_ROWS[1:]]
+    chunks = list(iter_arrow_stream(build_symbols_arrow_schema(), batches))
+
+    # schema and first batch, second batch, end of stream
+    assert len(chunks) == 3
+    reader = pa.ipc.open_stream(b"".join(chunks))
+    assert [batch.num_rows for batch in reader] == [1, 2]
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+    assert table.column("symbology").to_pylist() == [
+        "BLOOMBERG",
+        "REUTERS",
+        "BLOOMBERG",
+    ]
+
+
+def test_iter_msgpack_sequence() -> None:
+    documents = [{"ref_data_uuid": f"ref-{i}", "symbology_map": {}} for i in range(3)]
+
+    unpacker = msgpack.Unpacker()
+    for chunk in iter_msgpack(documents):
+        unpacker.feed(chunk)
+
+    assert list(unpacker) == documents
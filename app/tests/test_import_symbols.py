@@ -0,0 +1,145 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+
+from app.config import Settings
+from app.db import create_db_and_tables, create_engine_from_settings
+from app.schemas import SymbologySymbolDb
+from scripts.import_symbols import import_symbols
+
+ROWS = [
+    {"figi": "BBG1", "symbology": "TICKER", "symbol": "AAPL", "start_time": ""},
+    {"figi": "BBG1", "symbology": "ISIN", "symbol": "US0378331005", "start_time": ""},
+    # invalid, start time after end time
+    {
+        "figi": "BBG2",
+        "symbology": "TICKER",
+        "symbol": "BROKEN",
+        "start_time": "2099-12-31T00:00:00",
+    },
+    {"figi": "BBG3", "symbology": "TICKER", "symbol": "MSFT", "start_time": ""},
+    {"figi": "BBG3", "symbology": "ISIN", "symbol": "US5949181045", "start_time": ""},
+]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path: Path) -> Engine:
+    engine = create_engine_from_settings(
+        Settings(database_url=f"sqlite:///{tmp_path / 'database.db'}")
+    )
+    create_db_and_tables(engine)
+    return engine
+
+
+@pytest.fixture(name="source")
+def source_fixture(tmp_path: Path) -> Path:
+    source = tmp_path / "symbols.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=ROWS[0].keys())
+        writer.writeheader()
+        writer.writerows(ROWS)
+    return source
+
+
+def get_symbols(engine: Engine) -> dict[str, str]:
+    with Session(engine) as session:
+        return {
+            symbol.symbol: symbol.ref_data_uuid
+            for symbol in session.exec(select(SymbologySymbolDb))
+        }
+
+
+def test_import_groups_rows_by_security(
+    engine: Engine, source: Path, tmp_path: Path
+) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    rows_imported = import_symbols(
+        engine, source, key_column="figi", chunk_size=2, checkpoint_path=checkpoint_path
+    )
+
+    assert rows_imported == len(ROWS)
+    assert json.loads(checkpoint_path.read_text())["rows_imported"] == len(ROWS)
+
+    symbols = get_symbols(engine)
+    assert set(symbols) == {"AAPL", "US0378331005", "MSFT", "US5949181045"}, (
+        "Invalid security should be rejected."
+    )
+    assert symbols["AAPL"] == symbols["US0378331005"]
+    assert symbols["MSFT"] == symbols["US5949181045"]
+    assert symbols["AAPL"] != symbols["MSFT"]
+
+
+def test_import_resumes_after_checkpoint(
+    engine: Engine, source: Path, tmp_path: Path
+) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint_path.write_text(
+        json.dumps({"source": str(source.resolve()), "rows_imported": 3})
+    )
+
+    import_symbols(
+        engine, source, key_column="figi", chunk_size=2, checkpoint_path=checkpoint_path
+    )
+
+    assert set(get_symbols(engine)) == {"MSFT", "US5949181045"}
+
+
+def test_import_again_does_not_duplicate_symbols(
+    engine: Engine, source: Path, tmp_path: Path
+) -> None:
+    for run in range(2):
+        import_symbols(
+            engine,
+            source,
+            key_column="figi",
+            chunk_size=100,
+            checkpoint_path=tmp_path / f"checkpoint_{run}.json",
+        )
+
+    assert len(get_symbols(engine)) == 4
+
+
+def test_import_parquet(engine: Engine, tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    source = tmp_path / "symbols.parquet"
+    pq.write_table(
+        pa.Table.from_pylist(
+            [{**row, "start_time": None} for row in ROWS if row["figi"] != "BBG2"]
+        ),
+        source,
+    )
+
+    import_symbols(
+        engine,
+        source,
+        key_column="figi",
+        chunk_size=2,
+        checkpoint_path=tmp_path / "checkpoint.json",
+    )
+
+    assert len(get_symbols(engine)) == 4
+
+
+def test_import_without_key_column(
+    engine: Engine, source: Path, tmp_path: Path
+) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    with pytest.raises(SystemExit, match="has no column isin"):
+        import_symbols(
+            engine,
+            source,
+            key_column="isin",
+            chunk_size=2,
+            checkpoint_path=checkpoint_path,
+        )
+
+    assert not checkpoint_path.exists()
+    assert get_symbols(engine) == {}
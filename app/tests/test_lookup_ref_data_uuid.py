@@ -0,0 +1,68 @@
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.testclient import TestClient
+
+from app.internal.lookup_ref_data_uuid import (
+    SYMBOLS_LOOKUP_CHUNK_SIZE,
+    lookup_ref_data_uuids_given_list_of_symbology_maps,
+)
+from app.schemas import SymbologyMaps, SymbologySymbolSpec
+from app.tests import TEST_SYMBOLOGY
+
+
+def run_lookup(
+    async_engine: AsyncEngine, list_of_symbology_maps: list[SymbologyMaps]
+) -> list[dict[str, set[str]]]:
+    async def lookup() -> list[dict[str, set[str]]]:
+        async with AsyncSession(async_engine) as session:
+            return await lookup_ref_data_uuids_given_list_of_symbology_maps(
+                session=session, list_of_symbology_maps=list_of_symbology_maps
+            )
+
+    return asyncio.run(lookup())
+
+
+class TestLookupRefDataUuidsGivenListOfSymbologyMaps:
+    def test_lookup_returns_results_in_input_order(
+        self,
+        client: TestClient,
+        async_engine: AsyncEngine,
+        new_symbol_ref_data_uuid: str,
+    ) -> None:
+        list_of_symbology_maps = [
+            {TEST_SYMBOLOGY: [SymbologySymbolSpec(symbol="DOES_NOT_EXIST")]},
+            {TEST_SYMBOLOGY: [SymbologySymbolSpec(symbol="EURUSD")]},
+        ]
+
+        results = run_lookup(async_engine, list_of_symbology_maps)
+
+        assert results == [{}, {new_symbol_ref_data_uuid: {TEST_SYMBOLOGY}}]
+
+    def test_lookup_uses_constant_number_of_queries(
+        self, async_engine: AsyncEngine
+    ) -> None:
+        list_of_symbology_maps = [
+            {
+                TEST_SYMBOLOGY: [SymbologySymbolSpec(symbol=f"SYMBOL_{i}")],
+                "ANOTHER_SYMBOLOGY": [SymbologySymbolSpec(symbol=f"SYMBOL_{i}")],
+            }
+            for i in range(SYMBOLS_LOOKUP_CHUNK_SIZE)
+        ]
+
+        statements: list[str] = []
+
+        def count_statements(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        sync_engine = async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_statements)
+        try:
+            results = run_lookup(async_engine, list_of_symbology_maps)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_statements)
+
+        assert len(results) == SYMBOLS_LOOKUP_CHUNK_SIZE
+        assert len(statements) == 2, "Should query in chunks, not item by item."
@@ -0,0 +1,116 @@
+from starlette.status import HTTP_200_OK
+from starlette.testclient import TestClient
+
+from app.internal.metrics import (
+    PROMETHEUS_MEDIA_TYPE,
+    UNMATCHED_ROUTE,
+    Counter,
+    Histogram,
+    ServiceMetrics,
+)
+from app.tests import TEST_SYMBOLOGY
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("/a",))
+
+    assert list(histogram.render()) == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc(('/a"b\\c',))
+
+    assert list(counter.render())[-1] == 'requests_total{route="/a\\"b\\\\c"} 1.0'
+
+
+def test_render_without_observations() -> None:
+    rendered = ServiceMetrics().render()
+
+    assert "# TYPE http_request_duration_seconds histogram" in rendered
+    assert "# TYPE http_requests_in_flight gauge" in rendered
+
+
+def test_request_and_database_metrics_by_route(
+    client: TestClient, metrics: ServiceMetrics
+) -> None:
+    spec = [
+        {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+        for i in range(3)
+    ]
+    rows_before = metrics.rows_affected.get(("/symbols/",))
+    client.post("/symbols/", json=spec)
+    # symbols and their changes
+    assert metrics.rows_affected.get(("/symbols/",)) == rows_before + 6
+
+    labels = ("GET", "/symbols/")
+    requests_before = metrics.request_duration.get_count(labels)
+    statements_before = metrics.statement_duration.get_count(("/symbols/",))
+
+    response = client.get("/symbols/")
+    assert response.status_code == HTTP_200_OK
+
+    assert metrics.request_duration.get_count(labels) == requests_before + 1
+    assert metrics.requests.get((*labels, "200")) >= 1
+    # change sequence and page of symbols
+    assert metrics.statement_duration.get_count(("/symbols/",)) >= statements_before + 2
+    assert metrics.requests_in_flight.get() == 0
+
+
+def test_routes_are_labelled_by_template(
+    client: TestClient, metrics: ServiceMetrics
+) -> None:
+    before = metrics.requests.get(("GET", "/symbols/{ref_data_uuid}", "404"))
+    unmatched_before = metrics.requests.get(("GET", UNMATCHED_ROUTE, "404"))
+
+    client.get("/symbols/unknown-ref-data-uuid")
+    client.get("/no/such/route")
+
+    assert (
+        metrics.requests.get(("GET", "/symbols/{ref_data_uuid}", "404")) == before + 1
+    )
+    assert metrics.requests.get(("GET", UNMATCHED_ROUTE, "404")) == unmatched_before + 1
+
+
+def test_streaming_responses(client: TestClient, metrics: ServiceMetrics) -> None:
+    spec = [
+        {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+        for i in range(3)
+    ]
+    client.post("/symbols/", json=spec)
+
+    labels = ("GET", "/symbols/export")
+    size_before = metrics.response_size.get_sum(labels)
+    statements_before = metrics.statement_duration.get_count(("/symbols/export",))
+
+    response = client.get("/symbols/export")
+
+    assert metrics.response_size.get_sum(labels) == size_before + len(response.content)
+    # the query is executed by the thread iterating the response
+    assert (
+        metrics.statement_duration.get_count(("/symbols/export",))
+        == statements_before + 1
+    )
+
+
+def test_get_metrics(client: TestClient, metrics: ServiceMetrics) -> None:
+    client.get("/symbols/")
+
+    response = client.get("/metrics")
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"] == PROMETHEUS_MEDIA_TYPE
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/symbols/"}'
+        in response.text
+    )
+    assert 'db_statement_duration_seconds_count{route="/symbols/"}' in response.text
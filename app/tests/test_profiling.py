@@ -0,0 +1,179 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from starlette.status import HTTP_200_OK, HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND
+from starlette.testclient import TestClient
+
+from app.config import get_settings
+from app.dependencies import request_profiler
+from app.internal.profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    ProfileStore,
+    RequestProfiler,
+)
+from app.tests import ADMIN_TOKEN, TEST_SYMBOLOGY
+
+TOKEN = "profiling-token"
+ADMIN_HEADERS = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+
+@pytest.fixture(name="profiler")
+def profiler_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Pytest fixture enabling the request profiler of the application, with profiles written to a temporary directory,
+    and the admin endpoints the profiles are downloaded from.
+
+    Yields:
+        RequestProfiler: The request profiler of the application.
+    """
+    monkeypatch.setattr(get_settings(), "admin_token", ADMIN_TOKEN)
+    monkeypatch.setattr(request_profiler, "token", TOKEN)
+    monkeypatch.setattr(
+        request_profiler, "store", ProfileStore(tmp_path / "profiles", max_profiles=3)
+    )
+    yield request_profiler
+
+
+def create_symbols(client: TestClient, headers: dict[str, str] | None = None):
+    spec = [
+        {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+        for i in range(3)
+    ]
+    return client.post("/symbols/", json=spec, headers=headers)
+
+
+def test_requests_without_token_are_not_profiled(
+    client: TestClient, profiler: RequestProfiler
+) -> None:
+    response = client.get("/symbols/")
+    wrong_token_response = client.get("/symbols/", headers={PROFILE_HEADER: "wrong"})
+
+    assert PROFILE_ID_HEADER not in response.headers
+    assert PROFILE_ID_HEADER not in wrong_token_response.headers
+    assert client.get("/admin/profiles", headers=ADMIN_HEADERS).json() == []
+
+
+def test_profiling_disabled_without_configured_token(
+    client: TestClient, profiler: RequestProfiler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(profiler, "token", None)
+
+    response = client.get("/symbols/", headers={PROFILE_HEADER: TOKEN})
+
+    assert PROFILE_ID_HEADER not in response.headers
+    assert not profiler.store.directory.exists()
+
+
+def test_profiles_require_admin_token(
+    client: TestClient, profiler: RequestProfiler
+) -> None:
+    profile_id = client.get("/symbols/", headers={PROFILE_HEADER: TOKEN}).headers[
+        PROFILE_ID_HEADER
+    ]
+
+    for path in ("/admin/profiles", f"/admin/profiles/{profile_id}"):
+        for headers in (
+            {},
+            {"Authorization": "Bearer wrong"},
+            # the profiling token only triggers profiles
+            {PROFILE_HEADER: TOKEN},
+            {"Authorization": f"Bearer {TOKEN}"},
+        ):
+            response = client.get(path, headers=headers)
+            assert response.status_code == HTTP_401_UNAUTHORIZED
+
+
+def test_profiles_not_found_when_profiling_disabled(
+    client: TestClient, profiler: RequestProfiler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    profile_id = client.get("/symbols/", headers={PROFILE_HEADER: TOKEN}).headers[
+        PROFILE_ID_HEADER
+    ]
+    monkeypatch.setattr(profiler, "token", None)
+
+    for path in ("/admin/profiles", f"/admin/profiles/{profile_id}"):
+        assert client.get(path, headers=ADMIN_HEADERS).status_code == (
+            HTTP_404_NOT_FOUND
+        )
+
+
+def test_profile_request(client: TestClient, profiler: RequestProfiler) -> None:
+    response = create_symbols(client, headers={PROFILE_HEADER: TOKEN})
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    profiles = client.get("/admin/profiles", headers=ADMIN_HEADERS).json()
+    assert [profile["profile_id"] for profile in profiles] == [profile_id]
+    assert profiles[0]["method"] == "POST"
+    assert profiles[0]["route"] == "/symbols/"
+    assert profiles[0]["status"] == response.status_code
+
+    download = client.get(f"/admin/profiles/{profile_id}", headers=ADMIN_HEADERS)
+    assert download.status_code == HTTP_200_OK
+    path = profiler.store.directory / "downloaded.prof"
+    path.write_bytes(download.content)
+    functions = {function for _, _, function in pstats.Stats(str(path)).stats}
+    assert "create_symbol" in functions
+
+    report = client.get(
+        f"/admin/profiles/{profile_id}",
+        params={"format": "text"},
+        headers=ADMIN_HEADERS,
+    )
+    assert report.status_code == HTTP_200_OK
+    assert "cumulative" in report.text
+
+
+def test_profile_request_with_query_parameter(
+    client: TestClient, profiler: RequestProfiler
+) -> None:
+    response = client.get("/symbols/export", params={"profile": TOKEN})
+
+    assert response.status_code == HTTP_200_OK
+    assert profiler.store.path_of(response.headers[PROFILE_ID_HEADER]) is not None
+
+
+def test_oldest_profiles_are_deleted(
+    client: TestClient, profiler: RequestProfiler
+) -> None:
+    profile_ids = [
+        client.get("/symbols/", headers={PROFILE_HEADER: TOKEN}).headers[
+            PROFILE_ID_HEADER
+        ]
+        for _ in range(5)
+    ]
+
+    profiles = client.get("/admin/profiles", headers=ADMIN_HEADERS).json()
+    assert [profile["profile_id"] for profile in profiles] == profile_ids[:1:-1]
+    assert client.get(
+        f"/admin/profiles/{profile_ids[0]}", headers=ADMIN_HEADERS
+    ).status_code == (HTTP_404_NOT_FOUND)
+
+
+def test_one_request_profiled_at_a_time(
+    client: TestClient, profiler: RequestProfiler
+) -> None:
+    assert profiler.acquire()
+    try:
+        response = client.get("/symbols/", headers={PROFILE_HEADER: TOKEN})
+    finally:
+        profiler.release()
+
+    assert response.status_code == HTTP_200_OK
+    assert PROFILE_ID_HEADER not in response.headers
+
+
+@pytest.mark.parametrize(
+    "profile_id", ["prof-0", "..%2F..%2Fdatabase", "prof-" + "0" * 32]
+)
+def test_get_unknown_profile(
+    client: TestClient, profiler: RequestProfiler, profile_id: str
+) -> None:
+    for profile_format in ("pstats", "text"):
+        response = client.get(
+            f"/admin/profiles/{profile_id}",
+            params={"format": profile_format},
+            headers=ADMIN_HEADERS,
+        )
+        assert response.status_code == HTTP_404_NOT_FOUND
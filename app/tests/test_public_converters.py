@@ -1,10 +1,21 @@
+import datetime
+import json
+
 import pytest
+from pydantic import TypeAdapter
 
-from app.internal.symbols_helpers import convert_list_of_db_objects_to_public_objects
+from app.internal.corp_actions_helpers import iter_corp_actions_as_public_dicts
+from app.internal.responses import dump_json
+from app.internal.symbols_helpers import (
+    convert_list_of_db_objects_to_public_objects,
+    iter_symbol_rows_as_public_dicts,
+)
 from app.schemas import (
     SymbologySymbolSpec,
     SymbologySymbolDb,
+    SymbologySymbolPublic,
 )
+from app.schemas.corp_actions import CorpActionDb, CorpActionPublic, CorpActionsTypes
 from app.constants import LOWEST_DATETIME, HIGHEST_DATETIME
 
 
@@ -69,3 +80,61 @@ class TestConvertSymbolsDbToPublic:
             public_objects[0].symbology_map["symbology-2"][0].exchange
             == "ALTERNATIVE_EXCHANGE"
         )
+
+
+class TestConvertSymbolRowsToPublicDicts:
+    def test_same_output_as_public_objects(self) -> None:
+        db_objects = [
+            SymbologySymbolDb(
+                symbol=f"SYMBOL_{i}",
+                exchange=None if i % 2 else "NASDAQ",
+                start_time=datetime.datetime(2000 + i, 1, 1, 12, 30, 0, 1500 * i),
+                end_time=HIGHEST_DATETIME,
+                ref_data_uuid=f"uuid-{i // 4}",
+                symbology=f"symbology-{i % 2}",
+            )
+            for i in range(8)
+        ]
+        db_objects.sort(key=lambda x: (x.ref_data_uuid, x.symbology, x.start_time))
+        rows = [
+            (
+                x.ref_data_uuid,
+                x.symbology,
+                x.symbol,
+                x.exchange,
+                x.start_time,
+                x.end_time,
+            )
+            for x in db_objects
+        ]
+
+        public_objects = convert_list_of_db_objects_to_public_objects(db_objects)
+        expected = TypeAdapter(list[SymbologySymbolPublic]).dump_json(public_objects)
+
+        assert dump_json(list(iter_symbol_rows_as_public_dicts(rows))) == expected
+
+    def test_convert_empty_rows(self) -> None:
+        assert json.loads(dump_json(list(iter_symbol_rows_as_public_dicts([])))) == []
+
+
+class TestConvertCorpActionsToPublicDicts:
+    def test_same_output_as_public_objects(self) -> None:
+        db_objects = [
+            CorpActionDb(
+                ref_data_uuid=f"uuid-{i}",
+                effective_time=datetime.datetime(2000 + i, 1, 1, 12, 30, 0, 1500 * i),
+                action_type=list(CorpActionsTypes)[i % len(CorpActionsTypes)],
+                additive_adjustment=None if i % 3 == 0 else -0.1 * i,
+                multiplicative_adjustment=1e-7 if i % 2 else 1.0 / (i + 3),
+            )
+            for i in range(8)
+        ]
+
+        public_objects = [
+            CorpActionPublic(**corp_action.model_dump()) for corp_action in db_objects
+        ]
+        expected = TypeAdapter(list[CorpActionPublic]).dump_json(public_objects)
+
+        assert (
+            dump_json(list(iter_corp_actions_as_public_dicts(db_objects))) == expected
+        )
@@ -0,0 +1,192 @@
+import datetime
+
+import pytest
+from sqlalchemy import Select, create_engine, event, inspect, text
+from sqlmodel import Session
+
+from app.db import create_db_and_tables
+from app.internal.change_log import (
+    build_changes_page_statement,
+    build_last_change_sequence_statement,
+)
+from app.internal.corp_actions_helpers import (
+    build_corp_actions_calendar_statement,
+    build_corp_actions_of_ref_data_uuid_statement,
+    build_corp_actions_of_symbol_statement,
+    build_corp_actions_page_statement,
+    build_existing_corp_action_keys_statements,
+)
+from app.internal.lookup_ref_data_uuid import (
+    build_existing_ref_data_uuids_statements,
+    build_ref_data_uuid_exists_statement,
+    build_symbol_candidates_statements,
+    build_symbols_valid_at_statement,
+)
+from app.internal.symbols_helpers import (
+    build_symbols_by_ref_data_uuid_statement,
+    build_symbols_page_statement,
+)
+from app.schemas.changes import ChangeEntity
+from app.schemas.corp_actions import CorpActionsTypes
+from app.tests import TEST_SYMBOLOGY
+
+
+def explain_query_plan(session: Session, statement: Select) -> list[str]:
+    """Execute the statement, then return the query plan SQLite used for it."""
+    executed: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, sql, parameters, context, executemany) -> None:
+        executed.append((sql, parameters))
+
+    bind = session.get_bind()
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        session.exec(statement).all()
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+
+    ((sql, parameters),) = executed
+    cursor = session.connection().connection.cursor()
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+    return [detail for _, _, _, detail in cursor.fetchall()]
+
+
+ROUTER_STATEMENTS = {
+    "symbol candidates": lambda: next(
+        build_symbol_candidates_statements(
+            [(TEST_SYMBOLOGY, "EURUSD"), (TEST_SYMBOLOGY, "GBPUSD")]
+        )
+    ),
+    "symbols valid at": lambda: build_symbols_valid_at_statement(
+        symbology=TEST_SYMBOLOGY, symbol="EURUSD", time=datetime.datetime(2025, 1, 1)
+    ),
+    "ref_data_uuid exists": lambda: build_ref_data_uuid_exists_statement(
+        ref_data_uuid="ref-1"
+    ),
+    "symbols by ref_data_uuid": lambda: build_symbols_by_ref_data_uuid_statement(
+        ref_data_uuid="ref-1"
+    ),
+    "symbols by ref_data_uuid and symbology": lambda: (
+        build_symbols_by_ref_data_uuid_statement(
+            ref_data_uuid="ref-1", symbology=TEST_SYMBOLOGY
+        )
+    ),
+    "existing ref_data_uuids": lambda: next(
+        build_existing_ref_data_uuids_statements(["ref-1", "ref-2"])
+    ),
+    "existing corp action keys": lambda: next(
+        build_existing_corp_action_keys_statements(["ref-1", "ref-2"])
+    ),
+    "change sequence": build_last_change_sequence_statement,
+    "corp actions of symbol": lambda: build_corp_actions_of_symbol_statement(
+        symbology=TEST_SYMBOLOGY,
+        symbol="EURUSD",
+        effective_from=datetime.datetime(2025, 1, 1),
+    ),
+    "corp actions calendar": lambda: build_corp_actions_calendar_statement(
+        effective_from=datetime.datetime(2025, 1, 1),
+        effective_to=datetime.datetime(2025, 1, 8),
+    ),
+    "corp actions calendar of type": lambda: build_corp_actions_calendar_statement(
+        effective_from=datetime.datetime(2025, 1, 1),
+        effective_to=datetime.datetime(2025, 1, 8),
+        action_type=CorpActionsTypes.STOCK_SPLIT,
+    ),
+}
+
+
+PAGE_STATEMENTS = {
+    "symbols page": lambda: build_symbols_page_statement(limit=10),
+    "symbols next page": lambda: build_symbols_page_statement(
+        limit=10, after=("ref-1", TEST_SYMBOLOGY, datetime.datetime(2025, 1, 1))
+    ),
+    "corp actions page": lambda: build_corp_actions_page_statement(limit=10),
+    "corp actions next page": lambda: build_corp_actions_page_statement(
+        limit=10, after=("ref-1", datetime.datetime(2025, 1, 1))
+    ),
+    "corp actions of ref_data_uuid": lambda: (
+        build_corp_actions_of_ref_data_uuid_statement(ref_data_uuid="ref-1")
+    ),
+    "corp actions of ref_data_uuid in window": lambda: (
+        build_corp_actions_of_ref_data_uuid_statement(
+            ref_data_uuid="ref-1",
+            action_type=CorpActionsTypes.DIVIDEND,
+            effective_from=datetime.datetime(2025, 1, 1),
+            effective_to=datetime.datetime(2025, 12, 31),
+        )
+    ),
+    "symbol changes": lambda: build_changes_page_statement(
+        entity=ChangeEntity.SYMBOL, since=10, limit=10
+    ),
+    "all changes": lambda: build_changes_page_statement(
+        entity=None, since=10, limit=10
+    ),
+}
+
+
+@pytest.mark.parametrize("name", ROUTER_STATEMENTS)
+def test_router_query_does_not_scan_table(session: Session, name: str) -> None:
+    plan = explain_query_plan(session, ROUTER_STATEMENTS[name]())
+
+    assert plan, "Query plan should not be empty."
+    assert not [detail for detail in plan if detail.startswith("SCAN")], (
+        f"Query {name!r} should be resolved with an index, got plan {plan}."
+    )
+
+
+@pytest.mark.parametrize("name", PAGE_STATEMENTS)
+def test_page_query_reads_index_in_order(session: Session, name: str) -> None:
+    plan = explain_query_plan(session, PAGE_STATEMENTS[name]())
+
+    assert not [detail for detail in plan if "TEMP B-TREE" in detail], (
+        f"Query {name!r} should not sort the whole table, got plan {plan}."
+    )
+    assert not [
+        detail for detail in plan if detail.startswith("SCAN") and "INDEX" not in detail
+    ], f"Query {name!r} should read rows in index order, got plan {plan}."
+
+
+def test_corp_actions_calendar_searches_effective_time_index(
+    session: Session,
+) -> None:
+    plan = explain_query_plan(
+        session,
+        build_corp_actions_calendar_statement(
+            effective_from=datetime.datetime(2025, 1, 1),
+            effective_to=datetime.datetime(2025, 1, 8),
+            action_type=CorpActionsTypes.STOCK_SPLIT,
+        ),
+    )
+
+    assert any(
+        detail.startswith(
+            "SEARCH corpactiondb USING INDEX ix_corpactiondb_effective_time_action_type"
+        )
+        for detail in plan
+    ), f"Calendar query should search the effective time index, got plan {plan}."
+
+
+def test_create_db_and_tables_adds_missing_indexes_to_existing_database(
+    tmp_path,
+) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    with engine.begin() as connection:
+        # table as created by versions of the application before indexes were defined
+        connection.execute(
+            text(
+                "CREATE TABLE symbologysymboldb ("
+                "symbol VARCHAR NOT NULL, exchange VARCHAR, start_time DATETIME NOT NULL, end_time DATETIME, "
+                "ref_data_uuid VARCHAR NOT NULL, symbology VARCHAR NOT NULL, "
+                "PRIMARY KEY (start_time, ref_data_uuid, symbology))"
+            )
+        )
+
+    create_db_and_tables(engine)
+
+    index_names = {
+        index["name"] for index in inspect(engine).get_indexes("symbologysymboldb")
+    }
+    assert {
+        "ix_symbologysymboldb_symbology_symbol_time",
+        "ix_symbologysymboldb_ref_data_uuid",
+    } <= index_names
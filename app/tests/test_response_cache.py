@@ -0,0 +1,78 @@
+from app.internal.response_cache import SymbolResponseCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(max_entries: int = 2, clock: FakeClock | None = None):
+    cache = SymbolResponseCache(
+        max_entries=max_entries, ttl_seconds=10.0, clock=clock or FakeClock()
+    )
+    # caught up with an empty change log
+    cache._last_sequence = 0
+    return cache
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = make_cache()
+    cache.put(("ref-1", None), b"1", sequence=0)
+    cache.put(("ref-2", None), b"2", sequence=0)
+    assert cache.get(("ref-1", None)) == b"1"
+
+    cache.put(("ref-3", None), b"3", sequence=0)
+
+    assert cache.get(("ref-2", None)) is None
+    assert cache.get(("ref-1", None)) == b"1"
+    assert cache.get(("ref-3", None)) == b"3"
+    assert cache.stats() | {"entries": 2, "hits": 3, "misses": 1, "evictions": 1} == (
+        cache.stats()
+    )
+
+
+def test_entries_expire() -> None:
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    cache.put(("ref-1", None), b"1", sequence=0)
+
+    clock.now = 9.9
+    assert cache.get(("ref-1", None)) == b"1"
+    clock.now = 10.0
+    assert cache.get(("ref-1", None)) is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_all_symbologies_of_ref_data_uuid() -> None:
+    cache = make_cache(max_entries=10)
+    cache.put(("ref-1", None), b"1", sequence=0)
+    cache.put(("ref-1", "BLOOMBERG"), b"1B", sequence=0)
+    cache.put(("ref-2", None), b"2", sequence=0)
+
+    cache.invalidate(["ref-1", "unknown"])
+
+    assert cache.get(("ref-1", None)) is None
+    assert cache.get(("ref-1", "BLOOMBERG")) is None
+    assert cache.get(("ref-2", None)) == b"2"
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_response_read_before_last_catch_up_is_not_stored() -> None:
+    cache = make_cache()
+    cache._last_sequence = 5
+
+    cache.put(("ref-1", None), b"stale", sequence=4)
+    assert len(cache) == 0
+
+    cache.put(("ref-1", None), b"fresh", sequence=5)
+    assert cache.get(("ref-1", None)) == b"fresh"
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = make_cache(max_entries=0)
+    cache.put(("ref-1", None), b"1", sequence=0)
+    assert cache.get(("ref-1", None)) is None
@@ -0,0 +1,64 @@
+import datetime
+import json
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
+from starlette.testclient import TestClient
+
+from app.internal.responses import FastJSONResponse, dump_json
+from app.schemas.corp_actions import CorpActionCreate, CorpActionsTypes
+
+
+def test_output_matches_default_json_response() -> None:
+    content = {
+        "ref_data_uuid": "ref-1",
+        "effective_time": datetime.datetime(2025, 1, 1),
+        "start_time": datetime.datetime(2025, 1, 1, 9, 30, 0, 1),
+        "action_type": CorpActionsTypes.STOCK_SPLIT,
+        "multiplicative_adjustment": 0.5,
+        "additive_adjustment": -1.25,
+        "exchange": None,
+        "symbol": "ÆRØ",
+        "symbols": ("A", "B"),
+    }
+
+    assert (
+        FastJSONResponse(content).body == JSONResponse(jsonable_encoder(content)).body
+    )
+
+
+def test_validation_errors_match_jsonable_encoder() -> None:
+    try:
+        TypeAdapter(CorpActionCreate).validate_python(
+            {
+                "ref_data_uuid": "ref-1",
+                "action_type": "STOCK_SPLIT",
+                "effective_time": "2025-01-01T00:00:00",
+                "multiplicative_adjustment": 0,
+            }
+        )
+    except ValidationError as exc:
+        errors = exc.errors()
+
+    assert json.loads(dump_json(errors)) == jsonable_encoder(errors)
+
+
+def test_numpy_arrays_are_serialized() -> None:
+    assert dump_json({"prices": np.array([1.0, 2.5])}) == b'{"prices":[1.0,2.5]}'
+
+
+def test_validation_error_response(client: TestClient) -> None:
+    body = {
+        "ref_data_uuid": "ref-1",
+        "action_type": "STOCK_SPLIT",
+        "effective_time": "2025-01-01T00:00:00",
+        "multiplicative_adjustment": 0,
+    }
+    response = client.post("/corpActions/", json=body)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["body"] == body
+    assert response.json()["detail"][0]["ctx"] == {"error": {}}
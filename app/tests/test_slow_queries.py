@@ -0,0 +1,164 @@
+import logging
+
+import pytest
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_204_NO_CONTENT,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_404_NOT_FOUND,
+)
+from starlette.testclient import TestClient
+
+from app.dependencies import request_profiler
+from app.internal.metrics import NO_ROUTE, ServiceMetrics, TrackedStatement
+from app.internal.slow_queries import SlowQueryLog, fingerprint_statement
+from app.tests import TEST_SYMBOLOGY
+
+
+def tracked(
+    statement: str, duration: float, route: str = "/symbols/"
+) -> TrackedStatement:
+    return TrackedStatement(
+        statement=statement, route=route, duration=duration, rows=1, returns_rows=True
+    )
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        (
+            "SELECT * FROM symbols WHERE symbol IN (?, ?)",
+            "SELECT * FROM symbols WHERE symbol IN (?, ?, ?, ?)",
+        ),
+        (
+            "SELECT * FROM symbols WHERE symbol = 'EURUSD' AND id > 10",
+            "SELECT * FROM symbols\n  WHERE symbol = 'GBP''s' AND id > 2.5",
+        ),
+        (
+            "INSERT INTO symbols (a, b) VALUES (?, ?)",
+            "INSERT INTO symbols (a, b) VALUES (?, ?), (?, ?), (?, ?)",
+        ),
+        (
+            "SELECT * FROM symbols WHERE symbol = :symbol_1",
+            "SELECT * FROM symbols WHERE symbol = %(symbol_2)s",
+        ),
+    ],
+)
+def test_fingerprint_strips_parameters(first: str, second: str) -> None:
+    assert fingerprint_statement(first) == fingerprint_statement(second)
+
+
+def test_fingerprint_keeps_identifiers() -> None:
+    fingerprint = fingerprint_statement(
+        "SELECT anon_1.symbol FROM symbologysymboldb AS anon_1 WHERE anon_1.id = 1"
+    )
+
+    assert fingerprint.statement == (
+        "SELECT anon_1.symbol FROM symbologysymboldb AS anon_1 WHERE anon_1.id = ?"
+    )
+    assert fingerprint != fingerprint_statement(
+        "SELECT anon_1.exchange FROM symbologysymboldb AS anon_1 WHERE anon_1.id = 1"
+    )
+
+
+def test_statements_are_accounted_by_fingerprint() -> None:
+    slow_query_log = SlowQueryLog(threshold_seconds=1.0)
+    for i in range(1, 4):
+        slow_query_log.observe(tracked(f"SELECT * FROM a WHERE id = {i}", 0.01))
+    slow_query_log.observe(tracked("SELECT * FROM b", 0.02, route=NO_ROUTE))
+
+    top = slow_query_log.top(10)
+    assert [stats["statement"] for stats in top] == [
+        "SELECT * FROM a WHERE id = ?",
+        "SELECT * FROM b",
+    ]
+    assert top[0]["calls"] == 3
+    assert top[0]["total_seconds"] == pytest.approx(0.03)
+    assert top[0]["routes"] == {"/symbols/": 3}
+    assert slow_query_log.top(1) == top[:1]
+
+
+def test_only_slow_statements_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    slow_query_log = SlowQueryLog(threshold_seconds=0.1)
+
+    with caplog.at_level(logging.WARNING, logger="app.internal.slow_queries"):
+        slow_query_log.observe(tracked("SELECT * FROM a WHERE id = 1", 0.01))
+        slow_query_log.observe(tracked("SELECT * FROM a WHERE id = 2", 0.5))
+
+    assert len(caplog.records) == 1
+    record = caplog.records[0]
+    assert record.statement == "SELECT * FROM a WHERE id = ?"
+    assert record.duration_seconds == 0.5
+    assert record.route == "/symbols/"
+    assert slow_query_log.top(1)[0]["slow_calls"] == 1
+
+
+def test_cheapest_fingerprint_dropped_when_full() -> None:
+    slow_query_log = SlowQueryLog(threshold_seconds=1.0, max_fingerprints=2)
+    slow_query_log.observe(tracked("SELECT * FROM a", 0.3))
+    slow_query_log.observe(tracked("SELECT * FROM b", 0.1))
+    slow_query_log.observe(tracked("SELECT * FROM c", 0.2))
+
+    assert [stats["statement"] for stats in slow_query_log.top(10)] == [
+        "SELECT * FROM a",
+        "SELECT * FROM c",
+    ]
+
+
+def test_get_and_reset_slow_queries(
+    client: TestClient, metrics: ServiceMetrics, admin_headers: dict[str, str]
+) -> None:
+    response = client.delete("/admin/slowQueries", headers=admin_headers)
+    assert response.status_code == HTTP_204_NO_CONTENT
+
+    spec = [{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}}]
+    client.post("/symbols/", json=spec)
+    client.get("/symbols/")
+
+    response = client.get(
+        "/admin/slowQueries", params={"limit": 100}, headers=admin_headers
+    )
+    assert response.status_code == HTTP_200_OK
+    statements = response.json()["statements"]
+    assert any(
+        "FROM symbologysymboldb" in stats["statement"]
+        and stats["routes"].get("/symbols/", 0) >= 1
+        for stats in statements
+    )
+    assert all("EURUSD" not in stats["statement"] for stats in statements)
+
+    client.delete("/admin/slowQueries", headers=admin_headers)
+    response = client.get("/admin/slowQueries", headers=admin_headers)
+    assert response.json()["statements"] == []
+
+
+@pytest.mark.parametrize("method", ["GET", "DELETE"])
+def test_slow_queries_require_admin_token(
+    client: TestClient,
+    admin_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+    method: str,
+) -> None:
+    # the profiling token only triggers profiles
+    monkeypatch.setattr(request_profiler, "token", "profiling-token")
+
+    for token in (None, "wrong", "profiling-token"):
+        headers = {} if token is None else {"Authorization": f"Bearer {token}"}
+        response = client.request(method, "/admin/slowQueries", headers=headers)
+        assert response.status_code == HTTP_401_UNAUTHORIZED
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [
+        ("GET", "/admin/slowQueries"),
+        ("DELETE", "/admin/slowQueries"),
+        ("GET", "/admin/caches"),
+    ],
+)
+def test_admin_endpoints_not_found_without_admin_token(
+    client: TestClient, method: str, path: str
+) -> None:
+    response = client.request(method, path, headers={"Authorization": "Bearer "})
+    assert response.status_code == HTTP_404_NOT_FOUND
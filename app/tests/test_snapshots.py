@@ -0,0 +1,161 @@
+import datetime
+from pathlib import Path
+
+import pytest
+from starlette.status import HTTP_200_OK, HTTP_201_CREATED
+from starlette.testclient import TestClient
+
+from app.config import Settings, get_settings
+from app.internal.snapshots import (
+    SNAPSHOT_MEDIA_TYPE,
+    SnapshotRow,
+    SymbolSnapshot,
+    write_snapshot,
+)
+from app.main import app
+from app.tests import TEST_SYMBOLOGY
+
+
+@pytest.fixture(name="snapshot_dir")
+def snapshot_dir_fixture(client: TestClient, tmp_path: Path) -> Path:
+    snapshot_dir = tmp_path / "snapshots"
+    app.dependency_overrides[get_settings] = lambda: Settings(snapshot_dir=snapshot_dir)
+    return snapshot_dir
+
+
+def create_symbol(client: TestClient, symbol: str, **spec) -> str:
+    response = client.post(
+        "/symbols/",
+        json=[{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": symbol, **spec}]}}],
+    )
+    assert response.status_code == HTTP_201_CREATED
+    return response.json()[0]["ref_data_uuid"]
+
+
+def test_write_and_read_snapshot(tmp_path: Path) -> None:
+    rows = [
+        SnapshotRow(
+            "ref-1",
+            "BLOOMBERG",
+            "AAPL US",
+            "XNAS",
+            datetime.datetime(1900, 1, 1),
+            datetime.datetime(2099, 12, 31),
+        ),
+        SnapshotRow(
+            "ref-1",
+            "TICKER",
+            "AAPL",
+            None,
+            datetime.datetime(2020, 1, 1, 9, 30, 0, 1),
+            datetime.datetime(2030, 1, 1),
+        ),
+        SnapshotRow(
+            "ref-2",
+            "TICKER",
+            "ÄÖÜ",
+            "XNAS",
+            datetime.datetime(2020, 1, 1),
+            datetime.datetime(2030, 1, 1),
+        ),
+    ]
+    path = tmp_path / "snapshot.symsnap"
+
+    assert (
+        write_snapshot(
+            path, as_of=datetime.datetime(2025, 1, 1), change_sequence=42, rows=rows
+        )
+        == 3
+    )
+
+    with SymbolSnapshot(path) as snapshot:
+        assert snapshot.as_of == datetime.datetime(2025, 1, 1)
+        assert snapshot.change_sequence == 42
+        assert len(snapshot) == 3
+        assert list(snapshot.rows()) == rows
+
+        # strings are interned, columns are fixed-width indices into the string table
+        assert snapshot.string_count == 8
+        assert snapshot.ref_data_uuid.tolist() == [0, 0, 6]
+        assert snapshot.string(snapshot.exchange[2]) == "XNAS"
+
+
+def test_snapshot_is_generated_on_first_request(
+    client: TestClient, snapshot_dir: Path
+) -> None:
+    valid_ref_data_uuid = create_symbol(client, "VALID")
+    create_symbol(client, "LISTED_LATER", start_time="2025-06-01T00:00:00")
+
+    response = client.get("/snapshots/2025-01-01")
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"] == SNAPSHOT_MEDIA_TYPE
+
+    path = snapshot_dir / "symbols-2025-01-01.symsnap"
+    assert path.read_bytes() == response.content
+
+    with SymbolSnapshot(path) as snapshot:
+        assert [(row.ref_data_uuid, row.symbol) for row in snapshot.rows()] == [
+            (valid_ref_data_uuid, "VALID")
+        ]
+
+
+def test_snapshot_is_served_until_regenerated(
+    client: TestClient, snapshot_dir: Path
+) -> None:
+    create_symbol(client, "FIRST")
+    client.get("/snapshots/2025-01-01")
+    create_symbol(client, "SECOND")
+
+    response = client.get("/snapshots/")
+    assert response.status_code == HTTP_200_OK
+    assert response.json()[0]["as_of"] == "2025-01-01"
+    assert response.json()[0]["row_count"] == 1
+    assert response.json()[0]["change_sequence"] == 1
+
+    response = client.post("/snapshots/2025-01-01")
+    assert response.status_code == HTTP_201_CREATED
+    assert response.json()["row_count"] == 2
+    assert response.json()["change_sequence"] == 2
+
+    with SymbolSnapshot(snapshot_dir / "symbols-2025-01-01.symsnap") as snapshot:
+        assert {row.symbol for row in snapshot.rows()} == {"FIRST", "SECOND"}
+
+
+def test_snapshot_is_regenerated_once_a_symbol_changed(
+    client: TestClient, snapshot_dir: Path
+) -> None:
+    create_symbol(client, "FIRST")
+    first_content = client.get("/snapshots/2025-01-01").content
+    path = snapshot_dir / "symbols-2025-01-01.symsnap"
+    write_time = path.stat().st_mtime_ns
+
+    # served as is while nothing changed
+    assert client.get("/snapshots/2025-01-01").content == first_content
+    assert path.stat().st_mtime_ns == write_time
+
+    create_symbol(client, "SECOND")
+
+    response = client.get("/snapshots/2025-01-01")
+    assert response.status_code == HTTP_200_OK
+    with SymbolSnapshot(path) as snapshot:
+        assert snapshot.change_sequence == 2
+        assert {row.symbol for row in snapshot.rows()} == {"FIRST", "SECOND"}
+
+
+def test_snapshots_beyond_max_snapshots_are_deleted(
+    client: TestClient, snapshot_dir: Path
+) -> None:
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        snapshot_dir=snapshot_dir, snapshot_max_snapshots=2
+    )
+    create_symbol(client, "FIRST")
+
+    for as_of in ("2025-01-03", "2025-01-01", "2025-01-02"):
+        assert client.get(f"/snapshots/{as_of}").status_code == HTTP_200_OK
+
+    # the least recently written is deleted, whatever its as-of date
+    response = client.get("/snapshots/")
+    assert [snapshot["as_of"] for snapshot in response.json()] == [
+        "2025-01-01",
+        "2025-01-02",
+    ]
@@ -0,0 +1,197 @@
+import datetime
+
+import pytest
+from sqlmodel import Session
+
+from app.constants import HIGHEST_DATETIME, LOWEST_DATETIME
+from app.internal.change_log import record_changes
+from app.internal.symbol_resolver import ResolvedSymbol, SymbolResolver
+from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation
+from app.tests import TEST_SYMBOLOGY
+
+SPLIT_TIME = datetime.datetime(2020, 1, 1)
+
+
+@pytest.fixture
+def resolver() -> SymbolResolver:
+    resolver = SymbolResolver()
+    resolver.add(
+        [
+            ResolvedSymbol(TEST_SYMBOLOGY, "FB", LOWEST_DATETIME, SPLIT_TIME, "ref-1"),
+            ResolvedSymbol(TEST_SYMBOLOGY, "FB", SPLIT_TIME, HIGHEST_DATETIME, "ref-2"),
+            ResolvedSymbol(
+                TEST_SYMBOLOGY, "META", SPLIT_TIME, HIGHEST_DATETIME, "ref-1"
+            ),
+        ]
+    )
+    return resolver
+
+
+class TestSymbolResolver:
+    def test_resolve_at_different_times(self, resolver: SymbolResolver) -> None:
+        before = SPLIT_TIME - datetime.timedelta(days=1)
+        after = SPLIT_TIME + datetime.timedelta(days=1)
+
+        assert resolver.resolve(symbology=TEST_SYMBOLOGY, symbol="FB", time=before) == {
+            "ref-1"
+        }
+        assert resolver.resolve(symbology=TEST_SYMBOLOGY, symbol="FB", time=after) == {
+            "ref-2"
+        }
+        assert (
+            resolver.resolve(symbology=TEST_SYMBOLOGY, symbol="META", time=before)
+            == set()
+        )
+
+    def test_resolve_includes_interval_bounds(self, resolver: SymbolResolver) -> None:
+        assert resolver.resolve(
+            symbology=TEST_SYMBOLOGY, symbol="FB", time=SPLIT_TIME
+        ) == {"ref-1", "ref-2"}
+
+    def test_resolve_unknown_symbol(self, resolver: SymbolResolver) -> None:
+        assert (
+            resolver.resolve(symbology="OTHER", symbol="FB", time=SPLIT_TIME) == set()
+        )
+        assert resolver.get_intervals(("OTHER", "FB")) is None
+
+    def test_resolve_finds_long_interval_overlapping_later_ones(self) -> None:
+        resolver = SymbolResolver()
+        resolver.add(
+            [
+                ResolvedSymbol(
+                    TEST_SYMBOLOGY, "X", LOWEST_DATETIME, HIGHEST_DATETIME, "ref-long"
+                ),
+                *(
+                    ResolvedSymbol(
+                        TEST_SYMBOLOGY,
+                        "X",
+                        datetime.datetime(2000 + year, 1, 1),
+                        datetime.datetime(2000 + year, 6, 1),
+                        f"ref-{year}",
+                    )
+                    for year in range(10)
+                ),
+            ]
+        )
+
+        assert resolver.resolve(
+            symbology=TEST_SYMBOLOGY, symbol="X", time=datetime.datetime(2005, 9, 1)
+        ) == {"ref-long"}
+        assert resolver.resolve(
+            symbology=TEST_SYMBOLOGY, symbol="X", time=datetime.datetime(2005, 3, 1)
+        ) == {"ref-long", "ref-5"}
+
+    def test_add_same_symbol_twice(self, resolver: SymbolResolver) -> None:
+        count = len(resolver)
+        resolver.add(
+            [
+                ResolvedSymbol(
+                    TEST_SYMBOLOGY, "FB", SPLIT_TIME, HIGHEST_DATETIME, "ref-2"
+                )
+            ]
+        )
+        assert len(resolver) == count
+
+    def test_load_from_database(self, session: Session) -> None:
+        session.add(
+            SymbologySymbolDb(
+                symbol="EURUSD", symbology=TEST_SYMBOLOGY, ref_data_uuid="ref-1"
+            )
+        )
+        session.commit()
+
+        resolver = SymbolResolver()
+        resolver.load(session)
+
+        assert resolver.is_loaded
+        assert resolver.resolve(
+            symbology=TEST_SYMBOLOGY, symbol="EURUSD", time=SPLIT_TIME
+        ) == {"ref-1"}
+
+    def test_resolve_many_matches_resolve(self, resolver: SymbolResolver) -> None:
+        keys = [
+            (TEST_SYMBOLOGY, symbol, SPLIT_TIME + datetime.timedelta(days=days))
+            for days in (3, -3, 0, 1000, -1000)
+            for symbol in ("FB", "META", "UNKNOWN")
+        ]
+
+        assert resolver.resolve_many(keys) == [
+            tuple(
+                sorted(resolver.resolve(symbology=symbology, symbol=symbol, time=time))
+            )
+            for symbology, symbol, time in keys
+        ]
+
+    def test_resolve_many_matches_resolve_with_overlapping_intervals(self) -> None:
+        resolver = SymbolResolver()
+        resolver.add(
+            [
+                ResolvedSymbol(
+                    TEST_SYMBOLOGY,
+                    "X",
+                    datetime.datetime(2000 + year, 1, 1),
+                    datetime.datetime(2000 + year + length, 1, 1),
+                    f"ref-{year}-{length}",
+                )
+                for year, length in ((0, 1), (0, 10), (2, 1), (3, 2), (4, 1), (8, 1))
+            ]
+        )
+        # unsorted, with the bounds of the intervals and duplicates
+        keys = [
+            (TEST_SYMBOLOGY, "X", datetime.datetime(year, month, 1))
+            for year in (2007, 1999, 2004, 2000, 2012, 2003, 2009, 2004, 2010)
+            for month in (1, 6)
+        ]
+
+        assert resolver.resolve_many(keys) == [
+            tuple(
+                sorted(resolver.resolve(symbology=symbology, symbol=symbol, time=time))
+            )
+            for symbology, symbol, time in keys
+        ]
+
+    def test_catch_up_with_new_intervals_of_known_pairs(self, session: Session) -> None:
+        session.add(
+            SymbologySymbolDb(
+                symbol="FB",
+                symbology=TEST_SYMBOLOGY,
+                end_time=SPLIT_TIME,
+                ref_data_uuid="ref-1",
+            )
+        )
+        session.commit()
+        resolver = SymbolResolver()
+        resolver.load(session)
+        after = SPLIT_TIME + datetime.timedelta(days=1)
+        assert (
+            resolver.resolve(symbology=TEST_SYMBOLOGY, symbol="FB", time=after) == set()
+        )
+
+        # committed by another worker, e.g. scripts/import_symbols.py
+        rows = [
+            SymbologySymbolDb(
+                symbol=symbol,
+                symbology=TEST_SYMBOLOGY,
+                start_time=SPLIT_TIME,
+                ref_data_uuid=ref_data_uuid,
+            )
+            for symbol, ref_data_uuid in (("FB", "ref-2"), ("META", "ref-1"))
+        ]
+        session.add_all(rows)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=[row.model_dump() for row in rows],
+        )
+        session.commit()
+        resolver.catch_up(session)
+
+        assert resolver.resolve(symbology=TEST_SYMBOLOGY, symbol="FB", time=after) == {
+            "ref-2"
+        }
+        assert resolver.resolve(
+            symbology=TEST_SYMBOLOGY, symbol="META", time=after
+        ) == {"ref-1"}
+        assert len(resolver) == 3
@@ -1,11 +1,28 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
 from starlette.status import (
     HTTP_201_CREATED,
     HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_207_MULTI_STATUS,
+    HTTP_404_NOT_FOUND,
+    HTTP_406_NOT_ACCEPTABLE,
+    HTTP_422_UNPROCESSABLE_ENTITY,
 )
 from starlette.testclient import TestClient
 
+from app.internal import symbols_ingestion
+from app.internal.change_log import record_changes
+from app.internal.formats import ARROW_STREAM_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from app.internal.pagination import NEXT_CURSOR_HEADER
+from app.internal.streaming import NDJSON_MEDIA_TYPE
+from app.schemas import SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation
 from app.tests import TEST_SYMBOLOGY
 
 
@@ -216,6 +233,118 @@ class TestNewSymbol:
             "Second item should be different."
         )
 
+    def test_same_symbol_twice_in_one_request(self, client: TestClient) -> None:
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [
+                        {
+                            "symbol": "NEW_SYMBOL",
+                        }
+                    ]
+                },
+            },
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [
+                        {
+                            "symbol": "NEW_SYMBOL",
+                        }
+                    ]
+                },
+            },
+        ]
+
+        response = client.post("/symbols/", json=spec)
+        assert response.status_code == HTTP_207_MULTI_STATUS, (
+            "Second item should see the symbol created by the first one."
+        )
+
+    def test_each_item_reports_its_own_ref_data_uuid(self, client: TestClient) -> None:
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": f"OTHER_SYMBOL_{i}"}],
+                }
+            }
+            for i in range(3)
+        ]
+
+        response = client.post("/symbols/", json=spec)
+        assert response.status_code == HTTP_201_CREATED
+
+        for i, item in enumerate(response.json()):
+            symbol = client.get(f"/symbols/{item['ref_data_uuid']}").json()
+            assert symbol["symbology_map"][TEST_SYMBOLOGY][0]["symbol"] == (
+                f"SYMBOL_{i}"
+            ), "Items should be reported in input order, with their own ref_data_uuid."
+
+    def test_symbols_of_different_ref_data_uuids(self, client: TestClient) -> None:
+        for symbol in ("FIRST_SYMBOL", "SECOND_SYMBOL"):
+            client.post(
+                "/symbols/",
+                json=[{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": symbol}]}}],
+            )
+
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [
+                        {"symbol": "FIRST_SYMBOL"},
+                        {"symbol": "SECOND_SYMBOL"},
+                    ],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": "NEW_SYMBOL"}],
+                }
+            }
+        ]
+
+        response = client.post("/symbols/", json=spec)
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json()[0]["ref_data_uuid"] is None
+        assert response.json()[0]["error"].startswith("Multiple ref_data_uuids")
+
+        response = client.get("/symbols/", params={"symbology": "ANOTHER_SYMBOLOGY"})
+        assert response.json() == [], (
+            "No symbol of the rejected item should be created."
+        )
+
+    def test_rows_inserted_in_chunks(
+        self,
+        client: TestClient,
+        async_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(symbols_ingestion, "SYMBOLS_INSERT_CHUNK_SIZE", 4)
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": f"SYMBOL_{i}"}],
+                }
+            }
+            for i in range(5)
+        ]
+
+        inserts: list[int] = []
+
+        def count_inserts(conn, cursor, statement, parameters, *args) -> None:
+            if statement.startswith("INSERT INTO symbologysymboldb"):
+                inserts.append(len(parameters))
+
+        sync_engine = async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_inserts)
+        try:
+            response = client.post("/symbols/", json=spec)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_inserts)
+        assert response.status_code == HTTP_201_CREATED
+        assert inserts == [4, 4, 2], "Should insert 10 rows in chunks of 4."
+
+        response = client.get("/symbols/")
+        assert len(response.json()) == 5
+        assert all(len(x["symbology_map"]) == 2 for x in response.json())
+
 
 class TestAllSymbols:
     def test_get_all_empty(self, client: TestClient) -> None:
@@ -237,6 +366,282 @@ class TestAllSymbols:
             "Should have a ref_data_uuid populated."
         )
 
+    def test_get_all_not_modified(self, client: TestClient) -> None:
+        response = client.get("/symbols/")
+        etag = response.headers["ETag"]
+
+        response = client.get("/symbols/", headers={"If-None-Match": f'"0", {etag}'})
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+        client.post(
+            "/symbols/",
+            json=[{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}}],
+        )
+
+        response = client.get("/symbols/", headers={"If-None-Match": etag})
+        assert response.status_code == HTTP_200_OK, (
+            "Creating a symbol should change the ETag."
+        )
+        assert response.headers["ETag"] != etag
+        assert len(response.json()) == 1
+
+    def test_get_all_in_pages(self, client: TestClient) -> None:
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": f"SYMBOL_{i}"}],
+                }
+            }
+            for i in range(5)
+        ]
+        client.post("/symbols/", json=spec)
+
+        rows: list[tuple[str, str]] = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+            response = client.get("/symbols/", params=params)
+            assert response.status_code == HTTP_200_OK
+            pages += 1
+
+            for item in response.json():
+                for symbology in item["symbology_map"]:
+                    rows.append((item["ref_data_uuid"], symbology))
+
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if cursor is None:
+                break
+
+        assert pages == 4, "10 rows should be returned in 4 pages of 3."
+        assert len(rows) == 10
+        assert len(set(rows)) == 10, "Each row should be returned exactly once."
+        assert rows == sorted(rows), "Rows should be ordered by ref_data_uuid."
+
+    def test_get_all_filtered_by_symbology_and_time(self, client: TestClient) -> None:
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [
+                        {"symbol": "OLD", "end_time": "2020-01-01T00:00:00"},
+                        {"symbol": "NEW", "start_time": "2020-01-01T00:00:00"},
+                    ],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": "OTHER"}],
+                }
+            }
+        ]
+        client.post("/symbols/", json=spec)
+
+        response = client.get(
+            "/symbols/",
+            params={"symbology": TEST_SYMBOLOGY, "valid_from": "2021-01-01T00:00:00"},
+        )
+        assert response.status_code == HTTP_200_OK
+        assert list(response.json()[0]["symbology_map"]) == [TEST_SYMBOLOGY]
+        assert [
+            x["symbol"] for x in response.json()[0]["symbology_map"][TEST_SYMBOLOGY]
+        ] == ["NEW"]
+
+    def test_get_all_with_invalid_cursor(self, client: TestClient) -> None:
+        response = client.get("/symbols/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_get_all_as_arrow(self, client: TestClient) -> None:
+        pa = pytest.importorskip("pyarrow")
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}", "exchange": "XNAS"}],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": f"SYMBOL_{i}"}],
+                }
+            }
+            for i in range(2)
+        ]
+        client.post("/symbols/", json=spec)
+
+        headers = {"Accept": ARROW_STREAM_MEDIA_TYPE}
+        response = client.get("/symbols/", params={"limit": 3}, headers=headers)
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+        assert response.headers["vary"] == "Accept"
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 3
+        assert pa.types.is_dictionary(table.schema.field("symbology").type)
+        assert table.schema.field("start_time").type == pa.timestamp("us")
+
+        response = client.get(
+            "/symbols/",
+            params={"cursor": response.headers[NEXT_CURSOR_HEADER]},
+            headers=headers,
+        )
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 1
+        assert table.column("exchange").to_pylist() == ["XNAS"]
+
+    def test_get_all_as_msgpack(self, client: TestClient) -> None:
+        msgpack = pytest.importorskip("msgpack")
+        client.post(
+            "/symbols/",
+            json=[{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}}],
+        )
+
+        response = client.get("/symbols/", headers={"Accept": MSGPACK_MEDIA_TYPE})
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert msgpack.unpackb(response.content) == client.get("/symbols/").json()
+
+    def test_get_all_etag_per_format(self, client: TestClient) -> None:
+        pytest.importorskip("pyarrow")
+        headers = {"Accept": ARROW_STREAM_MEDIA_TYPE}
+        json_etag = client.get("/symbols/").headers["ETag"]
+        arrow_etag = client.get("/symbols/", headers=headers).headers["ETag"]
+        assert arrow_etag != json_etag
+
+        response = client.get(
+            "/symbols/", headers=headers | {"If-None-Match": json_etag}
+        )
+        assert response.status_code == HTTP_200_OK
+        response = client.get(
+            "/symbols/", headers=headers | {"If-None-Match": arrow_etag}
+        )
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_get_all_not_acceptable(self, client: TestClient) -> None:
+        response = client.get("/symbols/", headers={"Accept": "text/csv"})
+        assert response.status_code == HTTP_406_NOT_ACCEPTABLE
+
+
+class TestExportSymbols:
+    def test_export_empty(self, client: TestClient) -> None:
+        response = client.get("/symbols/export")
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        assert response.text == ""
+
+    def test_export_one_line_per_ref_data_uuid(self, client: TestClient) -> None:
+        spec = [
+            {
+                "symbology_map": {
+                    TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}],
+                    "ANOTHER_SYMBOLOGY": [{"symbol": f"SYMBOL_{i}"}],
+                }
+            }
+            for i in range(3)
+        ]
+        created = client.post("/symbols/", json=spec).json()
+
+        response = client.get("/symbols/export")
+        assert response.status_code == HTTP_200_OK
+
+        lines = [json.loads(line) for line in response.iter_lines()]
+        assert sorted(x["ref_data_uuid"] for x in lines) == sorted(
+            x["ref_data_uuid"] for x in created
+        )
+        assert all(len(x["symbology_map"]) == 2 for x in lines)
+
+    def test_export_as_arrow(self, client: TestClient) -> None:
+        pa = pytest.importorskip("pyarrow")
+        spec = [
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+            for i in range(3)
+        ]
+        client.post("/symbols/", json=spec)
+
+        response = client.get(
+            "/symbols/export", headers={"Accept": ARROW_STREAM_MEDIA_TYPE}
+        )
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert sorted(table.column("symbol").to_pylist()) == [
+            "SYMBOL_0",
+            "SYMBOL_1",
+            "SYMBOL_2",
+        ]
+        assert table.column("symbology").to_pylist() == [TEST_SYMBOLOGY] * 3
+
+    def test_export_as_msgpack(self, client: TestClient) -> None:
+        msgpack = pytest.importorskip("msgpack")
+        spec = [
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+            for i in range(3)
+        ]
+        client.post("/symbols/", json=spec)
+
+        response = client.get("/symbols/export", headers={"Accept": MSGPACK_MEDIA_TYPE})
+        assert response.status_code == HTTP_200_OK
+
+        documents = list(msgpack.Unpacker(io.BytesIO(response.content)))
+        lines = [
+            json.loads(line) for line in client.get("/symbols/export").iter_lines()
+        ]
+        assert documents == lines
+
+
+class TestSymbolChanges:
+    def test_get_changes_after_sequence(self, client: TestClient) -> None:
+        response = client.get("/symbols/changes")
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == {"changes": [], "next_since": 0, "has_more": False}
+
+        response = client.post(
+            "/symbols/",
+            json=[
+                {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}},
+                {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "GBPUSD"}]}},
+            ],
+        )
+        ref_data_uuids = [item["ref_data_uuid"] for item in response.json()]
+
+        response = client.get("/symbols/changes")
+        page = response.json()
+        assert not page["has_more"]
+        assert [change["ref_data_uuid"] for change in page["changes"]] == ref_data_uuids
+        assert page["changes"][0]["payload"] == {
+            "ref_data_uuid": ref_data_uuids[0],
+            "symbology": TEST_SYMBOLOGY,
+            "symbol": "EURUSD",
+            "exchange": None,
+            "start_time": "1900-01-01T00:00:00",
+            "end_time": "2099-12-31T00:00:00",
+        }
+        assert page["next_since"] == page["changes"][-1]["sequence"]
+
+        client.post(
+            "/symbols/",
+            json=[{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "USDJPY"}]}}],
+        )
+
+        response = client.get("/symbols/changes", params={"since": page["next_since"]})
+        assert [
+            change["payload"]["symbol"] for change in response.json()["changes"]
+        ] == ["USDJPY"], "Should only return changes made after the sequence."
+
+    def test_get_changes_in_pages(self, client: TestClient) -> None:
+        client.post(
+            "/symbols/",
+            json=[
+                {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": f"SYMBOL_{i}"}]}}
+                for i in range(5)
+            ],
+        )
+
+        symbols, since, has_more = [], 0, True
+        while has_more:
+            response = client.get(
+                "/symbols/changes", params={"since": since, "limit": 2}
+            )
+            page = response.json()
+            symbols.extend(change["payload"]["symbol"] for change in page["changes"])
+            since, has_more = page["next_since"], page["has_more"]
+
+        assert symbols == [f"SYMBOL_{i}" for i in range(5)]
+
 
 class TestGetSymbolsByRefDataUUID:
     def test_get_symbol_by_ref_data_uuid(
@@ -268,3 +673,282 @@ class TestGetSymbolsByRefDataUUID:
         assert response.json()["ref_data_uuid"] == ref_data_uuid, (
             "Should return the correct symbol by ref_data_uuid."
         )
+
+    def test_get_symbol_by_ref_data_uuid_not_modified(
+        self, new_symbol_ref_data_uuid, client: TestClient, async_engine: AsyncEngine
+    ) -> None:
+        response = client.get(f"/symbols/{new_symbol_ref_data_uuid}")
+        etag = response.headers["ETag"]
+
+        statements: list[str] = []
+
+        def capture(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(
+                f"/symbols/{new_symbol_ref_data_uuid}", headers={"If-None-Match": etag}
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+        assert len(statements) == 1
+        assert "symbologysymboldb" not in statements[0], (
+            "Should only read the change sequence."
+        )
+
+    def test_get_symbol_by_unknown_ref_data_uuid(self, client: TestClient) -> None:
+        response = client.get("/symbols/does-not-exist")
+        assert response.status_code == HTTP_404_NOT_FOUND
+
+    def test_get_symbol_by_ref_data_uuid_from_cache(
+        self,
+        new_symbol_ref_data_uuid,
+        client: TestClient,
+        async_engine: AsyncEngine,
+        admin_headers: dict[str, str],
+    ) -> None:
+        response = client.get(f"/symbols/{new_symbol_ref_data_uuid}")
+        assert response.status_code == HTTP_200_OK
+
+        statements: list[str] = []
+
+        def capture(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            cached = client.get(f"/symbols/{new_symbol_ref_data_uuid}")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        assert cached.content == response.content
+        assert cached.headers["ETag"] == response.headers["ETag"]
+        assert len(statements) == 1, (
+            f"Should only read the change sequence, got {statements}."
+        )
+
+        stats = client.get("/admin/caches", headers=admin_headers).json()["symbols"]
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_get_symbol_by_ref_data_uuid_after_symbols_created(
+        self, client: TestClient, admin_headers: dict[str, str]
+    ) -> None:
+        spec = [{"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "CACHED"}]}}]
+        ref_data_uuid = client.post("/symbols/", json=spec).json()[0]["ref_data_uuid"]
+        response = client.get(f"/symbols/{ref_data_uuid}")
+        assert list(response.json()["symbology_map"]) == [TEST_SYMBOLOGY]
+
+        spec[0]["symbology_map"]["ANOTHER_SYMBOLOGY"] = [{"symbol": "CACHED"}]
+        assert client.post("/symbols/", json=spec).status_code == HTTP_201_CREATED
+
+        response = client.get(f"/symbols/{ref_data_uuid}")
+        assert sorted(response.json()["symbology_map"]) == sorted(
+            ["ANOTHER_SYMBOLOGY", TEST_SYMBOLOGY]
+        )
+        stats = client.get("/admin/caches", headers=admin_headers).json()["symbols"]
+        assert stats["invalidations"] == 1
+
+    def test_get_symbol_by_ref_data_uuid_after_symbols_written_by_another_worker(
+        self, new_symbol_ref_data_uuid, client: TestClient, session
+    ) -> None:
+        url = f"/symbols/{new_symbol_ref_data_uuid}"
+        assert list(client.get(url).json()["symbology_map"]) == [TEST_SYMBOLOGY]
+
+        # written without going through this worker, e.g. by scripts/import_symbols.py
+        row = SymbologySymbolDb(
+            ref_data_uuid=new_symbol_ref_data_uuid,
+            symbology="ANOTHER_SYMBOLOGY",
+            symbol="EURUSD",
+        )
+        session.add(row)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=[row.model_dump()],
+        )
+        session.commit()
+
+        assert sorted(client.get(url).json()["symbology_map"]) == sorted(
+            ["ANOTHER_SYMBOLOGY", TEST_SYMBOLOGY]
+        )
+
+    def test_get_symbol_by_ref_data_uuid_after_multi_row_commits_of_another_worker(
+        self, new_symbol_ref_data_uuid, client: TestClient, session
+    ) -> None:
+        def write_symbols(ref_data_uuid: str, *symbologies: str) -> None:
+            # written without going through this worker, one commit for all rows
+            rows = [
+                SymbologySymbolDb(
+                    ref_data_uuid=ref_data_uuid, symbology=symbology, symbol="EURUSD"
+                )
+                for symbology in symbologies
+            ]
+            session.add_all(rows)
+            record_changes(
+                session=session,
+                entity=ChangeEntity.SYMBOL,
+                operation=ChangeOperation.CREATE,
+                rows=[row.model_dump() for row in rows],
+            )
+            session.commit()
+
+        url = f"/symbols/{new_symbol_ref_data_uuid}"
+        assert list(client.get(url).json()["symbology_map"]) == [TEST_SYMBOLOGY]
+
+        # several change log rows for a single commit of another ref_data_uuid
+        write_symbols("ref-written-by-another-worker", "SYMBOLOGY_A", "SYMBOLOGY_B")
+        assert client.get("/symbols/ref-written-by-another-worker").status_code == (
+            HTTP_200_OK
+        )
+
+        write_symbols(new_symbol_ref_data_uuid, "ANOTHER_SYMBOLOGY")
+        assert sorted(client.get(url).json()["symbology_map"]) == sorted(
+            ["ANOTHER_SYMBOLOGY", TEST_SYMBOLOGY]
+        )
+
+
+class TestResolveSymbols:
+    def test_resolve_new_interval_written_by_another_worker(
+        self, new_symbol_ref_data_uuid, client: TestClient, session
+    ) -> None:
+        request = {
+            "keys": [
+                {
+                    "symbology": TEST_SYMBOLOGY,
+                    "symbol": "EURUSD",
+                    "as_of": "2025-01-01T00:00:00",
+                }
+            ]
+        }
+        assert client.post("/symbols/resolve", json=request).json() == [
+            {
+                "status": "FOUND",
+                "ref_data_uuid": new_symbol_ref_data_uuid,
+                "candidates": None,
+            }
+        ]
+
+        # a pair the resolver of this worker already knows, written without going through this worker
+        row = SymbologySymbolDb(
+            ref_data_uuid="ref-written-by-another-worker",
+            symbology=TEST_SYMBOLOGY,
+            symbol="EURUSD",
+        )
+        session.add(row)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=[row.model_dump()],
+        )
+        session.commit()
+
+        assert client.post("/symbols/resolve", json=request).json() == [
+            {
+                "status": "AMBIGUOUS",
+                "ref_data_uuid": None,
+                "candidates": sorted(
+                    [new_symbol_ref_data_uuid, "ref-written-by-another-worker"]
+                ),
+            }
+        ]
+
+    def test_resolve_keys(self, new_symbol_ref_data_uuid, client: TestClient) -> None:
+        request = {
+            "keys": [
+                {
+                    "symbology": TEST_SYMBOLOGY,
+                    "symbol": "EURUSD",
+                    "as_of": "2025-01-01T00:00:00",
+                },
+                {
+                    "symbology": TEST_SYMBOLOGY,
+                    "symbol": "DOES_NOT_EXIST",
+                    "as_of": "2025-01-01T00:00:00",
+                },
+            ]
+        }
+
+        response = client.post("/symbols/resolve", json=request)
+        assert response.status_code == HTTP_200_OK
+        assert response.json()[0]["status"] == "FOUND"
+        assert response.json()[0]["ref_data_uuid"] == new_symbol_ref_data_uuid
+        assert response.json()[1]["status"] == "NOT_FOUND"
+        assert response.json()[1]["ref_data_uuid"] is None
+
+    def test_resolve_columnar_arrays_in_input_order(self, client: TestClient) -> None:
+        spec = [
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": symbol}]}}
+            for symbol in ("EURUSD", "GBPUSD")
+        ]
+        ref_data_uuids = [
+            x["ref_data_uuid"] for x in client.post("/symbols/", json=spec).json()
+        ]
+
+        request = {
+            "symbology": [TEST_SYMBOLOGY] * 3,
+            "symbol": ["GBPUSD", "EURUSD", "GBPUSD"],
+            "as_of": [
+                "2025-01-01T00:00:00",
+                "2024-01-01T00:00:00",
+                "2023-01-01T00:00:00",
+            ],
+        }
+
+        response = client.post("/symbols/resolve", json=request)
+        assert response.status_code == HTTP_200_OK
+        assert [x["ref_data_uuid"] for x in response.json()] == [
+            ref_data_uuids[1],
+            ref_data_uuids[0],
+            ref_data_uuids[1],
+        ]
+
+    def test_resolve_ambiguous_symbol(self, client: TestClient) -> None:
+        spec = [
+            {"symbology_map": {TEST_SYMBOLOGY: [{"symbol": "EURUSD"}]}},
+            {"symbology_map": {"ANOTHER_SYMBOLOGY": [{"symbol": "EURUSD"}]}},
+        ]
+        client.post("/symbols/", json=spec)
+        # define the same symbol in the same symbology for the second ref_data_uuid
+        client.post(
+            "/symbols/",
+            json=[
+                {
+                    "symbology_map": {
+                        "ANOTHER_SYMBOLOGY": [{"symbol": "EURUSD"}],
+                        TEST_SYMBOLOGY: [
+                            {"symbol": "EURUSD", "start_time": "2020-01-01T00:00:00"}
+                        ],
+                    }
+                }
+            ],
+        )
+
+        request = {
+            "keys": [
+                {
+                    "symbology": TEST_SYMBOLOGY,
+                    "symbol": "EURUSD",
+                    "as_of": "2025-01-01T00:00:00",
+                }
+            ]
+        }
+
+        response = client.post("/symbols/resolve", json=request)
+        assert response.json()[0]["status"] == "AMBIGUOUS"
+        assert len(response.json()[0]["candidates"]) == 2
+
+    def test_resolve_requires_keys_or_columns(self, client: TestClient) -> None:
+        request = {
+            "keys": [],
+            "symbology": [TEST_SYMBOLOGY],
+            "symbol": ["EURUSD"],
+            "as_of": ["2025-01-01T00:00:00"],
+        }
+
+        response = client.post("/symbols/resolve", json=request)
+        assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
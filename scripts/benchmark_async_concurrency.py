@@ -0,0 +1,183 @@
+"""
+Benchmark request latency under parallel load, comparing endpoints running their queries on a synchronous session
+(blocking the event loop, as before the async database layer) against the async session used by the endpoints.
+
+Requests for symbol pages, symbols by ref_data_uuid, and the root endpoint (which does not touch the database) are
+sent at a fixed rate, and p50 and p99 latencies are reported for each endpoint.
+
+Usage:
+    uv run python -m scripts.benchmark_async_concurrency --symbols 50000 --rate 100 --requests 3000
+"""
+
+import argparse
+import asyncio
+import datetime
+import math
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import HIGHEST_DATETIME
+from app.dependencies import get_async_session, get_symbol_resolver
+from app.internal.symbol_resolver import SymbolResolver
+from app.main import app
+from app.schemas import SymbologySymbolDb
+
+SYMBOLOGIES = ("BLOOMBERG", "REUTERS", "ISIN")
+
+
+class BlockingSession:
+    """The part of the async session interface used by the read endpoints, on top of a synchronous session."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def exec(self, statement):
+        return self._session.exec(statement)
+
+
+def populate_database(database_path: Path, symbols: int) -> list[str]:
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    start_time = datetime.datetime(2000, 1, 1)
+    ref_data_uuids = [f"ref-{i:012d}" for i in range(symbols // len(SYMBOLOGIES))]
+    with engine.begin() as connection:
+        connection.execute(
+            insert(SymbologySymbolDb),
+            [
+                {
+                    "ref_data_uuid": ref_data_uuid,
+                    "symbology": symbology,
+                    "symbol": f"{symbology}_{ref_data_uuid}",
+                    "exchange": "XNAS",
+                    "start_time": start_time,
+                    "end_time": HIGHEST_DATETIME,
+                }
+                for ref_data_uuid in ref_data_uuids
+                for symbology in SYMBOLOGIES
+            ],
+        )
+    engine.dispose()
+    return ref_data_uuids
+
+
+def override_sessions(database_path: Path, blocking: bool) -> AsyncEngine | None:
+    if blocking:
+        engine = create_engine(
+            f"sqlite:///{database_path}", connect_args={"check_same_thread": False}
+        )
+
+        async def get_session_override():
+            with Session(engine) as session:
+                yield BlockingSession(session)
+
+    else:
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+
+        async def get_session_override():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+    resolver = SymbolResolver()
+    app.dependency_overrides[get_async_session] = get_session_override
+    app.dependency_overrides[get_symbol_resolver] = lambda: resolver
+
+    return None if blocking else async_engine
+
+
+async def run_load(
+    ref_data_uuids: list[str],
+    rate: float,
+    requests: int,
+    async_engine: AsyncEngine | None,
+) -> dict[str, list[float]]:
+    """
+    Send requests at a fixed rate, regardless of how fast previous ones complete.
+
+    Latencies are measured from the time each request was scheduled at, so requests delayed by a blocked event loop
+    count as slow, instead of being silently sent later.
+    """
+    latencies: dict[str, list[float]] = {"page": [], "by_uuid": [], "root": []}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        async def scheduled_get(name: str, url: str, delay: float) -> None:
+            await asyncio.sleep(delay)
+            response = await client.get(url)
+            latencies[name].append(loop.time() - started - delay)
+            response.raise_for_status()
+
+        tasks = []
+        for i in range(requests):
+            delay = i / rate
+            if i % 3 == 0:
+                tasks.append(scheduled_get("page", "/symbols/?limit=1000", delay))
+            elif i % 3 == 1:
+                ref_data_uuid = random.choice(ref_data_uuids)
+                tasks.append(
+                    scheduled_get("by_uuid", f"/symbols/{ref_data_uuid}", delay)
+                )
+            else:
+                tasks.append(scheduled_get("root", "/", delay))
+
+        await asyncio.gather(*tasks)
+
+    # pooled aiosqlite connections run in their own threads, which would keep the process alive
+    if async_engine is not None:
+        await async_engine.dispose()
+
+    return latencies
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """Nearest-rank percentile, defined for any non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark latency under parallel load"
+    )
+    parser.add_argument(
+        "--symbols", type=int, default=50_000, help="Number of symbols in the database"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=100, help="Requests sent per second"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=3_000, help="Number of requests"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = Path(directory) / "benchmark.db"
+        ref_data_uuids = populate_database(database_path, args.symbols)
+
+        for name, blocking in (("sync", True), ("async", False)):
+            async_engine = override_sessions(database_path, blocking=blocking)
+            started = time.perf_counter()
+            latencies = asyncio.run(
+                run_load(ref_data_uuids, args.rate, args.requests, async_engine)
+            )
+            print(f"{name:>5}: {time.perf_counter() - started:8.3f} s total")
+            for endpoint, values in latencies.items():
+                print(
+                    f"{name:>5} {endpoint:>8}: {len(values):6d} requests, "
+                    f"p50 {percentile(values, 50) * 1e3:8.2f} ms, "
+                    f"p99 {percentile(values, 99) * 1e3:8.2f} ms"
+                )
+
+    app.dependency_overrides.clear()
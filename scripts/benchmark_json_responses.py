@@ -0,0 +1,128 @@
+"""
+Benchmark rendering JSON responses with the standard library `json` module, as Starlette's `JSONResponse` does,
+against orjson, as `FastJSONResponse` (the default response class of the application) does, on representative
+payloads:
+
+- a page of symbols, as built by `GET /symbols/` from database rows;
+- a page of corporate actions, serialized by the response model of `GET /corpActions/` then rendered;
+- the validation error response of a large invalid `POST /symbols/` body, with errors and body echoed back.
+
+Usage:
+    uv run python -m scripts.benchmark_json_responses --rows 200000
+"""
+
+import argparse
+import datetime
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from starlette.responses import JSONResponse
+
+from app.constants import HIGHEST_DATETIME
+from app.internal.responses import FastJSONResponse
+from app.internal.symbols_helpers import iter_symbol_rows_as_public_dicts
+from app.schemas import SymbologySymbolCreate
+from app.schemas.corp_actions import CorpActionPublic, CorpActionsTypes
+
+SYMBOLOGIES = ("BLOOMBERG", "REUTERS", "ISIN", "FIGI", "TICKER")
+
+
+def symbols_page(rows: int) -> list[dict[str, Any]]:
+    start_time = datetime.datetime(2000, 1, 1)
+    return list(
+        iter_symbol_rows_as_public_dicts(
+            (
+                f"ref-{i // len(SYMBOLOGIES):012d}",
+                SYMBOLOGIES[i % len(SYMBOLOGIES)],
+                f"SYMBOL_{i}",
+                "XNAS",
+                start_time,
+                HIGHEST_DATETIME,
+            )
+            for i in range(rows)
+        )
+    )
+
+
+def corp_actions_page(rows: int) -> list[Any]:
+    corp_actions = [
+        CorpActionPublic(
+            ref_data_uuid=f"ref-{i:012d}",
+            effective_time=datetime.datetime(2000, 1, 1)
+            + datetime.timedelta(minutes=i),
+            action_type=CorpActionsTypes.STOCK_SPLIT,
+            multiplicative_adjustment=0.5,
+            additive_adjustment=0.0,
+        )
+        for i in range(rows)
+    ]
+    # what FastAPI hands over to the response class, once serialized by the response model
+    return TypeAdapter(list[CorpActionPublic]).dump_python(corp_actions, mode="json")
+
+
+def validation_error(rows: int) -> dict[str, Any]:
+    # start time after end time, rejected by the model validator of each spec
+    body = [
+        {
+            "symbology_map": {
+                "BLOOMBERG": [
+                    {
+                        "symbol": f"SYMBOL_{i}",
+                        "start_time": "2025-01-02T00:00:00",
+                        "end_time": "2025-01-01T00:00:00",
+                    }
+                ]
+            }
+        }
+        for i in range(rows // 10)
+    ]
+    try:
+        TypeAdapter(list[SymbologySymbolCreate]).validate_python(body)
+    except ValidationError as exc:
+        errors = exc.errors()
+    return {"error": "Invalid request.", "detail": errors, "body": body}
+
+
+def render_default(content: Any) -> bytes:
+    """Rendering of the default response class of FastAPI, after `jsonable_encoder` as in the error handler."""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def render_default_trusted(content: Any) -> bytes:
+    """Rendering of the default response class of FastAPI, for content already serialized by a response model."""
+    return JSONResponse(content).body
+
+
+def render_fast(content: Any) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def timed(render: Callable[[Any], bytes], content: Any) -> tuple[float, int]:
+    started = time.perf_counter()
+    size = len(render(content))
+    return time.perf_counter() - started, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON responses rendering")
+    parser.add_argument(
+        "--rows", type=int, default=200_000, help="Number of rows per payload"
+    )
+    args = parser.parse_args()
+
+    payloads: list[tuple[str, Any, Callable[[Any], bytes]]] = [
+        ("symbols page", symbols_page(args.rows), render_default_trusted),
+        ("corp actions page", corp_actions_page(args.rows), render_default_trusted),
+        ("validation error", validation_error(args.rows), render_default),
+    ]
+
+    for name, content, render_before in payloads:
+        before, size = timed(render_before, content)
+        after, _ = timed(render_fast, content)
+        print(
+            f"{name:>18}: {size / 1e6:7.1f} MB, json {before:7.3f} s, orjson {after:7.3f} s, "
+            f"{before / after:5.1f}x"
+        )
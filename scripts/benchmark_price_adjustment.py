@@ -0,0 +1,163 @@
+"""
+Benchmark adjusting price series for corporate actions, comparing factors applied row by row in Python against the
+vectorized adjustment of `POST /corpActions/adjust`, on its own and end to end through the endpoint.
+
+Usage:
+    uv run python -m scripts.benchmark_price_adjustment --points 1000000 --corp-actions 50
+"""
+
+import argparse
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+from pydantic_core import to_json
+from sqlalchemy import create_engine, insert
+from sqlmodel import Session, SQLModel
+
+from app.dependencies import get_adjustment_curves, get_session
+from app.internal.adjustment_curves import (
+    AdjustmentBreakpoint,
+    AdjustmentCurve,
+    AdjustmentCurveCache,
+)
+from app.internal.snapshots import datetime_to_epoch_us, epoch_us_to_datetime
+from app.main import app
+from app.schemas.corp_actions import CorpActionDb, CorpActionsTypes
+
+REF_DATA_UUID = "ref-000000000001"
+FIRST_DAY = datetime.datetime(2000, 1, 1)
+LAST_DAY = datetime.datetime(2025, 1, 1)
+
+
+def generate_corp_actions(count: int) -> list[CorpActionDb]:
+    generator = random.Random(42)
+    days = generator.sample(range((LAST_DAY - FIRST_DAY).days), count)
+    return [
+        CorpActionDb(
+            ref_data_uuid=REF_DATA_UUID,
+            effective_time=FIRST_DAY + datetime.timedelta(days=day),
+            action_type=CorpActionsTypes.STOCK_SPLIT,
+            multiplicative_adjustment=generator.choice([0.5, 0.25, 2.0]),
+            additive_adjustment=generator.choice([0.0, -0.1]),
+        )
+        for day in sorted(days)
+    ]
+
+
+def generate_series(points: int) -> tuple[np.ndarray, np.ndarray]:
+    generator = np.random.default_rng(42)
+    timestamps = generator.integers(
+        datetime_to_epoch_us(FIRST_DAY), datetime_to_epoch_us(LAST_DAY), size=points
+    )
+    return np.sort(timestamps), generator.uniform(1.0, 100.0, size=points)
+
+
+def benchmark_row_by_row(
+    corp_actions: list[CorpActionDb], timestamps: np.ndarray, prices: np.ndarray
+) -> float:
+    """Each price adjusted by all corporate actions effective after it, as research jobs do."""
+    started = time.perf_counter()
+    for timestamp, price in zip(timestamps.tolist(), prices.tolist()):
+        observed_at = epoch_us_to_datetime(timestamp)
+        for corp_action in corp_actions:
+            if corp_action.effective_time > observed_at:
+                price = (
+                    price * corp_action.multiplicative_adjustment
+                    + corp_action.additive_adjustment
+                )
+    return time.perf_counter() - started
+
+
+def benchmark_vectorized(
+    corp_actions: list[CorpActionDb], timestamps: np.ndarray, prices: np.ndarray
+) -> float:
+    curve = AdjustmentCurve(
+        AdjustmentBreakpoint.from_corp_action(corp_action)
+        for corp_action in corp_actions
+    )
+    end = max(curve.effective_times)
+
+    started = time.perf_counter()
+    curve.adjust_prices(timestamps, prices, end)
+    return time.perf_counter() - started
+
+
+def benchmark_endpoint(
+    corp_actions: list[CorpActionDb], timestamps: np.ndarray, prices: np.ndarray
+) -> float:
+    """Request validation, adjustment and response serialization, the curve being cached already."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'benchmark.db'}")
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(CorpActionDb),
+                [corp_action.model_dump() for corp_action in corp_actions],
+            )
+
+        def get_session_override():
+            with Session(engine) as session:
+                yield session
+
+        adjustment_curves = AdjustmentCurveCache(max_curves=1)
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_adjustment_curves] = lambda: adjustment_curves
+        client = TestClient(app)
+
+        series = {"ref_data_uuid": REF_DATA_UUID, "timestamps": [0], "prices": [1.0]}
+        # warm up the curve cache
+        client.post("/corpActions/adjust", json=[series])
+
+        # encoded beforehand, as encoding with the json module takes longer than the request itself
+        body = to_json(
+            [
+                {
+                    **series,
+                    "timestamps": timestamps.tolist(),
+                    "prices": prices.tolist(),
+                }
+            ]
+        )
+        started = time.perf_counter()
+        response = client.post(
+            "/corpActions/adjust",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+
+        app.dependency_overrides.clear()
+        return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark price series adjustment")
+    parser.add_argument(
+        "--points", type=int, default=1_000_000, help="Number of prices of the series"
+    )
+    parser.add_argument(
+        "--corp-actions",
+        type=int,
+        default=50,
+        help="Number of corporate actions of the security",
+    )
+    args = parser.parse_args()
+
+    corp_actions = generate_corp_actions(args.corp_actions)
+    timestamps, prices = generate_series(args.points)
+
+    for name, benchmark in (
+        ("row by row", benchmark_row_by_row),
+        ("vectorized", benchmark_vectorized),
+        ("endpoint", benchmark_endpoint),
+    ):
+        elapsed = benchmark(corp_actions, timestamps, prices)
+        print(
+            f"{name:>10}: {elapsed:8.3f} s total, {elapsed / args.points * 1e9:8.0f} ns/point"
+        )
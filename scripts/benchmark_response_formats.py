@@ -0,0 +1,84 @@
+"""
+Benchmark the response formats of `GET /symbols/` on a page of symbols: size, time to encode on the server and time
+to load on the client, for JSON (the default), MessagePack and Arrow IPC streams.
+
+Requires the optional dependencies of the `formats` extra.
+
+Usage:
+    uv run --extra formats python -m scripts.benchmark_response_formats --rows 200000
+"""
+
+import argparse
+import datetime
+import time
+from collections.abc import Callable
+from typing import Any
+
+import msgpack
+import orjson
+import pyarrow as pa
+
+from app.constants import HIGHEST_DATETIME
+from app.internal.formats import build_symbols_arrow_schema, dump_arrow, dump_msgpack
+from app.internal.responses import dump_json
+from app.internal.symbols_helpers import iter_symbol_rows_as_public_dicts
+
+SYMBOLOGIES = ("BLOOMBERG", "REUTERS", "ISIN", "FIGI", "TICKER")
+
+
+def symbol_rows(rows: int) -> list[tuple]:
+    start_time = datetime.datetime(2000, 1, 1)
+    return [
+        (
+            f"ref-{i // len(SYMBOLOGIES):012d}",
+            SYMBOLOGIES[i % len(SYMBOLOGIES)],
+            f"SYMBOL_{i}",
+            "XNAS",
+            start_time,
+            HIGHEST_DATETIME,
+        )
+        for i in range(rows)
+    ]
+
+
+def encode_json(rows: list[tuple]) -> bytes:
+    return dump_json(list(iter_symbol_rows_as_public_dicts(rows)))
+
+
+def encode_msgpack(rows: list[tuple]) -> bytes:
+    return dump_msgpack(list(iter_symbol_rows_as_public_dicts(rows)))
+
+
+def encode_arrow(rows: list[tuple]) -> bytes:
+    return dump_arrow(build_symbols_arrow_schema(), rows)
+
+
+def load_arrow(content: bytes) -> pa.Table:
+    return pa.ipc.open_stream(content).read_all()
+
+
+def timed(function: Callable[[Any], Any], argument: Any) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = function(argument)
+    return time.perf_counter() - started, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response formats")
+    parser.add_argument(
+        "--rows", type=int, default=200_000, help="Number of symbols of the page"
+    )
+    args = parser.parse_args()
+
+    rows = symbol_rows(args.rows)
+    for name, encode, load in (
+        ("json", encode_json, orjson.loads),
+        ("msgpack", encode_msgpack, msgpack.unpackb),
+        ("arrow", encode_arrow, load_arrow),
+    ):
+        encode_time, content = timed(encode, rows)
+        load_time, _ = timed(load, content)
+        print(
+            f"{name:>8}: {len(content) / 1e6:7.1f} MB, encode {encode_time:7.3f} s, "
+            f"load {load_time:7.3f} s"
+        )
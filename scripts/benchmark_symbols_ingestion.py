@@ -0,0 +1,189 @@
+"""
+Benchmark symbol ingestion throughput (rows/sec), comparing ORM objects added to the session one by one against the
+bulk path used by `POST /symbols/`, which plans rows and inserts them with chunked Core `executemany` statements. The
+bulk path is also measured end-to-end, through the endpoint, with requests of `--request-size` items.
+
+Target, on SQLite with the default settings: at least 20,000 rows/sec for the bulk path, and 10,000 rows/sec
+end-to-end, i.e. a 2M-row symbol master loaded through the API in under 4 minutes (the ORM path runs at about
+6,000 rows/sec). End-to-end, parsing and validating the request body takes about as long as planning and inserting.
+Appending each row to the change log in the same transaction costs about 10µs per row, which brings the bulk path
+down to about 17,000 rows/sec.
+
+Usage:
+    uv run python -m scripts.benchmark_symbols_ingestion --items 200000 --request-size 10000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import Settings
+from app.db import create_async_engine_from_settings, create_engine_from_settings
+from app.dependencies import get_async_session, get_symbol_resolver
+from app.internal.change_log import record_changes
+from app.internal.id_generator import generate_ref_data_uuid
+from app.internal.lookup_ref_data_uuid import fetch_symbol_candidates
+from app.internal.symbol_resolver import SymbolResolver
+from app.internal.symbols_ingestion import (
+    get_symbols_to_query_per_item,
+    insert_symbol_rows,
+    plan_symbols_creation,
+)
+from app.main import app
+from app.schemas import SymbologySymbolCreate, SymbologySymbolDb
+from app.schemas.changes import ChangeEntity, ChangeOperation
+
+SYMBOLOGIES = ("BLOOMBERG", "REUTERS")
+
+
+def generate_items(count: int, prefix: str) -> list[dict]:
+    """Items of a creation request, one symbol per symbology each."""
+    return [
+        {
+            "symbology_map": {
+                symbology: [{"symbol": f"{prefix}_{symbology}_{i}"}]
+                for symbology in SYMBOLOGIES
+            }
+        }
+        for i in range(count)
+    ]
+
+
+def benchmark_orm_path(settings: Settings, items: list[dict]) -> float:
+    """One ORM object added to the session per row, as `create_symbol` used to do."""
+    symbols = [SymbologySymbolCreate.model_validate(item) for item in items]
+    engine = create_engine_from_settings(settings)
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        for symbol in symbols:
+            ref_data_uuid = generate_ref_data_uuid()
+            for symbology_name, symbology_values in symbol.symbology_map.items():
+                for symbol_spec_entry in symbology_values:
+                    session.add(
+                        SymbologySymbolDb(
+                            **symbol_spec_entry.model_dump(),
+                            symbology=symbology_name,
+                            ref_data_uuid=ref_data_uuid,
+                        )
+                    )
+        session.commit()
+    elapsed = time.perf_counter() - started
+
+    engine.dispose()
+    return elapsed
+
+
+def benchmark_bulk_path(settings: Settings, items: list[dict]) -> float:
+    """Candidates fetched, rows planned, then inserted in chunks and recorded in the change log, as `create_symbol`
+    does."""
+    symbols = [SymbologySymbolCreate.model_validate(item) for item in items]
+    engine = create_engine_from_settings(settings)
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        symbols_to_query_per_item = get_symbols_to_query_per_item(symbols)
+        candidates = fetch_symbol_candidates(
+            session=session,
+            keys=(
+                (symbol_to_query.symbology, symbol_to_query.symbol)
+                for symbols_to_query in symbols_to_query_per_item
+                for symbol_to_query in symbols_to_query
+            ),
+        )
+        plan = plan_symbols_creation(
+            symbols=symbols,
+            symbols_to_query_per_item=symbols_to_query_per_item,
+            candidates=candidates,
+        )
+        insert_symbol_rows(session=session, rows=plan.rows)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=plan.rows,
+        )
+        session.commit()
+    elapsed = time.perf_counter() - started
+
+    engine.dispose()
+    return elapsed
+
+
+def benchmark_endpoint(
+    settings: Settings, items: list[dict], request_size: int
+) -> float:
+    """Items posted to `POST /symbols/` in requests of `request_size` items, including request parsing."""
+    async_engine = create_async_engine_from_settings(settings)
+
+    async def get_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    resolver = SymbolResolver()
+    app.dependency_overrides[get_async_session] = get_session_override
+    app.dependency_overrides[get_symbol_resolver] = lambda: resolver
+
+    async def post_all() -> None:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            for start in range(0, len(items), request_size):
+                response = await client.post(
+                    "/symbols/", json=items[start : start + request_size]
+                )
+                response.raise_for_status()
+        await async_engine.dispose()
+
+    started = time.perf_counter()
+    asyncio.run(post_all())
+    elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.clear()
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark symbols ingestion")
+    parser.add_argument(
+        "--items", type=int, default=200_000, help="Number of items (securities)"
+    )
+    parser.add_argument(
+        "--request-size", type=int, default=10_000, help="Items per request"
+    )
+    args = parser.parse_args()
+
+    rows = args.items * len(SYMBOLOGIES)
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = Settings(
+            database_url=f"sqlite:///{Path(directory) / 'benchmark.db'}"
+        )
+        SQLModel.metadata.create_all(create_engine_from_settings(settings))
+
+        for name, benchmark in (
+            (
+                "orm",
+                lambda: benchmark_orm_path(settings, generate_items(args.items, "ORM")),
+            ),
+            (
+                "bulk",
+                lambda: benchmark_bulk_path(
+                    settings, generate_items(args.items, "BULK")
+                ),
+            ),
+            (
+                "endpoint",
+                lambda: benchmark_endpoint(
+                    settings, generate_items(args.items, "ENDPOINT"), args.request_size
+                ),
+            ),
+        ):
+            elapsed = benchmark()
+            print(f"{name:>8}: {elapsed:8.3f} s total, {rows / elapsed:10.0f} rows/sec")
@@ -0,0 +1,84 @@
+"""
+Benchmark the per-row cost of serializing symbol listings, comparing the validating path (database objects converted
+to SymbologySymbolPublic, then serialized by the response model) against the trusted-row path used by the endpoints.
+
+Usage:
+    uv run python -m scripts.benchmark_symbols_serialization --rows 1000000
+"""
+
+import argparse
+import datetime
+import time
+
+from pydantic import TypeAdapter
+
+from app.constants import HIGHEST_DATETIME
+from app.internal.responses import dump_json
+from app.internal.symbols_helpers import (
+    convert_list_of_db_objects_to_public_objects,
+    iter_symbol_rows_as_public_dicts,
+)
+from app.schemas import SymbologySymbolDb, SymbologySymbolPublic
+
+SYMBOLOGIES = ("BLOOMBERG", "REUTERS", "ISIN", "FIGI", "TICKER")
+
+
+def generate_rows(count: int) -> list[tuple]:
+    """Rows as fetched by the listing query, one row per symbology of each security, ordered by the sort key."""
+    start_time = datetime.datetime(2000, 1, 1)
+    return [
+        (
+            f"ref-{i // len(SYMBOLOGIES):012d}",
+            SYMBOLOGIES[i % len(SYMBOLOGIES)],
+            f"SYMBOL_{i}",
+            "XNAS",
+            start_time,
+            HIGHEST_DATETIME,
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark_validating_path(rows: list[tuple]) -> float:
+    db_objects = [
+        SymbologySymbolDb(
+            ref_data_uuid=ref_data_uuid,
+            symbology=symbology,
+            symbol=symbol,
+            exchange=exchange,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        for ref_data_uuid, symbology, symbol, exchange, start_time, end_time in rows
+    ]
+    response_model = TypeAdapter(list[SymbologySymbolPublic])
+
+    started = time.perf_counter()
+    public_objects = convert_list_of_db_objects_to_public_objects(db_objects)
+    response_model.dump_json(response_model.validate_python(public_objects))
+    return time.perf_counter() - started
+
+
+def benchmark_trusted_path(rows: list[tuple]) -> float:
+    started = time.perf_counter()
+    dump_json(list(iter_symbol_rows_as_public_dicts(rows)))
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark symbols serialization")
+    parser.add_argument(
+        "--rows", type=int, default=1_000_000, help="Number of symbol rows"
+    )
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows)
+
+    for name, benchmark in (
+        ("validating", benchmark_validating_path),
+        ("trusted", benchmark_trusted_path),
+    ):
+        elapsed = benchmark(rows)
+        print(
+            f"{name:>10}: {elapsed:8.3f} s total, {elapsed / args.rows * 1e9:8.0f} ns/row"
+        )
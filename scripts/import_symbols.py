@@ -0,0 +1,328 @@
+"""
+Import a symbol master from a CSV or Parquet file straight into the database, without going through the API.
+
+The file has one row per symbol, with columns `symbology`, `symbol` and optionally `exchange`, `start_time` and
+`end_time`, plus a security key column (`--key-column`) identifying which rows describe the same security. Rows of
+the same security must be contiguous, e.g. sorted by the key column. Each security is processed like an item of
+`POST /symbols/`: rows are validated as `SymbologySymbolSpec`, matched against existing symbols, and assigned a new
+or existing ref_data_uuid.
+
+Rows are read in chunks of `--chunk-size`, and each chunk is written in a single transaction. After each transaction,
+the number of rows imported is saved to a checkpoint file, so an interrupted import resumes after the last committed
+chunk when run again with the same arguments.
+
+Symbols imported this way are recorded in the change log, like symbols created through the API, so running workers
+catch their in-memory resolvers and response caches up with them on their next lookup.
+
+Parquet files require pyarrow, from the `formats` extra (`uv sync --extra formats`).
+
+Usage:
+    uv run python -m scripts.import_symbols symbols.csv --key-column figi --chunk-size 100000
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from itertools import groupby, islice
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.config import get_settings
+from app.db import create_db_and_tables, create_engine_from_settings
+from app.internal.change_log import record_changes
+from app.internal.lookup_ref_data_uuid import fetch_symbol_candidates
+from app.internal.symbols_ingestion import (
+    get_symbols_to_query_per_item,
+    insert_symbol_rows,
+    plan_symbols_creation,
+)
+from app.schemas import SymbologyMaps, SymbologySymbolCreate, SymbologySymbolSpec
+from app.schemas.changes import ChangeEntity, ChangeOperation
+
+logger = logging.getLogger("import_symbols")
+
+SPEC_COLUMNS = ("symbol", "exchange", "start_time", "end_time")
+REQUIRED_COLUMNS = ("symbology", "symbol")
+
+
+def iter_csv_rows(path: Path) -> Iterator[dict[str, Any]]:
+    with open(path, newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def import_parquet() -> ModuleType:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise SystemExit(
+            "Reading Parquet files requires pyarrow, install it with `uv sync --extra formats`."
+        ) from exc
+    return pq
+
+
+def iter_parquet_rows(path: Path, batch_size: int) -> Iterator[dict[str, Any]]:
+    for batch in import_parquet().ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def read_columns(path: Path) -> list[str]:
+    """Column names of the file, from the CSV header or the Parquet schema."""
+    if path.suffix.lower() == ".parquet":
+        return import_parquet().read_schema(path).names
+    with open(path, newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def check_columns(path: Path, *, key_column: str) -> None:
+    """
+    Check the file has the key column and the required columns, before reading any row.
+
+    Raises:
+        SystemExit: If any of them is missing.
+    """
+    columns = read_columns(path)
+    missing = [
+        column for column in (key_column, *REQUIRED_COLUMNS) if column not in columns
+    ]
+    if missing:
+        raise SystemExit(
+            f"{path} has no column {', '.join(missing)}, its columns are {', '.join(columns) or 'none'}."
+        )
+
+
+def iter_rows(path: Path, chunk_size: int) -> Iterator[dict[str, Any]]:
+    """Rows of the file, as dicts of column values, read incrementally."""
+    if path.suffix.lower() == ".parquet":
+        return iter_parquet_rows(path, batch_size=chunk_size)
+    return iter_csv_rows(path)
+
+
+def iter_security_chunks(
+    rows: Iterator[dict[str, Any]], *, key_column: str, chunk_size: int
+) -> Iterator[list[list[dict[str, Any]]]]:
+    """
+    Group contiguous rows by security, and yield about `chunk_size` rows at a time, without splitting a security.
+
+    Args:
+        rows (Iterator[dict[str, Any]]): The rows of the file.
+        key_column (str): The column identifying the security of each row.
+        chunk_size (int): Number of rows after which a chunk is yielded.
+
+    Yields:
+        list[list[dict[str, Any]]]: The rows of each security of the chunk.
+    """
+    chunk: list[list[dict[str, Any]]] = []
+    rows_in_chunk = 0
+    for _, security_rows in groupby(rows, key=lambda row: row[key_column]):
+        chunk.append(list(security_rows))
+        rows_in_chunk += len(chunk[-1])
+        if rows_in_chunk >= chunk_size:
+            yield chunk
+            chunk, rows_in_chunk = [], 0
+    if chunk:
+        yield chunk
+
+
+def build_symbology_maps(security_rows: list[dict[str, Any]]) -> SymbologyMaps:
+    """
+    Validate the rows of a security, and group them by symbology.
+
+    Empty values (empty CSV cells, Parquet nulls) are left out, so the defaults of `SymbologySymbolSpec` apply.
+
+    Raises:
+        ValueError: If any row has no symbology, or is not a valid `SymbologySymbolSpec`.
+    """
+    symbology_maps: SymbologyMaps = {}
+    for row in security_rows:
+        if not row.get("symbology"):
+            raise ValueError("Symbology is missing.")
+        spec = SymbologySymbolSpec.model_validate(
+            {
+                column: row[column]
+                for column in SPEC_COLUMNS
+                if row.get(column) not in (None, "")
+            }
+        )
+        symbology_maps.setdefault(row["symbology"], []).append(spec)
+    return symbology_maps
+
+
+def import_chunk(
+    session: Session, securities: list[list[dict[str, Any]]]
+) -> tuple[int, int]:
+    """
+    Import the securities of one chunk, and commit.
+
+    Returns:
+        tuple[int, int]: The number of symbols inserted, and the number of securities rejected.
+    """
+    symbols: list[SymbologySymbolCreate] = []
+    rejected = 0
+    for security_rows in securities:
+        try:
+            symbology_maps = build_symbology_maps(security_rows)
+        except ValueError as exc:
+            rejected += 1
+            logger.warning("Rejected security %s: %s", security_rows[0], exc)
+            continue
+        # specs have just been validated, don't validate them again
+        symbols.append(
+            SymbologySymbolCreate.model_construct(symbology_map=symbology_maps)
+        )
+
+    symbols_to_query_per_item = get_symbols_to_query_per_item(symbols)
+    candidates = fetch_symbol_candidates(
+        session=session,
+        keys=(
+            (symbol_to_query.symbology, symbol_to_query.symbol)
+            for symbols_to_query in symbols_to_query_per_item
+            for symbol_to_query in symbols_to_query
+        ),
+    )
+    plan = plan_symbols_creation(
+        symbols=symbols,
+        symbols_to_query_per_item=symbols_to_query_per_item,
+        candidates=candidates,
+    )
+    for output in plan.outputs:
+        if output["error"] is not None:
+            rejected += 1
+            logger.warning(
+                "Rejected security %s: %s", output["symbology_map"], output["error"]
+            )
+
+    if plan.rows:
+        insert_symbol_rows(session=session, rows=plan.rows)
+        record_changes(
+            session=session,
+            entity=ChangeEntity.SYMBOL,
+            operation=ChangeOperation.CREATE,
+            rows=plan.rows,
+        )
+        session.commit()
+    return len(plan.rows), rejected
+
+
+def read_checkpoint(checkpoint_path: Path, source: Path) -> int:
+    """Number of rows of `source` already imported, according to the checkpoint file."""
+    if not checkpoint_path.exists():
+        return 0
+
+    checkpoint = json.loads(checkpoint_path.read_text())
+    if checkpoint["source"] != str(source.resolve()):
+        raise SystemExit(
+            f"Checkpoint {checkpoint_path} belongs to {checkpoint['source']}, remove it to import {source}."
+        )
+    return checkpoint["rows_imported"]
+
+
+def write_checkpoint(checkpoint_path: Path, source: Path, rows_imported: int) -> None:
+    """Save the number of rows imported, replacing the checkpoint file atomically."""
+    temporary_path = checkpoint_path.with_suffix(checkpoint_path.suffix + ".tmp")
+    temporary_path.write_text(
+        json.dumps({"source": str(source.resolve()), "rows_imported": rows_imported})
+    )
+    os.replace(temporary_path, checkpoint_path)
+
+
+def import_symbols(
+    engine: Engine,
+    source: Path,
+    *,
+    key_column: str,
+    chunk_size: int,
+    checkpoint_path: Path,
+) -> int:
+    """
+    Import all symbols of a file, resuming after the rows imported according to the checkpoint file.
+
+    Args:
+        engine (Engine): The engine of the database to import to.
+        source (Path): The CSV or Parquet file to import.
+        key_column (str): The column identifying the security of each row.
+        chunk_size (int): Number of rows per transaction.
+        checkpoint_path (Path): The checkpoint file, created if it does not exist.
+
+    Returns:
+        int: The number of rows of the file imported, including rows imported by previous runs.
+    """
+    check_columns(source, key_column=key_column)
+    rows_imported = read_checkpoint(checkpoint_path, source)
+    if rows_imported:
+        logger.info("Resuming after %d rows imported", rows_imported)
+
+    rows = islice(iter_rows(source, chunk_size), rows_imported, None)
+    started = time.perf_counter()
+    rows_read = 0
+    with Session(engine) as session:
+        for securities in iter_security_chunks(
+            rows, key_column=key_column, chunk_size=chunk_size
+        ):
+            inserted, rejected = import_chunk(session, securities)
+
+            chunk_rows = sum(len(security_rows) for security_rows in securities)
+            rows_read += chunk_rows
+            rows_imported += chunk_rows
+            write_checkpoint(checkpoint_path, source, rows_imported)
+
+            logger.info(
+                "%d rows imported (%d symbols inserted, %d securities rejected in this chunk), %.0f rows/sec",
+                rows_imported,
+                inserted,
+                rejected,
+                rows_read / (time.perf_counter() - started),
+            )
+
+    return rows_imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a symbol master file")
+    parser.add_argument("source", type=Path, help="CSV or Parquet file to import")
+    parser.add_argument(
+        "--key-column",
+        type=str,
+        required=True,
+        help="Column identifying the security of each row",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=100_000, help="Rows per transaction"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file, defaults to the source file name with a .checkpoint.json suffix",
+    )
+    parser.add_argument(
+        "--database-url",
+        type=str,
+        default=None,
+        help="Database to import to, defaults to the application settings",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    settings = get_settings()
+    if args.database_url:
+        settings = settings.model_copy(update={"database_url": args.database_url})
+    engine = create_engine_from_settings(settings)
+    create_db_and_tables(engine)
+
+    import_symbols(
+        engine,
+        args.source,
+        key_column=args.key_column,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint
+        or args.source.with_name(args.source.name + ".checkpoint.json"),
+    )